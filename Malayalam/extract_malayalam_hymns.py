@@ -2,15 +2,23 @@
 """
 Extract Malayalam hymns from PowerPoint files and create an Excel report.
 Lists hymn number, title (from Manglish or Malayalam content), slide location, and slide count.
+
+Usage: python3 extract_malayalam_hymns.py [--jobs N] [--no-cache]
+  --jobs N   worker processes used to analyse the files (0 = one per CPU core, default)
+  --no-cache analyse every file again instead of reusing results of unchanged files
 """
 
 import os
 import re
+import hashlib
 import json
-from pptx import Presentation
+import sys
+import time
+from slide_text_reader import read_slide_text
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.dirname(BASE_DIR)
@@ -237,7 +245,7 @@ def analyze_pptx_file(pptx_path):
     Returns a list of hymn dictionaries.
     """
     try:
-        prs = Presentation(pptx_path)
+        prs = read_slide_text(pptx_path)
     except Exception as e:
         print(f"  ⚠ Could not open {pptx_path}: {e}")
         return []
@@ -433,8 +441,148 @@ def analyze_pptx_file(pptx_path):
     return unique_hymns
 
 
+# Worker processes used to analyse decks (--jobs N). 0 = one per CPU core, 1 = one by one.
+EXTRACT_JOBS = 0
+
+# Below this many decks, process start-up costs more than it saves
+PARALLEL_MIN_DECKS = 4
+
+
+def timed_analyze_pptx_file(pptx_path):
+    """analyze_pptx_file() and the CPU seconds it took (run in the worker processes)."""
+    # CPU time, not wall time: workers sharing a core would otherwise all count the wait
+    started = time.process_time()
+    hymns = analyze_pptx_file(pptx_path)
+    return hymns, time.process_time() - started
+
+
+def analyze_pptx_files(pptx_files, jobs=None):
+    """
+    Run analyze_pptx_file() on every deck, across worker processes when jobs allows.
+
+    Decks are handed to the workers in chunks and the results come back in pptx_files
+    order, so the report is the same as a serial run. Returns (results, stats): results is
+    [(pptx_path, hymns), ...] and stats is {'workers', 'seconds', 'analysis_seconds'}, where
+    analysis_seconds / seconds is the speedup over analysing the decks one by one.
+    """
+    jobs = EXTRACT_JOBS if jobs is None else jobs
+    workers = min(jobs or os.cpu_count() or 1, len(pptx_files))
+    started = time.perf_counter()
+    timed = None
+    if workers > 1 and len(pptx_files) >= PARALLEL_MIN_DECKS:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        # A few chunks per worker: fewer round trips, still balanced when some decks are slow
+        chunksize = max(1, len(pptx_files) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                timed = list(executor.map(timed_analyze_pptx_file, pptx_files, chunksize=chunksize))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"  ⚠ Parallel analysis unavailable ({e}) - analysing files one by one")
+    if timed is None:
+        workers = 1
+        timed = [timed_analyze_pptx_file(pptx_file) for pptx_file in pptx_files]
+    stats = {
+        'workers': workers,
+        'seconds': time.perf_counter() - started,
+        'analysis_seconds': sum(seconds for _, seconds in timed),
+    }
+    return [(pptx_file, hymns) for pptx_file, (hymns, _) in zip(pptx_files, timed)], stats
+
+
+# analyze_pptx_file() results per deck, reused while the deck and the extractor are unchanged
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".church_ppt_cache")
+EXTRACT_CACHE_FILE = os.path.join(CACHE_DIR, "malayalam_hymn_extract_cache.json")
+USE_EXTRACT_CACHE = True
+
+
+def extractor_version():
+    """Hash of this script and slide_text_reader.py; cached results of other versions are dropped."""
+    digest = hashlib.sha1()
+    for path in (__file__, sys.modules[read_slide_text.__module__].__file__):
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(path.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_extract_cache(version):
+    """Cached {path: {'size', 'mtime_ns', 'hymns'}} for this extractor version ({} if none)."""
+    try:
+        with open(EXTRACT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data.get('decks', {})
+
+
+def save_extract_cache(version, decks):
+    """Write the cache via a temp file, so an interrupted run never leaves half a file."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Per-process temp name: the web catalog and a command-line run may save at once
+        tmp_path = f"{EXTRACT_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'decks': decks}, f, ensure_ascii=False)
+        os.replace(tmp_path, EXTRACT_CACHE_FILE)
+    except OSError as e:
+        print(f"  ⚠ Could not save extraction cache ({e})")
+
+
+def analyze_pptx_files_cached(pptx_files, jobs=None):
+    """
+    analyze_pptx_files(), reusing the saved results of decks whose size and mtime haven't
+    changed since the last run of this extractor version, so adding one deck costs one
+    deck analysis. Returns (results, stats) like analyze_pptx_files(); stats also has
+    the 'analyzed' and 'reused' deck counts and the 'analyzed_files' that were analysed.
+    """
+    version = extractor_version()
+    saved = load_extract_cache(version)
+    decks = {}
+    changed = []
+    for pptx_file in pptx_files:
+        try:
+            stat = os.stat(pptx_file)
+        except OSError:
+            stat = None
+        entry = saved.get(pptx_file)
+        if stat and entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            decks[pptx_file] = entry
+        else:
+            decks[pptx_file] = None
+            changed.append((pptx_file, stat))
+
+    results, stats = analyze_pptx_files([pptx_file for pptx_file, _ in changed], jobs)
+    for (pptx_file, stat), (_, hymns) in zip(changed, results):
+        decks[pptx_file] = {
+            'size': stat.st_size if stat else None,
+            'mtime_ns': stat.st_mtime_ns if stat else None,
+            'hymns': hymns,
+        }
+
+    # Decks that were removed drop out here
+    if changed or len(decks) != len(saved):
+        save_extract_cache(version, decks)
+    stats.update(analyzed=len(changed), reused=len(decks) - len(changed),
+                 analyzed_files=[pptx_file for pptx_file, _ in changed])
+    return [(pptx_file, [dict(hymn) for hymn in entry['hymns']]) for pptx_file, entry in decks.items()], stats
+
+
+# Columns of both report tabs
+REPORT_HEADERS = ['Hymn Number', 'Title', 'Slide Name']
+
+
 def create_excel_report(all_hymns, output_file):
-    """Create an Excel file with hymn information from Malayalam files."""
+    """
+    Create an Excel file with hymn information from Malayalam files.
+
+    The workbook is write-only: rows go straight to the file as they are produced, so
+    memory doesn't grow with openpyxl cell objects however many hymns there are.
+    """
     # Load KK hymn mapping JSON
     kk_json_path = os.path.join(BASE_DIR, "kk_hymn_mapping.json")
     kk_hymns = {}
@@ -468,105 +616,96 @@ def create_excel_report(all_hymns, output_file):
     
     all_hymns.sort(key=sort_key)
     
-    # Create workbook
-    wb = openpyxl.Workbook()
+    # Write-only workbook: rows go straight to the file as they are produced
+    wb = openpyxl.Workbook(write_only=True)
+    widths = report_column_widths(hymn_report_rows(all_hymns))
     
     # ============= TAB 1: Sort by Hymn Number =============
-    ws1 = wb.active
-    ws1.title = "Sort by Hymn Number"
-    
-    # Define headers
-    headers = ['Hymn Number', 'Title', 'Slide Name']
-    ws1.append(headers)
-    
-    # Style headers
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    
-    for col in range(1, len(headers) + 1):
-        cell = ws1.cell(row=1, column=col)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Add data sorted by hymn number
-    for hymn in all_hymns:
-        row_data = [
-            int(hymn['hymn_number']) if hymn['hymn_number'] else '',
-            clean_text_for_excel(hymn['title']),
-            clean_text_for_excel(hymn['file_name'])
-        ]
-        ws1.append(row_data)
-    
-    # Auto-adjust column widths
-    for col in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col)
-        max_length = 0
-        
-        for cell in ws1[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 60)
-        ws1.column_dimensions[column_letter].width = adjusted_width
-    
-    # Center align hymn number column
-    for row in ws1.iter_rows(min_row=2, max_row=ws1.max_row):
-        row[0].alignment = Alignment(horizontal='center')
+    _add_hymns_sheet(wb, all_hymns, "Sort by Hymn Number", widths)
     
     # ============= TAB 2: Sort by Filename =============
-    ws2 = wb.create_sheet(title="Sort by Filename")
-    
-    # Headers
-    ws2.append(headers)
-    for col in range(1, len(headers) + 1):
-        cell = ws2.cell(row=1, column=col)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Sort by filename
     all_hymns_by_file = sorted(all_hymns, key=lambda x: (x['file_name'], int(x['hymn_number']) if x['hymn_number'] else 9999))
+    _add_hymns_sheet(wb, all_hymns_by_file, "Sort by Filename", widths)
     
-    # Add data sorted by filename
-    for hymn in all_hymns_by_file:
-        row_data = [
+    # Save workbook
+    wb.save(output_file)
+    print(f"\n✓ Excel report saved to: {output_file}")
+    print(f"  Tab 1: Sort by Hymn Number ({len(all_hymns)} entries)")
+    print(f"  Tab 2: Sort by Filename ({len(all_hymns_by_file)} entries)")
+
+
+def hymn_report_rows(hymns):
+    """Yield the report row (hymn number, title, file name) of each hymn, one at a time."""
+    for hymn in hymns:
+        yield (
             int(hymn['hymn_number']) if hymn['hymn_number'] else '',
             clean_text_for_excel(hymn['title']),
             clean_text_for_excel(hymn['file_name'])
-        ]
-        ws2.append(row_data)
+        )
+
+
+def report_column_widths(rows):
+    """
+    Column widths fitting REPORT_HEADERS and rows, counted row by row as they are produced.
+
+    Write-only sheets emit the column widths before the first row, so this runs over the
+    row generator once up front instead of re-reading every written cell afterwards.
+    """
+    widths = [len(header) for header in REPORT_HEADERS]
+    for row in rows:
+        for col, value in enumerate(row):
+            widths[col] = max(widths[col], len(str(value)))
+    return [min(width + 2, 60) for width in widths]
+
+
+def _add_hymns_sheet(wb, hymns, sheet_name, widths):
+    """Stream a sheet of hymn rows into a write-only workbook."""
+    ws = wb.create_sheet(sheet_name)
     
-    # Auto-adjust column widths
-    for col in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col)
-        max_length = 0
-        
-        for cell in ws2[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 60)
-        ws2.column_dimensions[column_letter].width = adjusted_width
+    # Column widths have to be set before any row is written
+    for col, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = width
     
-    # Center align hymn number column
-    for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row):
-        row[0].alignment = Alignment(horizontal='center')
+    # Style headers
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    header_alignment = Alignment(horizontal='center', vertical='center')
     
-    # Save workbook
-    wb.save(output_file)
-    print(f"\n✓ Excel report saved to: {output_file}")
-    print(f"  Tab 1: Sort by Hymn Number ({len(all_hymns)} entries)")
-    print(f"  Tab 2: Sort by Filename ({len(all_hymns_by_file)} entries)")
+    header_row = []
+    for header in REPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_row.append(cell)
+    ws.append(header_row)
+    
+    # Add data, center aligning the hymn number column
+    number_alignment = Alignment(horizontal='center')
+    for hymn_number, title, file_name in hymn_report_rows(hymns):
+        number_cell = WriteOnlyCell(ws, value=hymn_number)
+        number_cell.alignment = number_alignment
+        ws.append([number_cell, title, file_name])
 
 
 def main():
+    # --jobs N: worker processes used to analyse the PowerPoint files
+    global EXTRACT_JOBS
+    if "--jobs" in sys.argv:
+        i = sys.argv.index("--jobs")
+        try:
+            EXTRACT_JOBS = max(0, int(sys.argv[i + 1]))
+        except (IndexError, ValueError):
+            print("Usage: --jobs N  (0 = one per CPU core, 1 = no parallel analysis)")
+            return
+        del sys.argv[i:i + 2]
+
+    # --no-cache: analyse every file again instead of reusing unchanged files' results
+    global USE_EXTRACT_CACHE
+    if "--no-cache" in sys.argv:
+        USE_EXTRACT_CACHE = False
+        sys.argv.remove("--no-cache")
+
     print("=" * 70)
     print("Extracting Malayalam Hymn Information from PowerPoint Files")
     print("(Including both Malayalam script and Manglish)")
@@ -579,11 +718,22 @@ def main():
     
     # Extract hymn information from each file
     all_hymns = []
-    for pptx_file in pptx_files:
-        print(f"\n📄 Analyzing: {os.path.basename(pptx_file)}")
-        hymns = analyze_pptx_file(pptx_file)
-        print(f"  Found {len(hymns)} hymns")
+    if USE_EXTRACT_CACHE:
+        results, stats = analyze_pptx_files_cached(pptx_files)
+        print(f"\n♻ Reused {stats['reused']} unchanged file(s), analysed {stats['analyzed']}")
+    else:
+        results, stats = analyze_pptx_files(pptx_files)
+    analyzed_files = set(stats.get('analyzed_files', pptx_files))
+    for pptx_file, hymns in results:
+        if pptx_file in analyzed_files:
+            print(f"\n📄 Analyzing: {os.path.basename(pptx_file)}")
+            print(f"  Found {len(hymns)} hymns")
         all_hymns.extend(hymns)
+    analyzed = stats.get('analyzed', len(pptx_files))
+    if analyzed:
+        speedup = stats['analysis_seconds'] / stats['seconds'] if stats['seconds'] else 1.0
+        print(f"\n⚡ Analysed {analyzed} files in {stats['seconds']:.1f}s with {stats['workers']} worker(s) "
+              f"({stats['analysis_seconds']:.1f}s of analysis, {speedup:.1f}x speedup)")
     
     print(f"\n📊 Total hymns found across all files: {len(all_hymns)}")
     
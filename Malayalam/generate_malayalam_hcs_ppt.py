@@ -16,6 +16,14 @@ Sections supported:
 
 Usage:
     python3 generate_malayalam_hcs_ppt.py --batch songs.txt "Output Name.pptx"
+    python3 generate_malayalam_hcs_ppt.py --refresh-index      # re-index new/changed PPT files only
+    python3 generate_malayalam_hcs_ppt.py --services services.txt [output_folder]
+        # several services in one file, each starting with its own "Date: ..." line;
+        # they are generated side by side, one worker process per service
+    Add --jobs N to set the PPT scanning worker processes (0 = all cores); with --services
+    it sets how many services are generated at once
+    Add --no-cache to rebuild even if the same service was generated before (unchanged inputs
+    otherwise reuse the earlier presentation from ~/.church_ppt_cache)
     
     songs.txt format:
         hymn_num|label|title_hint
@@ -29,13 +37,24 @@ import os
 import sys
 import re
 import json
-from kk_hymn_search import find_hymn_in_kk_pptx
+import sqlite3
+import hashlib
+import threading
+import time
+import weakref
+import zipfile
+from collections import Counter, OrderedDict
+from contextlib import closing, contextmanager, redirect_stdout
+from kk_hymn_search import (find_hymn_in_kk_pptx, kk_offset_table_lookup, load_kk_offset_table,
+                             saved_kk_offset_table, KK_OFFSETS_VERSION)
+from slide_text_reader import read_slide_text
 from copy import deepcopy
 from datetime import datetime
-from io import BytesIO
+from io import BytesIO, StringIO
 
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
+from pptx.parts.image import Image, ImagePart
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE_TYPE, MSO_AUTO_SHAPE_TYPE
@@ -51,15 +70,8 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.dirname(BASE_DIR)
 IMAGES_DIR = os.path.join(PARENT_DIR, "images")
 
-# Create images directory if it doesn't exist
-os.makedirs(IMAGES_DIR, exist_ok=True)
-
-# Load KK hymn mapping
-KK_HYMN_MAPPING = {}
-kk_mapping_path = os.path.join(BASE_DIR, "kk_hymn_mapping.json")
-if os.path.exists(kk_mapping_path):
-    with open(kk_mapping_path, 'r', encoding='utf-8') as f:
-        KK_HYMN_MAPPING = json.load(f)
+# KK hymn number -> title (loaded on first use, see GeneratorContext)
+KK_MAPPING_PATH = os.path.join(BASE_DIR, "kk_hymn_mapping.json")
 
 # Path to bundled/local hymn files folder
 # NOTE: For exe builds, this folder is bundled at BUILD TIME by build_exe.py
@@ -82,7 +94,6 @@ HYMNS_PPT_LOCATIONS = [
     os.path.join(ONEDRIVE_GIT_LOCAL, "Holy Communion Services - Slides", "Malayalam HCS", "Hymns_malayalam_KK.pptx"),
     os.path.join(BASE_DIR, "Hymns_malayalam_KK.pptx"),
 ]
-HYMNS_PPT = next((path for path in HYMNS_PPT_LOCATIONS if os.path.exists(path)), HYMNS_PPT_LOCATIONS[-1])
 PDF_FILE = os.path.join(BASE_DIR, "Kristeeya Keerthanagal.pdf")
 
 # Image paths
@@ -94,10 +105,86 @@ SEARCH_DIRS = [
     BASE_DIR,
 ]
 
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RUNTIME CONTEXT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class GeneratorContext:
+    """
+    Config and corpus lookups that touch the disk, done on first use instead of at import.
+
+    Importing this module does no file I/O (see startup_benchmark.py); each value is
+    loaded the first time it is read and reused afterwards. reset() forgets them.
+
+    source_folder is the folder the user picked (GUI); None means the current working
+    directory, as when run from the command line.
+    """
+
+    def __init__(self):
+        self.source_folder = None
+        self._kk_hymn_mapping = None
+        self._hymns_ppt = None
+
+    @property
+    def source_root(self):
+        """Folder searched first for hymn PPTs, the template and images."""
+        return self.source_folder or os.getcwd()
+
+    @property
+    def kk_hymn_mapping(self):
+        """KK hymn number -> title from kk_hymn_mapping.json ({} if the file is missing)."""
+        if self._kk_hymn_mapping is None:
+            mapping = {}
+            if os.path.exists(KK_MAPPING_PATH):
+                with open(KK_MAPPING_PATH, 'r', encoding='utf-8') as f:
+                    mapping = json.load(f)
+            self._kk_hymn_mapping = mapping
+        return self._kk_hymn_mapping
+
+    @property
+    def hymns_ppt(self):
+        """Hymns PPT - first of HYMNS_PPT_LOCATIONS that exists, else the BASE_DIR copy."""
+        if self._hymns_ppt is None:
+            self._hymns_ppt = next((path for path in HYMNS_PPT_LOCATIONS if os.path.exists(path)),
+                                   HYMNS_PPT_LOCATIONS[-1])
+        return self._hymns_ppt
+
+    @property
+    def search_dirs(self):
+        """Malayalam search directories for the source folder."""
+        # get_search_dirs() keeps its own folder-walk cache, revalidated per generation
+        return get_search_dirs()
+
+    def ensure_images_dir(self):
+        """Create the images folder if it doesn't exist."""
+        os.makedirs(IMAGES_DIR, exist_ok=True)
+        return IMAGES_DIR
+
+    def reset(self):
+        """Forget loaded values so the next reads go back to disk."""
+        self._kk_hymn_mapping = None
+        self._hymns_ppt = None
+
+
+CONTEXT = GeneratorContext()
+
+
+def __getattr__(name):
+    """Module attributes that used to be computed at import time, now read from CONTEXT."""
+    if name == "KK_HYMN_MAPPING":
+        return CONTEXT.kk_hymn_mapping
+    if name == "HYMNS_PPT":
+        return CONTEXT.hymns_ppt
+    if name == "MALAYALAM_SEARCH_DIRS":
+        return CONTEXT.search_dirs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def resolve_image_path(filename):
     """Find an image in the source folder first, then fallback to packaged images."""
     candidates = [
-        os.path.join(os.getcwd(), "images", filename),
+        os.path.join(CONTEXT.source_root, "images", filename),
         os.path.join(BASE_DIR, "images", filename),
     ]
     for path in candidates:
@@ -109,21 +196,26 @@ def find_template_ppt():
     """Find the Malayalam template PPT in the selected source folder or fallback paths."""
     template_name = "4 Jan 2026.pptx"
     # Search in: user-provided folder, PARENT_DIR, onedrive_git_local
-    search_roots = [os.getcwd(), PARENT_DIR, ONEDRIVE_GIT_LOCAL]
+    search_roots = [CONTEXT.source_root, PARENT_DIR, ONEDRIVE_GIT_LOCAL]
 
-    # Prefer the current working directory (set by the GUI to the source folder)
-    for root in search_roots:
-        if not root or not os.path.isdir(root):
-            continue
-        for dirpath, _, filenames in os.walk(root):
-            if template_name in filenames:
-                return os.path.join(dirpath, template_name)
+    def discover(dir_mtimes):
+        # Prefer the source folder (picked in the GUI, else the working directory)
+        for root in search_roots:
+            dir_mtimes[os.path.dirname(root)] = dir_mtime(os.path.dirname(root))
+            if not root or not os.path.isdir(root):
+                continue
+            for dirpath, _, filenames in walk_dirs(root, dir_mtimes):
+                if template_name in filenames:
+                    return os.path.join(dirpath, template_name)
 
-    # Final fallback to the static path if it exists
-    if os.path.exists(TEMPLATE_PPT):
-        return TEMPLATE_PPT
+        # Final fallback to the static path if it exists
+        dir_mtimes[os.path.dirname(TEMPLATE_PPT)] = dir_mtime(os.path.dirname(TEMPLATE_PPT))
+        if os.path.exists(TEMPLATE_PPT):
+            return TEMPLATE_PPT
 
-    return None
+        return None
+
+    return cached_discovery(("template", template_name, tuple(search_roots)), discover)
 
 # ─── Font / layout settings (from template analysis) ─────────────────────────
 TITLE_FONT = "Gabriola"
@@ -154,6 +246,70 @@ HC_IMAGE_WIDTH = Inches(6.654)
 HC_IMAGE_HEIGHT = Inches(4.437)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SOURCE PRESENTATION CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Parsed source decks shared by searching, slide cloning and image extraction, in
+# least-recently-used order: {pptx_path: (mtime, estimated_bytes, Presentation)}
+SOURCE_PRS_CACHE = OrderedDict()
+# Least-recently-used decks are dropped once the estimated total goes over this
+SOURCE_PRS_CACHE_MAX_BYTES = 768 * 1024 * 1024
+_SOURCE_PRS_LOCK = threading.Lock()
+
+
+def estimate_presentation_bytes(pptx_path):
+    """Rough in-memory size of a parsed deck: the uncompressed size of its zip members."""
+    try:
+        with zipfile.ZipFile(pptx_path) as zf:
+            return sum(info.file_size for info in zf.infolist())
+    except (OSError, zipfile.BadZipFile):
+        return os.path.getsize(pptx_path)
+
+
+def get_cached_presentation(pptx_path):
+    """Return the cached Presentation for pptx_path if the file hasn't changed, else None. Never parses."""
+    try:
+        mtime = os.path.getmtime(pptx_path)
+    except OSError:
+        return None
+    with _SOURCE_PRS_LOCK:
+        entry = SOURCE_PRS_CACHE.get(pptx_path)
+        if entry is None or entry[0] != mtime:
+            return None
+        SOURCE_PRS_CACHE.move_to_end(pptx_path)
+        return entry[2]
+
+
+def open_source_presentation(pptx_path):
+    """
+    Return the parsed source deck for pptx_path, parsing it only if it isn't cached or changed.
+
+    The Presentation is shared by every caller: read it and clone from it, never modify it.
+    """
+    prs = get_cached_presentation(pptx_path)
+    if prs is not None:
+        return prs
+
+    mtime = os.path.getmtime(pptx_path)
+    prs = Presentation(pptx_path)
+    size = estimate_presentation_bytes(pptx_path)
+    with _SOURCE_PRS_LOCK:
+        SOURCE_PRS_CACHE[pptx_path] = (mtime, size, prs)
+        SOURCE_PRS_CACHE.move_to_end(pptx_path)
+        total = sum(entry[1] for entry in SOURCE_PRS_CACHE.values())
+        while total > SOURCE_PRS_CACHE_MAX_BYTES and len(SOURCE_PRS_CACHE) > 1:
+            _, (_, evicted_size, _) = SOURCE_PRS_CACHE.popitem(last=False)
+            total -= evicted_size
+    return prs
+
+
+def clear_source_presentation_cache():
+    """Release all cached source decks."""
+    with _SOURCE_PRS_LOCK:
+        SOURCE_PRS_CACHE.clear()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # IMAGE EXTRACTION AND MANAGEMENT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -179,7 +335,7 @@ def ensure_holy_communion_image():
         return False
     
     try:
-        prs = Presentation(source_pptx)
+        prs = open_source_presentation(source_pptx)
         # Slide 23 (index 22) has the Holy Communion image
         slide = prs.slides[22]
         for shape in slide.shapes:
@@ -270,6 +426,60 @@ def extract_song_text_from_pdf_by_page(pdf_path, target_hymn_num):
 # PPT SEARCH FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# ─── Folder discovery cache ──────────────────────────────────────────────────
+# Results of folder walks (search folders, deck lists, template location), each with the
+# mtimes of the directories the walk looked at. Adding, removing or renaming a file or
+# folder changes its parent directory's mtime, so an unchanged set of mtimes means the
+# walk would give the same answer: {key: (dir_mtimes, result)}
+_DISCOVERY_CACHE = {}
+# Keys already revalidated during this generation (see begin_discovery_pass())
+_DISCOVERY_CHECKED = set()
+
+
+def dir_mtime(path):
+    """mtime of a directory, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def walk_dirs(root, dir_mtimes):
+    """os.walk(root) that records the mtime of every directory it visits in dir_mtimes."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dir_mtimes[dirpath] = dir_mtime(dirpath)
+        yield dirpath, dirnames, filenames
+
+
+def cached_discovery(key, discover):
+    """
+    Return discover(dir_mtimes)'s result for key, re-running it only if a directory it
+    looked at has changed. Within one generation each key is checked at most once.
+    """
+    entry = _DISCOVERY_CACHE.get(key)
+    if entry is not None and key not in _DISCOVERY_CHECKED:
+        if any(dir_mtime(d) != mtime for d, mtime in entry[0].items()):
+            entry = None
+    if entry is None:
+        dir_mtimes = {}
+        result = discover(dir_mtimes)
+        entry = (dir_mtimes, result)
+        _DISCOVERY_CACHE[key] = entry
+    _DISCOVERY_CHECKED.add(key)
+    return entry[1]
+
+
+def begin_discovery_pass():
+    """Start of a generation: cached folder walks are revalidated once on their next use."""
+    _DISCOVERY_CHECKED.clear()
+
+
+def refresh_search_dirs():
+    """Forget every cached folder walk so the next lookups walk the folders again."""
+    _DISCOVERY_CACHE.clear()
+    _DISCOVERY_CHECKED.clear()
+
+
 # Language-specific search directories
 # These will be the base directories - the script will search recursively
 def get_search_dirs(language="Malayalam"):
@@ -283,8 +493,8 @@ def get_search_dirs(language="Malayalam"):
     Args:
         language: "Malayalam" or "English" - determines which HCS folder to look for
     """
-    # Use current working directory as base (set by GUI or default to script location)
-    cwd = os.getcwd()
+    # Use the source folder as base (picked in the GUI, else the working directory)
+    cwd = CONTEXT.source_root
     
     # Determine language folder name
     if language.lower() == "english":
@@ -292,77 +502,83 @@ def get_search_dirs(language="Malayalam"):
     else:
         lang_folder = "Malayalam HCS"
     
-    search_dirs = []
+    def discover(dir_mtimes):
+        # Folders whose listing decides whether the language folders below exist
+        onedrive_slides = os.path.join(ONEDRIVE_GIT_LOCAL, "Holy Communion Services - Slides")
+        for d in (cwd, PARENT_DIR, ONEDRIVE_GIT_LOCAL, onedrive_slides):
+            dir_mtimes[d] = dir_mtime(d)
+
+        search_dirs = []
     
-    # Check if user provided a custom path (cwd is different from script location)
-    user_provided_path = cwd != BASE_DIR and cwd != PARENT_DIR
+        # Check if user provided a custom path (cwd is different from script location)
+        user_provided_path = cwd != BASE_DIR and cwd != PARENT_DIR
     
-    if user_provided_path:
-        # User provided a path - search for language-specific folder
+        if user_provided_path:
+            # User provided a path - search for language-specific folder
         
-        # Check if cwd already IS the language folder
-        if os.path.isdir(cwd) and os.path.basename(cwd).lower() == lang_folder.lower():
-            search_dirs.append(cwd)
-        else:
-            # Check if cwd contains the language folder as immediate child
-            immediate_child = os.path.join(cwd, lang_folder)
-            if os.path.isdir(immediate_child):
-                search_dirs.append(immediate_child)
+            # Check if cwd already IS the language folder
+            if os.path.isdir(cwd) and os.path.basename(cwd).lower() == lang_folder.lower():
+                search_dirs.append(cwd)
             else:
-                # Search recursively for the language folder (e.g., user gave "Holy Communion Services - Slides")
-                for dirpath, dirnames, _ in os.walk(cwd):
-                    for d in dirnames:
-                        if d.lower() == lang_folder.lower():
-                            search_dirs.append(os.path.join(dirpath, d))
-                    # Stop after finding first match (don't search too deep)
-                    if search_dirs:
-                        break
+                # Check if cwd contains the language folder as immediate child
+                immediate_child = os.path.join(cwd, lang_folder)
+                if os.path.isdir(immediate_child):
+                    search_dirs.append(immediate_child)
+                else:
+                    # Search recursively for the language folder (e.g., user gave "Holy Communion Services - Slides")
+                    for dirpath, dirnames, _ in walk_dirs(cwd, dir_mtimes):
+                        for d in dirnames:
+                            if d.lower() == lang_folder.lower():
+                                search_dirs.append(os.path.join(dirpath, d))
+                        # Stop after finding first match (don't search too deep)
+                        if search_dirs:
+                            break
                 
-                # If language folder not found, use the user path as-is (search everything)
-                if not search_dirs and os.path.isdir(cwd):
-                    search_dirs.append(cwd)
-    
-    # Always add onedrive_git_local as fallback (from exe bundle or downloaded)
-    onedrive_path = os.path.join(ONEDRIVE_GIT_LOCAL, "Holy Communion Services - Slides", lang_folder)
-    if os.path.isdir(onedrive_path) and onedrive_path not in search_dirs:
-        search_dirs.append(onedrive_path)
-    elif os.path.isdir(ONEDRIVE_GIT_LOCAL):
-        # Search for language folder under onedrive_git_local
-        for dirpath, dirnames, _ in os.walk(ONEDRIVE_GIT_LOCAL):
-            for d in dirnames:
-                if d.lower() == lang_folder.lower():
-                    candidate = os.path.join(dirpath, d)
-                    if candidate not in search_dirs:
-                        search_dirs.append(candidate)
-            if any(lang_folder.lower() in p.lower() for p in search_dirs):
-                break
+                    # If language folder not found, use the user path as-is (search everything)
+                    if not search_dirs and os.path.isdir(cwd):
+                        search_dirs.append(cwd)
+    
+        # Always add onedrive_git_local as fallback (from exe bundle or downloaded)
+        onedrive_path = os.path.join(ONEDRIVE_GIT_LOCAL, "Holy Communion Services - Slides", lang_folder)
+        if os.path.isdir(onedrive_path) and onedrive_path not in search_dirs:
+            search_dirs.append(onedrive_path)
+        elif os.path.isdir(ONEDRIVE_GIT_LOCAL):
+            # Search for language folder under onedrive_git_local
+            for dirpath, dirnames, _ in walk_dirs(ONEDRIVE_GIT_LOCAL, dir_mtimes):
+                for d in dirnames:
+                    if d.lower() == lang_folder.lower():
+                        candidate = os.path.join(dirpath, d)
+                        if candidate not in search_dirs:
+                            search_dirs.append(candidate)
+                if any(lang_folder.lower() in p.lower() for p in search_dirs):
+                    break
     
-    # Final fallback to BASE_DIR if nothing found
-    if not search_dirs:
-        search_dirs = [BASE_DIR]
+        # Final fallback to BASE_DIR if nothing found
+        if not search_dirs:
+            search_dirs = [BASE_DIR]
     
-    return search_dirs
+        return search_dirs
 
+    return list(cached_discovery(("search_dirs", cwd, lang_folder), discover))
 
-# Initialize with default Malayalam directories (will be updated when script runs)
-MALAYALAM_SEARCH_DIRS = get_search_dirs()
 
 def find_all_pptx_files(search_dirs):
-    """Recursively find all .pptx files in Malayalam directories."""
-    # Use Malayalam directories
-    dirs_to_search = get_search_dirs()
-    
-    pptx_files = []
-    for d in dirs_to_search:
-        if os.path.isdir(d):
-            for root, dirs, files in os.walk(d):
-                for f in files:
-                    if f.endswith(".pptx") and not f.startswith("~$"):
-                        pptx_files.append(os.path.join(root, f))
-    return pptx_files
-
-
-def find_song_slide_indices_in_pptx(pptx_path, target_hymn_num="", song_title_hint=""):
+    """Recursively find all .pptx files in the given directories (from get_search_dirs())."""
+    def discover(dir_mtimes):
+        pptx_files = []
+        for d in search_dirs:
+            dir_mtimes[os.path.dirname(d)] = dir_mtime(os.path.dirname(d))
+            if os.path.isdir(d):
+                for root, dirs, files in walk_dirs(d, dir_mtimes):
+                    for f in files:
+                        if f.endswith(".pptx") and not f.startswith("~$"):
+                            pptx_files.append(os.path.join(root, f))
+        return pptx_files
+
+    return list(cached_discovery(("pptx_files", tuple(search_dirs)), discover))
+
+
+def find_song_slide_indices_in_pptx(pptx_path, target_hymn_num="", song_title_hint="", prs=None):
     """
     Find the slide indices for a specific hymn in a PPTX file.
     
@@ -375,14 +591,17 @@ def find_song_slide_indices_in_pptx(pptx_path, target_hymn_num="", song_title_hi
         pptx_path: Path to the PPTX file
         target_hymn_num: The hymn number to search for (e.g., "171") - optional
         song_title_hint: Song title to search for - optional
+        prs: Already-read slides for pptx_path (read_slide_text() result or Presentation, optional)
     
     Returns (title_slide_idx, [content_slide_indices], extracted_title) or (None, [], "").
     """
     target = str(target_hymn_num) if target_hymn_num else ""
-    try:
-        prs = Presentation(pptx_path)
-    except Exception:
-        return None, [], ""
+    if prs is None:
+        try:
+            # Reuse the deck if it's already parsed for cloning, otherwise just read its text
+            prs = get_cached_presentation(pptx_path) or read_slide_text(pptx_path)
+        except Exception:
+            return None, [], ""
 
     # Need at least one search criteria
     if not target and not song_title_hint:
@@ -675,9 +894,525 @@ def find_song_slide_indices_in_pptx(pptx_path, target_hymn_num="", song_title_hi
     return title_slide_idx, content_indices, extracted_title
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARALLEL DECK SCANNING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Worker processes used when many decks have to be parsed (index builds, searches
+# without the index). 0 = one per CPU core, 1 = scan serially in this process.
+SCAN_WORKERS = 0
+
+# Below this many decks, process start-up costs more than it saves
+PARALLEL_MIN_DECKS = 4
+
+
+def set_scan_workers(workers):
+    """Set the number of deck scanning worker processes (0 = one per CPU core)."""
+    global SCAN_WORKERS
+    SCAN_WORKERS = max(0, int(workers))
+
+
+def get_scan_workers():
+    """Effective number of deck scanning worker processes."""
+    return SCAN_WORKERS or os.cpu_count() or 1
+
+
+def map_decks(func, jobs):
+    """
+    Run func(*job) for every job (one job per deck), across worker processes when worthwhile.
+
+    Results are returned in job order whichever worker finishes first, so callers merge
+    them exactly as the serial loop would. func must be a module-level function that
+    returns plain data.
+    """
+    workers = min(get_scan_workers(), len(jobs))
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_DECKS:
+        # Imported here so that importing this module stays cheap (see startup_benchmark.py)
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(func, *zip(*jobs)))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"  ⚠ Parallel scan unavailable ({e}) - scanning PPT files one by one")
+    return [func(*job) for job in jobs]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HYMN SLIDE INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Persistent SQLite index of find_song_slide_indices_in_pptx() results, so that a
+# hymn lookup is a single query instead of re-parsing every service deck.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".church_ppt_cache")
+HYMN_INDEX_DB = os.path.join(CACHE_DIR, "malayalam_hymn_index.sqlite3")
+USE_HYMN_INDEX = True
+# Bump when the table layout or the stored analysis changes; older indexes are rebuilt
+HYMN_INDEX_SCHEMA_VERSION = 2
+
+# Loose form of build_hymn_pattern() - lists every hymn number a deck mentions
+HYMN_NUMBER_SCAN_PATTERN = re.compile(r"(?:Hymn\s*(?:No\.?\s*)?[-–]?\s*|Song\s*No\.?\s*)(\d+)", re.IGNORECASE)
+
+SECTION_LABELS = ["Opening", "Confession", "Offertory", "Thanksgiving", "Communion", "Closing", "Dedication", "B/A"]
+
+# Deck lists already checked for changes during this generation
+_HYMN_INDEX_CHECKED = set()
+
+
+class HymnIndexNotReady(Exception):
+    """A read-only lookup needs index data that hasn't been built yet (see warm_up())."""
+
+
+def open_hymn_index():
+    """Open the hymn slide index database, creating the tables if needed."""
+    os.makedirs(os.path.dirname(HYMN_INDEX_DB), exist_ok=True)
+    conn = sqlite3.connect(HYMN_INDEX_DB)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != HYMN_INDEX_SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS decks; DROP TABLE IF EXISTS hymn_slides;")
+        conn.execute(f"PRAGMA user_version = {HYMN_INDEX_SCHEMA_VERSION}")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS decks (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            sha1 TEXT NOT NULL,
+            search_text TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS hymn_slides (
+            path TEXT NOT NULL,
+            hymn_num TEXT NOT NULL,
+            title_hint TEXT NOT NULL,
+            section TEXT NOT NULL,
+            title_idx INTEGER,
+            first_idx INTEGER,
+            last_idx INTEGER,
+            content_indices TEXT NOT NULL,
+            extracted_title TEXT NOT NULL,
+            title_words TEXT NOT NULL,
+            PRIMARY KEY (path, hymn_num, title_hint)
+        );
+        CREATE INDEX IF NOT EXISTS hymn_slides_by_query ON hymn_slides (hymn_num, title_hint);
+    """)
+    return conn
+
+
+def file_sha1(path):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_slide_texts(prs):
+    """Return the combined text of each slide, built the same way find_song_slide_indices_in_pptx() does."""
+    slide_texts = []
+    for slide in prs.slides:
+        all_text = ""
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                all_text += " " + shape.text_frame.text.strip()
+        slide_texts.append(all_text)
+    return slide_texts
+
+
+def hymn_section(slide_texts, title_idx):
+    """Section label (Opening, Communion, ...) named on a hymn's title slide, if any."""
+    if title_idx is None:
+        return ""
+    title_text = slide_texts[title_idx].lower()
+    return next((sec for sec in SECTION_LABELS if sec.lower() in title_text), "")
+
+
+def search_deck(pptx_path, queries):
+    """
+    Open one deck and run find_song_slide_indices_in_pptx() for each (hymn_num, song_name).
+
+    Returns [(result, section), ...] in query order, or None if the deck can't be opened.
+    """
+    try:
+        prs = read_slide_text(pptx_path)
+    except Exception:
+        return None
+    slide_texts = get_slide_texts(prs)
+    deck_results = []
+    for hymn_num, song_name in queries:
+        result = find_song_slide_indices_in_pptx(pptx_path, hymn_num, song_name, prs=prs)
+        deck_results.append((result, hymn_section(slide_texts, result[0])))
+    return deck_results
+
+
+def store_hymn_slides(conn, pptx_path, hymn_num, song_name, result, section):
+    """Record one find_song_slide_indices_in_pptx() result (empty results too) in the index."""
+    title_idx, content_indices, extracted_title = result
+    conn.execute(
+        "INSERT OR REPLACE INTO hymn_slides VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            pptx_path, hymn_num, song_name, section, title_idx,
+            min(content_indices) if content_indices else None,
+            max(content_indices) if content_indices else None,
+            json.dumps(content_indices), extracted_title,
+            " ".join(re.findall(r"\w+", extracted_title.lower())),
+        ),
+    )
+
+
+def analyze_deck_for_index(pptx_path):
+    """
+    Parse one deck and run the hymn number analysis the index stores for it.
+
+    Runs in scan worker processes, so it only returns data:
+    {"search_text": ..., "hymns": [(hymn_num, result, section), ...]} or {"error": message}.
+    """
+    try:
+        prs = read_slide_text(pptx_path)
+    except Exception as e:
+        return {"error": str(e)}
+
+    slide_texts = get_slide_texts(prs)
+    hymn_nums = {m.group(1) for text in slide_texts for m in HYMN_NUMBER_SCAN_PATTERN.finditer(text)}
+
+    hymns = []
+    for hymn_num in sorted(hymn_nums, key=int):
+        result = find_song_slide_indices_in_pptx(pptx_path, hymn_num, "", prs=prs)
+        hymns.append((hymn_num, result, hymn_section(slide_texts, result[0])))
+    return {"search_text": " ".join(slide_texts).lower(), "hymns": hymns}
+
+
+def index_deck(conn, pptx_path, stat, sha1, analysis):
+    """Replace the index entries for one deck with an analyze_deck_for_index() result."""
+    if "error" in analysis:
+        print(f"  ⚠ Could not index {os.path.basename(pptx_path)}: {analysis['error']}")
+        return False
+
+    conn.execute("DELETE FROM hymn_slides WHERE path = ?", (pptx_path,))
+    for hymn_num, result, section in analysis["hymns"]:
+        store_hymn_slides(conn, pptx_path, hymn_num, "", result, section)
+    conn.execute(
+        "INSERT OR REPLACE INTO decks VALUES (?, ?, ?, ?, ?)",
+        (pptx_path, stat.st_mtime, stat.st_size, sha1, analysis["search_text"]),
+    )
+    return True
+
+
+def remove_deck_from_index(conn, pptx_path):
+    """Drop everything the index knows about one deck."""
+    conn.execute("DELETE FROM hymn_slides WHERE path = ?", (pptx_path,))
+    conn.execute("DELETE FROM decks WHERE path = ?", (pptx_path,))
+
+
+def refresh_hymn_index(conn, pptx_files):
+    """
+    Bring the index up to date with pptx_files, re-analysing only decks that changed.
+
+    A deck whose mtime and size match the index is skipped without being read. If either
+    changed, its content hash decides: same content (e.g. a OneDrive re-sync) only updates
+    the stored mtime/size, different content re-runs the deck analysis. Entries for decks
+    that no longer exist on disk are dropped.
+
+    Returns a dict of counts: added, updated, unchanged, removed.
+    """
+    stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    indexed = {
+        path: (mtime, size, sha1)
+        for path, mtime, size, sha1 in conn.execute("SELECT path, mtime, size, sha1 FROM decks")
+    }
+
+    # Drop decks that were deleted since the last refresh
+    for path in indexed:
+        if not os.path.exists(path):
+            remove_deck_from_index(conn, path)
+            stats["removed"] += 1
+
+    changed = []
+    for pf in pptx_files:
+        try:
+            stat = os.stat(pf)
+            known = indexed.get(pf)
+            if known and known[:2] == (stat.st_mtime, stat.st_size):
+                stats["unchanged"] += 1
+                continue
+            sha1 = file_sha1(pf)
+        except OSError:
+            continue
+        if known and known[2] == sha1:
+            conn.execute("UPDATE decks SET mtime = ?, size = ? WHERE path = ?", (stat.st_mtime, stat.st_size, pf))
+            stats["unchanged"] += 1
+            continue
+        changed.append((pf, stat, sha1, "updated" if known else "added"))
+
+    if changed:
+        print(f"  Indexing {len(changed)} PPT file(s) (first run may take a while)...")
+        analyses = map_decks(analyze_deck_for_index, [(pf,) for pf, _, _, _ in changed])
+        for (pf, stat, sha1, kind), analysis in zip(changed, analyses):
+            if index_deck(conn, pf, stat, sha1, analysis):
+                stats[kind] += 1
+    conn.commit()
+
+    if stats["added"] or stats["updated"] or stats["removed"]:
+        print(f"  ✓ Hymn index: {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+    return stats
+
+
+def deck_may_contain_song(search_text, deck_hymn_nums, hymn_num, song_name):
+    """Cheap pre-check: can find_song_slide_indices_in_pptx() match anything in this deck?"""
+    if hymn_num and hymn_num in deck_hymn_nums:
+        return True
+    if song_name and len(song_name) > 2:
+        title_words = [w for w in song_name.split()[:3] if len(w) > 2]
+        if title_words:
+            matches = sum(1 for word in title_words if word.lower() in search_text)
+            return matches >= min(2, len(title_words))
+    return False
+
+
+def ensure_hymn_index_current(conn, pptx_files):
+    """refresh_hymn_index() for pptx_files, at most once per generation."""
+    files_key = tuple(pptx_files)
+    if files_key not in _HYMN_INDEX_CHECKED:
+        refresh_hymn_index(conn, pptx_files)
+        _HYMN_INDEX_CHECKED.add(files_key)
+
+
+def song_query(hymn_num, song_name):
+    """Normalized (hymn_num, song_name) key used for index and resolver lookups."""
+    return (str(hymn_num) if hymn_num else "", song_name or "")
+
+
+def lookup_hymn_index_many(pptx_files, queries, unindexed=None):
+    """
+    Answer find_song_slide_indices_in_pptx() for several (hymn_num, song_name) queries
+    across a list of decks from the hymn index.
+
+    Hymn number lookups are a single query each. Title lookups are answered from the
+    index once they have been asked before; otherwise the decks whose text could contain
+    the title are parsed - each deck once for all pending queries - and the results are
+    stored for next time.
+
+    If unindexed (a set) is given the lookup is read-only: the index isn't refreshed, no
+    deck is parsed, and the title queries that would have needed parsing are added to
+    unindexed instead. Raises HymnIndexNotReady if the index is still empty.
+
+    Returns {query: [(pptx_path, title_idx, content_indices, extracted_title), ...]} with
+    the decks that matched, in pptx_files order.
+    """
+    queries = [song_query(*q) for q in queries]
+    found = {q: {} for q in queries}
+
+    with closing(open_hymn_index()) as conn:
+        if unindexed is None:
+            ensure_hymn_index_current(conn, pptx_files)
+        elif pptx_files and not hymn_index_ready(conn):
+            raise HymnIndexNotReady("hymn index not built yet")
+
+        for hymn_num, song_name in queries:
+            for path, title_idx, content, extracted_title in conn.execute(
+                "SELECT path, title_idx, content_indices, extracted_title FROM hymn_slides "
+                "WHERE hymn_num = ? AND title_hint = ?",
+                (hymn_num, song_name),
+            ):
+                found[(hymn_num, song_name)][path] = (title_idx, json.loads(content), extracted_title)
+
+        # Title lookups not seen before: collect the decks that could match
+        pending = {}
+        if any(song_name for _, song_name in queries):
+            # Decks that mention each queried hymn number (for title + number queries)
+            deck_hymn_nums = {}
+            for hymn_num in {q[0] for q in queries if q[1] and q[0]}:
+                for (path,) in conn.execute(
+                    "SELECT path FROM hymn_slides WHERE hymn_num = ? AND title_hint = ''", (hymn_num,)
+                ):
+                    deck_hymn_nums.setdefault(path, set()).add(hymn_num)
+            search_texts = dict(conn.execute("SELECT path, search_text FROM decks"))
+            for hymn_num, song_name in queries:
+                if not song_name:
+                    continue
+                for pf in pptx_files:
+                    if pf in found[(hymn_num, song_name)] or pf not in search_texts:
+                        continue
+                    if deck_may_contain_song(search_texts[pf], deck_hymn_nums.get(pf, set()), hymn_num, song_name):
+                        pending.setdefault(pf, []).append((hymn_num, song_name))
+
+        if unindexed is not None:
+            unindexed.update(q for deck_queries in pending.values() for q in deck_queries)
+            pending = {}
+
+        jobs = [(pf, pending[pf]) for pf in pptx_files if pf in pending]
+        for (pf, deck_queries), deck_results in zip(jobs, map_decks(search_deck, jobs)):
+            if deck_results is None:
+                continue
+            for (hymn_num, song_name), (result, section) in zip(deck_queries, deck_results):
+                store_hymn_slides(conn, pf, hymn_num, song_name, result, section)
+                found[(hymn_num, song_name)][pf] = result
+        conn.commit()
+
+    return {
+        q: [(pf,) + found[q][pf] for pf in pptx_files if pf in found[q] and found[q][pf][1]]
+        for q in queries
+    }
+
+
+def lookup_hymn_index(pptx_files, hymn_num, song_name="", unindexed=None):
+    """Single-query form of lookup_hymn_index_many()."""
+    return lookup_hymn_index_many(pptx_files, [(hymn_num, song_name)], unindexed)[song_query(hymn_num, song_name)]
+
+
+def hymn_index_ready(conn):
+    """Whether the hymn index has been filled at least once."""
+    return conn.execute("SELECT 1 FROM decks LIMIT 1").fetchone() is not None
+
+
+def index_song_queries(queries):
+    """
+    Store in the hymn index the title lookups read-only lookups reported as unindexed,
+    so they are answered from the index next time. Returns the number of queries.
+    """
+    pptx_files = find_all_pptx_files(get_search_dirs())
+    # KK hymnbook decks are searched with find_hymn_in_kk_pptx() instead
+    regular_files = [pf for pf in pptx_files if "KK" not in os.path.basename(pf).upper() and "Kristeeya" not in os.path.basename(pf)]
+    lookup_hymn_index_many(regular_files, queries)
+    return len(queries)
+
+
+def update_hymn_index():
+    """Refresh the hymn index, and the KK offset tables, for all PPT files in the search
+    folders (--refresh-index)."""
+    pptx_files = find_all_pptx_files(get_search_dirs())
+    # KK hymnbook decks are searched with find_hymn_in_kk_pptx() instead
+    regular_files = [pf for pf in pptx_files if "KK" not in os.path.basename(pf).upper() and "Kristeeya" not in os.path.basename(pf)]
+    with closing(open_hymn_index()) as conn:
+        stats = refresh_hymn_index(conn, regular_files)
+    for pf in pptx_files:
+        if pf not in regular_files:
+            load_kk_offset_table(pf)
+    return stats
+
+
+def scan_decks_for_songs(pptx_files, queries):
+    """Search every deck directly (no index), opening each deck once for all queries.
+    Same result format as lookup_hymn_index_many()."""
+    queries = [song_query(*q) for q in queries]
+    matches = {q: [] for q in queries}
+    jobs = [(pf, queries) for pf in pptx_files]
+    for pf, deck_results in zip(pptx_files, map_decks(search_deck, jobs)):
+        if deck_results is None:
+            continue
+        for query, ((t_idx, c_indices, extracted_title), _) in zip(queries, deck_results):
+            if c_indices:
+                matches[query].append((pf, t_idx, c_indices, extracted_title))
+    return matches
+
+
+def scan_decks_for_song(pptx_files, hymn_num, song_name):
+    """Single-query form of scan_decks_for_songs()."""
+    return scan_decks_for_songs(pptx_files, [(hymn_num, song_name)])[song_query(hymn_num, song_name)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVICE SONG RESOLVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Candidate decks for each song of the service being generated, filled once by
+# resolve_song_sources(): {(hymn_num, song_name): [(pptx_path, title_idx, content_indices, extracted_title), ...]}
+RESOLVED_SONG_SOURCES = {}
+
+
+def resolve_song_sources(song_list):
+    """
+    Find the candidate decks for every song in the service in one pass over the corpus.
+
+    Hymn number lookups come from the hymn index; anything that still needs a deck to be
+    parsed is grouped so each deck is opened at most once for the whole service.
+    find_best_song_source() then chooses among these candidates song by song, so the
+    USED_SLIDE_RANGES duplicate checks still run in service order.
+    """
+    RESOLVED_SONG_SOURCES.clear()
+
+    queries = []
+    for song in song_list:
+        if song["label"].lower() == "message":
+            continue
+        query = song_query(song["hymn_num"], song.get("title_hint", ""))
+        if any(query) and query not in queries:
+            queries.append(query)
+    if not queries:
+        return RESOLVED_SONG_SOURCES
+
+    pptx_files = find_all_pptx_files(get_search_dirs())
+    # KK hymnbook decks are searched with find_hymn_in_kk_pptx() instead
+    regular_files = [pf for pf in pptx_files if "KK" not in os.path.basename(pf).upper() and "Kristeeya" not in os.path.basename(pf)]
+    print(f"🔎 Resolving {len(queries)} song(s) across {len(regular_files)} PPT files...")
+
+    resolved = None
+    if USE_HYMN_INDEX:
+        try:
+            resolved = lookup_hymn_index_many(regular_files, queries)
+        except (sqlite3.Error, OSError) as e:
+            print(f"  ⚠ Hymn index unavailable ({e}) - searching PPT files directly")
+    if resolved is None:
+        resolved = scan_decks_for_songs(regular_files, queries)
+
+    RESOLVED_SONG_SOURCES.update(resolved)
+    return RESOLVED_SONG_SOURCES
+
+
 # Global tracking of used slide ranges to prevent duplicates
 USED_SLIDE_RANGES = {}
 
+
+def find_song_matches(pptx_files, hymn_num, song_name):
+    """Decks among pptx_files with slides for a song, from the hymn index (or a direct
+    scan if the index is unavailable). Same result format as lookup_hymn_index()."""
+    if USE_HYMN_INDEX:
+        try:
+            return lookup_hymn_index(pptx_files, hymn_num, song_name)
+        except (sqlite3.Error, OSError) as e:
+            print(f"  ⚠ Hymn index unavailable ({e}) - searching PPT files directly")
+    return scan_decks_for_song(pptx_files, hymn_num, song_name)
+
+
+def kk_song_matches(kk_files, hymn_num, read_only=False):
+    """KK hymnbook decks with slides for hymn_num, titled from kk_hymn_mapping.json.
+    Same result format as lookup_hymn_index(). read_only only uses saved offset tables
+    (raising HymnIndexNotReady for a deck without one) and skips non-numeric hymns."""
+    matches = []
+    for pf in kk_files:
+        if read_only:
+            if not str(hymn_num).isdecimal():
+                continue
+            hymns = saved_kk_offset_table(pf)
+            if hymns is None:
+                raise HymnIndexNotReady(f"KK offset table for {os.path.basename(pf)} not built yet")
+            t_idx, c_indices, extracted_title = kk_offset_table_lookup(hymns, hymn_num)
+        else:
+            # Use specialized KK search function for KK.pptx files
+            t_idx, c_indices, extracted_title = find_hymn_in_kk_pptx(pf, hymn_num)
+        if c_indices:
+            # Use title from kk_hymn_mapping.json instead of extracted title
+            matches.append((pf, t_idx, c_indices, CONTEXT.kk_hymn_mapping.get(str(hymn_num), extracted_title)))
+    return matches
+
+
+def pick_song_source(matches, hymn_num, used_ranges):
+    """
+    The match with the most content slides (the first one on a tie), skipping slides that
+    used_ranges ({"path:first-last": hymn_num}) records for a different hymn number.
+    Returns None if no match qualifies.
+    """
+    best = None
+    for match in matches:
+        pf, _, c_indices, _ = match
+        if c_indices and len(c_indices) > (len(best[2]) if best else 0):
+            # Check if these slides were already used BY A DIFFERENT HYMN NUMBER
+            # (Same hymn can be reused multiple times in one service)
+            slide_key = f"{pf}:{min(c_indices)}-{max(c_indices)}"
+            if slide_key not in used_ranges or used_ranges[slide_key] == hymn_num:
+                best = match
+    return best
+
+
 def find_best_song_source(hymn_num, song_name):
     """
     Search all PPT files and find the best source for a Malayalam song.
@@ -694,56 +1429,145 @@ def find_best_song_source(hymn_num, song_name):
     
     Returns: (pptx_path, title_idx, content_indices, extracted_title) or (None, None, [], "")
     """
-    pptx_files = find_all_pptx_files(SEARCH_DIRS)
+    pptx_files = find_all_pptx_files(get_search_dirs())
     
     # Separate KK files from regular service PPT files
     kk_files = [pf for pf in pptx_files if "KK" in os.path.basename(pf).upper() or "Kristeeya" in os.path.basename(pf)]
     regular_files = [pf for pf in pptx_files if pf not in kk_files]
     
-    best_source = None
-    best_count = 0
-    best_title_idx = None
-    best_content = []
-    best_extracted_title = ""
-    
-    # First search regular service PPT files
-    for pf in regular_files:
-        t_idx, c_indices, extracted_title = find_song_slide_indices_in_pptx(pf, hymn_num, song_name)
-        if c_indices and len(c_indices) > best_count:
-            # Check if these slides were already used BY A DIFFERENT HYMN NUMBER
-            # (Same hymn can be reused multiple times in one service)
-            slide_key = f"{pf}:{min(c_indices)}-{max(c_indices)}"
-            if slide_key not in USED_SLIDE_RANGES or USED_SLIDE_RANGES[slide_key] == hymn_num:
-                best_source = pf
-                best_count = len(c_indices)
-                best_title_idx = t_idx
-                best_content = c_indices
-                best_extracted_title = extracted_title
+    # First search regular service PPT files (resolved up front for the service, or from the hymn index)
+    regular_matches = RESOLVED_SONG_SOURCES.get(song_query(hymn_num, song_name))
+    if regular_matches is None:
+        regular_matches = find_song_matches(regular_files, hymn_num, song_name)
+    best = pick_song_source(regular_matches, hymn_num, USED_SLIDE_RANGES)
     
     # If not found in regular files, search KK files as last resort
-    if not best_source:
-        for pf in kk_files:
-            # Use specialized KK search function for KK.pptx files
-            t_idx, c_indices, extracted_title = find_hymn_in_kk_pptx(pf, hymn_num)
-            
-            if c_indices and len(c_indices) > best_count:
-                slide_key = f"{pf}:{min(c_indices)}-{max(c_indices)}"
-                if slide_key not in USED_SLIDE_RANGES or USED_SLIDE_RANGES[slide_key] == hymn_num:
-                    best_source = pf
-                    best_count = len(c_indices)
-                    best_title_idx = t_idx
-                    best_content = c_indices
-                    # Use title from kk_hymn_mapping.json instead of extracted title
-                    best_extracted_title = KK_HYMN_MAPPING.get(str(hymn_num), extracted_title)
-    
-    # Mark these slides as used if we found something
-    if best_source and best_content:
-        slide_key = f"{best_source}:{min(best_content)}-{max(best_content)}"
-        USED_SLIDE_RANGES[slide_key] = hymn_num
+    if best is None:
+        best = pick_song_source(kk_song_matches(kk_files, hymn_num), hymn_num, USED_SLIDE_RANGES)
+    
+    if best is None:
+        return None, None, [], ""
+    
+    # Mark these slides as used
+    best_source, best_title_idx, best_content, best_extracted_title = best
+    slide_key = f"{best_source}:{min(best_content)}-{max(best_content)}"
+    USED_SLIDE_RANGES[slide_key] = hymn_num
     
     return best_source, best_title_idx, best_content, best_extracted_title
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# HYMN LOOKUP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def song_source_info(match, hymnbook=False):
+    """JSON-ready form of a (pptx_path, title_idx, content_indices, extracted_title) match.
+    Slide numbers are 1-based, as PowerPoint shows them."""
+    pf, t_idx, c_indices, extracted_title = match
+    return {
+        "deck": os.path.basename(pf),
+        "path": os.path.relpath(pf, PARENT_DIR),
+        "title_slide": t_idx + 1 if t_idx is not None else None,
+        "first_slide": min(c_indices) + 1,
+        "last_slide": max(c_indices) + 1,
+        "slide_count": len(c_indices),
+        "extracted_title": extracted_title,
+        "hymnbook": hymnbook,
+    }
+
+
+def describe_song_sources(hymn_num, song_name=""):
+    """
+    Where a song would be taken from, without generating anything (web /api/hymns/<num>).
+
+    Runs find_best_song_source()'s search as if it were the first song of a service, and
+    leaves USED_SLIDE_RANGES alone. Hymnbook decks are only consulted for a hymn number.
+    Read-only: answered from the hymn index and saved KK offset tables as warm_up() and
+    index_song_queries() left them, using the folder walks cached since the last
+    begin_discovery_pass(). Raises HymnIndexNotReady if they haven't been built yet.
+
+    Returns {"hymn_num", "title_hint", "found", "source", "matches", "pending"}: source is
+    the match find_best_song_source() would choose, matches every deck with slides for
+    the song, pending whether decks that may hold the title hint are still unindexed.
+    """
+    hymn_num, song_name = song_query(hymn_num, song_name)
+    
+    unindexed = set()
+    try:
+        pptx_files = find_all_pptx_files(get_search_dirs())
+        kk_files = [pf for pf in pptx_files if "KK" in os.path.basename(pf).upper() or "Kristeeya" in os.path.basename(pf)]
+        regular_files = [pf for pf in pptx_files if pf not in kk_files]
+        
+        regular_matches = lookup_hymn_index(regular_files, hymn_num, song_name, unindexed) if hymn_num or song_name else []
+        kk_matches = kk_song_matches(kk_files, hymn_num, read_only=True) if hymn_num else []
+    except (sqlite3.Error, OSError) as e:
+        raise HymnIndexNotReady(f"hymn index unavailable ({e})") from e
+    
+    best = pick_song_source(regular_matches, hymn_num, {})
+    source = song_source_info(best) if best else None
+    if best is None:
+        best = pick_song_source(kk_matches, hymn_num, {})
+        source = song_source_info(best, hymnbook=True) if best else None
+    
+    return {
+        "hymn_num": hymn_num,
+        "title_hint": song_name,
+        "found": source is not None,
+        "source": source,
+        "matches": [song_source_info(m) for m in regular_matches]
+                   + [song_source_info(m, hymnbook=True) for m in kk_matches],
+        "pending": bool(unindexed),
+    }
+
+
+def search_hymn_titles(title, limit=20):
+    """
+    Hymns whose title contains every word of title (web /api/hymns?title=).
+
+    Answered read-only from the hymn index's hymn number entries (as warm_up() left
+    them) and kk_hymn_mapping.json, so no deck is parsed. Raises HymnIndexNotReady if
+    the index hasn't been built yet. Returns up to limit [{"hymn_num", "title", "decks",
+    "hymnbook"}, ...], hymns found in the most service decks first.
+    """
+    words = re.findall(r"\w+", title.lower())
+    if not words:
+        return []
+    
+    hymns = {}
+    try:
+        pptx_files = find_all_pptx_files(get_search_dirs())
+        # KK hymnbook decks are searched with find_hymn_in_kk_pptx() instead
+        regular_files = [pf for pf in pptx_files if "KK" not in os.path.basename(pf).upper() and "Kristeeya" not in os.path.basename(pf)]
+        with closing(open_hymn_index()) as conn:
+            if regular_files and not hymn_index_ready(conn):
+                raise HymnIndexNotReady("hymn index not built yet")
+            rows = conn.execute(
+                "SELECT hymn_num, extracted_title FROM hymn_slides WHERE title_hint = '' AND content_indices != '[]'"
+                + " AND title_words LIKE ?" * len(words),
+                [f"%{word}%" for word in words],
+            ).fetchall()
+    except (sqlite3.Error, OSError) as e:
+        raise HymnIndexNotReady(f"hymn index unavailable ({e})") from e
+    for hymn_num, extracted_title in rows:
+        entry = hymns.setdefault(hymn_num, {"titles": Counter(), "decks": 0, "hymnbook": False})
+        entry["titles"][" ".join(extracted_title.split())] += 1
+        entry["decks"] += 1
+    
+    for hymn_num, kk_title in CONTEXT.kk_hymn_mapping.items():
+        kk_words = " ".join(re.findall(r"\w+", kk_title.lower()))
+        if all(word in kk_words for word in words):
+            entry = hymns.setdefault(hymn_num, {"titles": Counter({kk_title: 0}), "decks": 0, "hymnbook": False})
+            entry["hymnbook"] = True
+    
+    results = [
+        {"hymn_num": hymn_num, "title": entry["titles"].most_common(1)[0][0],
+         "decks": entry["decks"], "hymnbook": entry["hymnbook"]}
+        for hymn_num, entry in hymns.items()
+    ]
+    results.sort(key=lambda h: (-h["decks"], int(h["hymn_num"]) if h["hymn_num"].isdecimal() else 0, h["hymn_num"]))
+    return results[:limit]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE CREATION FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -900,7 +1724,7 @@ def clone_slides_from_source(source_pptx_path, slide_indices, target_prs,
     For Offertory slides with overlapping text, splits into Manglish and Malayalam slides.
     Returns the number of slides added.
     """
-    source_prs = Presentation(source_pptx_path)
+    source_prs = open_source_presentation(source_pptx_path)
     source_slides = list(source_prs.slides)
     added = 0
     
@@ -1239,6 +2063,47 @@ def remove_kk_decorative_shapes(slide):
                 pass
 
 
+# Image parts already imported into each generated presentation, so a background
+# repeated on every lyrics slide is hashed and added once:
+# {target package: {"parts": {source ImagePart: ImagePart}, "digests": {sha1: ImagePart}}}
+_IMPORTED_IMAGE_PARTS = weakref.WeakKeyDictionary()
+# SHA1 of each source image part's blob, computed once: {source ImagePart: sha1}
+_SOURCE_IMAGE_DIGESTS = weakref.WeakKeyDictionary()
+
+
+def import_image_part(source_part, target_prs):
+    """
+    Return the ImagePart in target_prs holding the same image as source_part, adding it if needed.
+
+    Same result as get_or_add_image_part(BytesIO(source_part.blob)) but each source part is
+    looked up once per target and each blob is hashed once, instead of re-hashing every image
+    already in the target on every call.
+    """
+    package = target_prs.part.package
+    imported = _IMPORTED_IMAGE_PARTS.get(package)
+    if imported is None:
+        imported = {"parts": weakref.WeakKeyDictionary(), "digests": {}}
+        for part in package.iter_parts():
+            if isinstance(part, ImagePart):
+                imported["digests"].setdefault(part.sha1, part)
+        _IMPORTED_IMAGE_PARTS[package] = imported
+
+    image_part = imported["parts"].get(source_part)
+    if image_part is not None:
+        return image_part
+
+    sha1 = _SOURCE_IMAGE_DIGESTS.get(source_part)
+    if sha1 is None:
+        sha1 = hashlib.sha1(source_part.blob).hexdigest()
+        _SOURCE_IMAGE_DIGESTS[source_part] = sha1
+    image_part = imported["digests"].get(sha1)
+    if image_part is None:
+        image_part = ImagePart.new(package, Image.from_blob(source_part.blob))
+        imported["digests"][sha1] = image_part
+    imported["parts"][source_part] = image_part
+    return image_part
+
+
 def clone_slide_exact(src_slide, target_prs, blank_layout):
     """Clone a slide preserving original shapes and formatting."""
     new_slide = target_prs.slides.add_slide(blank_layout)
@@ -1269,10 +2134,8 @@ def clone_slide_exact(src_slide, target_prs, blank_layout):
             # Image relationships - import the image part to target presentation
             try:
                 source_part = rel._target
-                # Import image/media part to target presentation
-                # Wrap blob bytes in BytesIO to provide file-like interface
-                image_stream = BytesIO(source_part.blob)
-                image_part = target_prs.part.package.get_or_add_image_part(image_stream)
+                # Import image/media part to target presentation (reused if already imported)
+                image_part = import_image_part(source_part, target_prs)
                 # Add relationship from slide to the imported image (without rId to let it auto-generate)
                 new_slide.part.relate_to(image_part, rel.reltype)
             except Exception as e:
@@ -1855,6 +2718,328 @@ def update_summary_slide_from_slides(prs, song_list):
             break
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEMPLATE SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# The template with its slides removed and layouts/date runs already located, saved as
+# bytes in memory and under CACHE_DIR, so each generation only parses a small empty deck
+# and replaces the dates. Bump the version when build_template_snapshot() changes.
+TEMPLATE_SNAPSHOT_VERSION = 1
+TEMPLATE_SNAPSHOT_PREFIX = "malayalam_template_"
+# {template_path: snapshot dict from load_template_snapshot()}
+_TEMPLATE_SNAPSHOTS = {}
+
+DATE_PATTERN = re.compile(r"\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}")
+
+
+def iter_template_runs(prs):
+    """Yield ((kind, part_idx, shape_idx, para_idx, run_idx), run) for every text run in the masters and layouts."""
+    parts = [("master", i, master) for i, master in enumerate(prs.slide_masters)]
+    parts += [("layout", i, layout) for i, layout in enumerate(prs.slide_layouts)]
+    for kind, part_idx, part in parts:
+        for shape_idx, shape in enumerate(part.shapes):
+            if not shape.has_text_frame:
+                continue
+            for para_idx, paragraph in enumerate(shape.text_frame.paragraphs):
+                for run_idx, run in enumerate(paragraph.runs):
+                    yield (kind, part_idx, shape_idx, para_idx, run_idx), run
+
+
+def get_template_run(prs, location):
+    kind, part_idx, shape_idx, para_idx, run_idx = location
+    part = prs.slide_masters[part_idx] if kind == "master" else prs.slide_layouts[part_idx]
+    return part.shapes[shape_idx].text_frame.paragraphs[para_idx].runs[run_idx]
+
+
+def remove_all_slides(prs):
+    """Remove every slide from a presentation."""
+    while len(prs.slides) > 0:
+        rId = prs.slides._sldIdLst[0].get(
+            "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+        )
+        prs.part.drop_rel(rId)
+        prs.slides._sldIdLst.remove(prs.slides._sldIdLst[0])
+
+
+def build_template_snapshot(template_path):
+    """
+    Strip the template down to an empty deck and record what each generation needs from it.
+
+    Returns {"blob": pptx bytes, "title_layout": index, "blank_layout": index,
+    "date_runs": [run location, ...]}; layout indexes are into prs.slide_layouts.
+    """
+    prs = Presentation(template_path)
+    remove_all_slides(prs)
+
+    layouts = list(prs.slide_layouts)
+    title_idx = None
+    blank_idx = None
+    for i, layout in enumerate(layouts):
+        if layout.name == "Malayalam HC - 03 Jan 2021":
+            title_idx = i
+        elif layout.name == "1_Blank" and blank_idx is None:
+            blank_idx = i
+    if title_idx is None:
+        title_idx = 0
+    if blank_idx is None:
+        blank_idx = len(layouts) - 1
+
+    date_runs = [list(location) for location, run in iter_template_runs(prs) if DATE_PATTERN.search(run.text)]
+
+    stream = BytesIO()
+    prs.save(stream)
+    return {"blob": stream.getvalue(), "title_layout": title_idx, "blank_layout": blank_idx, "date_runs": date_runs}
+
+
+def template_snapshot_paths(template_path):
+    name = TEMPLATE_SNAPSHOT_PREFIX + hashlib.sha1(os.path.abspath(template_path).encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(CACHE_DIR, name)
+    return base + ".pptx", base + ".json"
+
+
+def load_template_snapshot(template_path):
+    """
+    Return the snapshot for template_path, building it only when the template changed.
+
+    Snapshots are checked against the template's size and mtime, first in memory, then on disk.
+    The metadata file records the SHA-1 of the blob it was written with, so a blob replaced
+    by another process in between is never paired with the wrong metadata.
+    """
+    stat = os.stat(template_path)
+    stamp = {"version": TEMPLATE_SNAPSHOT_VERSION, "size": stat.st_size, "mtime": stat.st_mtime}
+    snapshot = _TEMPLATE_SNAPSHOTS.get(template_path)
+    if snapshot and snapshot["stamp"] == stamp:
+        return snapshot
+
+    pptx_path, meta_path = template_snapshot_paths(template_path)
+    snapshot = None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("stamp") == stamp:
+            with open(pptx_path, "rb") as f:
+                blob = f.read()
+            if hashlib.sha1(blob).hexdigest() == meta.get("blob_sha1"):
+                meta["blob"] = blob
+                snapshot = meta
+    except (OSError, ValueError):
+        pass
+
+    if snapshot is None:
+        print("  Preparing template snapshot...")
+        snapshot = build_template_snapshot(template_path)
+        snapshot["stamp"] = stamp
+        snapshot["blob_sha1"] = hashlib.sha1(snapshot["blob"]).hexdigest()
+        # Per-process temp names: several workers may warm up at once
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(pptx_path + suffix, "wb") as f:
+                f.write(snapshot["blob"])
+            os.replace(pptx_path + suffix, pptx_path)
+            meta = {key: value for key, value in snapshot.items() if key != "blob"}
+            with open(meta_path + suffix, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            print(f"  ⚠ Could not save template snapshot: {e}")
+
+    _TEMPLATE_SNAPSHOTS[template_path] = snapshot
+    return snapshot
+
+
+def open_template(template_path, service_date):
+    """
+    Open a fresh, slide-free copy of the template with its dates set to service_date.
+
+    Returns (prs, title_layout, blank_layout). Dates are left as they are if service_date is empty.
+    """
+    snapshot = load_template_snapshot(template_path)
+    prs = Presentation(BytesIO(snapshot["blob"]))
+    if service_date:
+        for location in snapshot["date_runs"]:
+            run = get_template_run(prs, location)
+            run.text = DATE_PATTERN.sub(service_date, run.text)
+    return prs, prs.slide_layouts[snapshot["title_layout"]], prs.slide_layouts[snapshot["blank_layout"]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTPUT CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Finished presentations keyed by everything that decides their content, so regenerating
+# an unchanged service list copies the earlier deck instead of rebuilding it.
+USE_OUTPUT_CACHE = True
+OUTPUT_CACHE_DIR = os.path.join(CACHE_DIR, "malayalam_outputs")
+# Least-recently-used decks are deleted once the cache grows past this
+OUTPUT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Bump when generation changes in a way that alters the output for the same inputs
+OUTPUT_CACHE_VERSION = 1
+# Images placed on generated slides; replacing one invalidates the cached decks
+OUTPUT_CACHE_IMAGES = ("holy_communion.jpg", "qr_code.png")
+
+# Template digests already computed in this process: {path: ((size, mtime), sha1)}
+_TEMPLATE_HASHES = {}
+
+
+def set_output_cache(enabled):
+    """Turn the output cache on or off (--no-cache)."""
+    global USE_OUTPUT_CACHE
+    USE_OUTPUT_CACHE = bool(enabled)
+
+
+def template_hash(template_path):
+    """SHA-1 of the template's contents, re-hashed only when its size or mtime changes."""
+    stat = os.stat(template_path)
+    stamp = (stat.st_size, stat.st_mtime)
+    known = _TEMPLATE_HASHES.get(template_path)
+    if known and known[0] == stamp:
+        return known[1]
+    digest = file_sha1(template_path)
+    _TEMPLATE_HASHES[template_path] = (stamp, digest)
+    return digest
+
+
+def corpus_version(pptx_files):
+    """
+    Digest of the corpus a generation reads: every searchable deck's path, size and mtime,
+    the slide images, this module and the index format versions.
+    """
+    digest = hashlib.sha1(f"{OUTPUT_CACHE_VERSION}|{HYMN_INDEX_SCHEMA_VERSION}|{KK_OFFSETS_VERSION}\n".encode("utf-8"))
+    paths = [*pptx_files, KK_MAPPING_PATH, os.path.abspath(__file__)] + [resolve_image_path(name) for name in OUTPUT_CACHE_IMAGES]
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}|{stat.st_size}|{stat.st_mtime}\n".encode("utf-8"))
+        except OSError:
+            digest.update(f"{path}|missing\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def output_cache_key(song_list, service_date, template_path):
+    """Key for a generation: normalized song list, service date, template hash and corpus version."""
+    songs = [
+        [str(song.get(field) or "").strip() for field in ("label", "hymn_num", "title_hint")]
+        for song in song_list
+    ]
+    payload = json.dumps({
+        "songs": songs,
+        "date": service_date or "",
+        "template": template_hash(template_path),
+        "corpus": corpus_version(find_all_pptx_files(get_search_dirs())),
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def output_cache_paths(key):
+    """(pptx path, metadata path) of a cached deck."""
+    base = os.path.join(OUTPUT_CACHE_DIR, key)
+    return base + ".pptx", base + ".json"
+
+
+def load_cached_output(key, output_path):
+    """Copy the cached deck for key to output_path and return its metadata, or None if not cached."""
+    pptx_path, meta_path = output_cache_paths(key)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        shutil.copyfile(pptx_path, output_path)
+        # Mark as recently used for prune_output_cache()
+        os.utime(pptx_path)
+    except (OSError, ValueError):
+        return None
+    return meta
+
+
+def store_cached_output(key, output_path, meta):
+    """Save a finished deck under key (the metadata file is written last, marking it complete)."""
+    pptx_path, meta_path = output_cache_paths(key)
+    suffix = f".{os.getpid()}.tmp"
+    try:
+        os.makedirs(OUTPUT_CACHE_DIR, exist_ok=True)
+        shutil.copyfile(output_path, pptx_path + suffix)
+        os.replace(pptx_path + suffix, pptx_path)
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + suffix, meta_path)
+        prune_output_cache()
+    except OSError as e:
+        print(f"  ⚠ Could not save presentation to the output cache: {e}")
+
+
+def prune_output_cache(max_bytes=None):
+    """Delete least-recently-used cached decks until the cache fits in max_bytes."""
+    if max_bytes is None:
+        max_bytes = OUTPUT_CACHE_MAX_BYTES
+    entries = []
+    for name in os.listdir(OUTPUT_CACHE_DIR):
+        if name.endswith(".pptx"):
+            path = os.path.join(OUTPUT_CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        for stale in (os.path.splitext(path)[0] + ".json", path):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        total -= size
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WARM-UP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def warm_up(progress=None, update_index=True):
+    """
+    Load the corpus state a generation needs before the first one is requested.
+
+    Used by long-lived processes (web workers, the GUI): walks the search folders, brings
+    the hymn index up to date, builds the template snapshot, and loads the KK offset table
+    and the parsed KK hymnbook. Everything stays cached in this process, so later
+    generations only revalidate it. progress, if given, is called with a short message
+    before each step. With update_index=False the hymn index and KK offset tables are
+    left to another process (the web app's hymn index refresher) and only the saved KK
+    offset tables are loaded. Returns the seconds taken.
+    """
+    def step(message):
+        if progress:
+            progress(message)
+
+    started = time.perf_counter()
+    step("Finding hymn folders")
+    begin_discovery_pass()
+    CONTEXT.ensure_images_dir()
+    search_dirs = CONTEXT.search_dirs
+    if USE_HYMN_INDEX and update_index:
+        step("Updating hymn index")
+        try:
+            update_hymn_index()
+        except (sqlite3.Error, OSError) as e:
+            print(f"  ⚠ Hymn index unavailable ({e})")
+    step("Loading template")
+    template_path = find_template_ppt()
+    if template_path:
+        load_template_snapshot(template_path)
+    step("Loading KK hymnbook")
+    for pf in find_all_pptx_files(search_dirs):
+        if "KK" in os.path.basename(pf).upper() or "Kristeeya" in os.path.basename(pf):
+            if update_index:
+                load_kk_offset_table(pf)
+            else:
+                saved_kk_offset_table(pf)
+            open_source_presentation(pf)
+    return time.perf_counter() - started
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN GENERATION LOGIC
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1872,10 +3057,15 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
     # Reset used slide ranges for this generation
     global USED_SLIDE_RANGES
     USED_SLIDE_RANGES = {}
+    # Check the hymn index for changed decks once per generation
+    _HYMN_INDEX_CHECKED.clear()
     
     # Refresh search directories based on current working directory
+    # (cached folder walks are revalidated once for this generation)
+    begin_discovery_pass()
+    CONTEXT.ensure_images_dir()
     global MALAYALAM_SEARCH_DIRS
-    MALAYALAM_SEARCH_DIRS = get_search_dirs()
+    MALAYALAM_SEARCH_DIRS = CONTEXT.search_dirs
     
     if output_filename is None:
         today = datetime.now().strftime("%d %b %Y")
@@ -1884,7 +3074,7 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
     output_path = os.path.join(BASE_DIR, output_filename)
     
     print(f"  Language: Malayalam")
-    print(f"  Search directories: {get_search_dirs()}")
+    print(f"  Search directories: {MALAYALAM_SEARCH_DIRS}")
 
     def normalize_service_date(date_text):
         if not date_text:
@@ -1914,54 +3104,33 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
         )
 
     print(f"  Template: {template_path}")
-    prs = Presentation(template_path)
 
-    # Update date in slide masters/layouts
     normalized_date = normalize_service_date(service_date)
     # If no date provided, use today's date
     if not normalized_date:
         normalized_date = datetime.now().strftime("%d %B %Y")
-    
-    date_pattern = re.compile(r"\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}")
-    for master in prs.slide_masters:
-        for shape in master.shapes:
-            if not shape.has_text_frame:
-                continue
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    if date_pattern.search(run.text):
-                        run.text = date_pattern.sub(normalized_date, run.text)
-    for layout in prs.slide_layouts:
-        for shape in layout.shapes:
-            if not shape.has_text_frame:
-                continue
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    if date_pattern.search(run.text):
-                        run.text = date_pattern.sub(normalized_date, run.text)
 
-    # Remove all existing slides
-    while len(prs.slides) > 0:
-        rId = prs.slides._sldIdLst[0].get(
-            "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
-        )
-        prs.part.drop_rel(rId)
-        prs.slides._sldIdLst.remove(prs.slides._sldIdLst[0])
-
-    # Get layouts
-    title_layout = None
-    blank_layout = None
-    
-    for layout in prs.slide_layouts:
-        if layout.name == "Malayalam HC - 03 Jan 2021":
-            title_layout = layout
-        elif layout.name == "1_Blank" and blank_layout is None:
-            blank_layout = layout
-
-    if title_layout is None:
-        title_layout = prs.slide_layouts[0]
-    if blank_layout is None:
-        blank_layout = prs.slide_layouts[-1]
+    # Same service list, date, template and hymn files as an earlier run: reuse that deck
+    cache_key = None
+    if USE_OUTPUT_CACHE:
+        try:
+            cache_key = output_cache_key(song_list, normalized_date, template_path)
+        except OSError as e:
+            print(f"  ⚠ Output cache unavailable ({e})")
+        cached = load_cached_output(cache_key, output_path) if cache_key else None
+        if cached is not None:
+            # Callers read the extracted titles back from song_list
+            for song_info, title_hint in zip(song_list, cached["titles"]):
+                song_info["title_hint"] = title_hint
+            print("\n✓ Unchanged since an earlier run - reusing the presentation generated then")
+            print(f"\n{'═' * 60}")
+            print(f"✅ Presentation saved: {output_path}")
+            print(f"   Total slides: {cached['slides']}")
+            print(f"{'═' * 60}")
+            return output_path
+
+    # Empty copy of the template (no slides, layouts resolved) with the service date filled in
+    prs, title_layout, blank_layout = open_template(template_path, normalized_date)
     
     print(f"  Using title layout: '{title_layout.name}'")
     print(f"  Using content layout: '{blank_layout.name}'")
@@ -1973,6 +3142,9 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
     create_summary_slide(prs, title_layout, song_list, normalized_date)
     slide_counter += 1
 
+    # Find source decks for the whole service at once
+    resolve_song_sources(song_list)
+
     # Process each song section
     print("\n🎵 Processing songs...\n")
 
@@ -2027,6 +3199,11 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
 
     # Save
     prs.save(output_path)
+    if cache_key:
+        store_cached_output(cache_key, output_path, {
+            "titles": [song_info.get("title_hint", "") for song_info in song_list],
+            "slides": slide_counter - 1,
+        })
     print(f"\n{'═' * 60}")
     print(f"✅ Presentation saved: {output_path}")
     print(f"   Total slides: {slide_counter - 1}")
@@ -2035,6 +3212,235 @@ def generate_presentation(song_list, output_filename=None, service_date=None):
     return output_path
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MULTI-SERVICE BATCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def is_date_line(line):
+    """True for a "Date: ..." or "# Date: ..." directive."""
+    return line.lower().startswith("# date:") or line.lower().startswith("date:")
+
+
+def parse_song_line(line):
+    """One "hymn_num|label|title_hint" (or "Message") line as a song dict, else None."""
+    parts = line.split("|")
+    if len(parts) >= 2:
+        return {
+            "hymn_num": parts[0].strip(),
+            "label": parts[1].strip(),
+            "title_hint": parts[2].strip() if len(parts) > 2 else "",
+        }
+    if parts[0].strip().lower() == "message":
+        return {"hymn_num": "", "label": "Message", "title_hint": ""}
+    return None
+
+
+def parse_service_text(text):
+    """
+    Read one service written in the --batch format, e.g. from the GUI's text box.
+
+    Returns (songs, service_date); the date is None if there is no Date: line.
+    """
+    songs, service_date = [], None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if is_date_line(line):
+            service_date = line.split(":", 1)[1].strip() or None
+            continue
+        if line.startswith("#"):
+            continue
+        song = parse_song_line(line)
+        if song:
+            songs.append(song)
+    return songs, service_date
+
+
+def parse_services_file(batch_file):
+    """
+    Read a file holding several services (--services).
+
+    Lines use the --batch format. Each Date: directive starts a new service, as does a
+    line of ---; songs before the first Date: form a service without a date.
+    Returns [(service_date, songs), ...] in file order.
+    """
+    services = []
+    service_date, songs = None, []
+    with open(batch_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            is_date = is_date_line(line)
+            if (is_date or line == "---") and songs:
+                services.append((service_date, songs))
+                service_date, songs = None, []
+            if is_date:
+                service_date = line.split(":", 1)[1].strip() or None
+                continue
+            if line.startswith("#") or line == "---":
+                continue
+            song = parse_song_line(line)
+            if song:
+                songs.append(song)
+    if songs:
+        services.append((service_date, songs))
+    return services
+
+
+def service_output_name(service_date, number):
+    """File name for one service of a batch, e.g. "16 February 2026 - Generated Malayalam HCS.pptx"."""
+    if service_date:
+        # Characters that can't appear in Windows file names (e.g. 16/02/2026)
+        safe_date = re.sub(r'[\\/:*?"<>|]', "-", service_date)
+        return f"{safe_date} - Generated Malayalam HCS.pptx"
+    return f"Service {number} - Generated Malayalam HCS.pptx"
+
+
+def init_service_worker():
+    """Batch workers each generate one whole service, so they scan decks in-process."""
+    set_scan_workers(1)
+
+
+def generate_service(song_list, output_path, service_date):
+    """
+    Generate one service of a batch in a worker process, keeping its output apart from
+    the services running next to it.
+
+    Returns (output_path, error or None, printed output, seconds).
+    """
+    started = time.perf_counter()
+    log = StringIO()
+    error = None
+    try:
+        with redirect_stdout(log):
+            generate_presentation(song_list, output_path, service_date)
+    except Exception as e:
+        error = str(e)
+    return output_path, error, log.getvalue(), time.perf_counter() - started
+
+
+def generate_services(services, output_dir, workers=None):
+    """
+    Generate several services at once, one worker process per service.
+
+    The corpus state (hymn index, template snapshot, KK offset table) is brought up
+    to date here first and shared by every worker: forked workers inherit it and the rest
+    load it from CACHE_DIR, so no service pays for indexing. Yields (number, output_path,
+    error, log, seconds) as each service finishes; number is the 1-based position in services.
+    """
+    warm_up()
+    os.makedirs(output_dir, exist_ok=True)
+    
+    jobs = []
+    used_names = set()
+    for number, (service_date, songs) in enumerate(services, 1):
+        name = service_output_name(service_date, number)
+        if name in used_names:
+            name = f"{os.path.splitext(name)[0]} ({number}).pptx"
+        used_names.add(name)
+        jobs.append((number, songs, os.path.join(output_dir, name), service_date))
+    
+    workers = min(workers or get_scan_workers(), len(jobs))
+    if workers <= 1:
+        for number, songs, output_path, service_date in jobs:
+            yield (number,) + generate_service(songs, output_path, service_date)
+        return
+    
+    # Imported here so that importing this module stays cheap (see startup_benchmark.py)
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_service_worker) as executor:
+        futures = {
+            executor.submit(generate_service, songs, output_path, service_date): number
+            for number, songs, output_path, service_date in jobs
+        }
+        for future in as_completed(futures):
+            yield (futures[future],) + future.result()
+
+
+def run_services_batch(batch_file, output_dir=None):
+    """--services: generate every service in batch_file and report as each one finishes."""
+    services = parse_services_file(batch_file)
+    if not services:
+        print("No services found. Exiting.")
+        return
+    output_dir = output_dir or BASE_DIR
+    
+    print(f"📚 {len(services)} service(s) from {batch_file} -> {output_dir}")
+    started = time.perf_counter()
+    service_seconds = 0.0
+    failed = 0
+    for number, output_path, error, log, seconds in generate_services(services, output_dir):
+        service_seconds += seconds
+        label = services[number - 1][0] or f"Service {number}"
+        if error:
+            failed += 1
+            print(log, end="")
+            print(f"  ❌ {label}: {error}")
+        else:
+            print(f"  ✓ {label}: {os.path.basename(output_path)} ({seconds:.1f}s)")
+    
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ {len(services) - failed} of {len(services)} presentation(s) generated in {elapsed:.1f}s "
+          f"({service_seconds:.1f}s of generation run side by side)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GENERATOR SESSION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class GeneratorSession:
+    """
+    A generator kept open on one source folder by a long-running program (the Windows GUI).
+
+    Songs are passed in directly, so nothing is written besides the presentation and the
+    working directory and sys.argv are left alone. The folder walks, hymn index check,
+    template snapshot, KK offset tables and opened source decks cached by earlier
+    generate() calls in this process are reused by the next one, also by sessions on
+    other folders. source_folder None means the working directory.
+    """
+
+    # CONTEXT is shared by the whole process, so sessions take turns
+    _lock = threading.Lock()
+
+    def __init__(self, source_folder=None, scan_workers=None):
+        self.source_folder = source_folder or None
+        self.scan_workers = scan_workers
+        self.generations = 0
+
+    @contextmanager
+    def _bound(self):
+        """Run one session call at a time with CONTEXT pointed at this session's folder."""
+        with self._lock:
+            previous_folder = CONTEXT.source_folder
+            CONTEXT.source_folder = self.source_folder
+            try:
+                if self.scan_workers is not None:
+                    set_scan_workers(self.scan_workers)
+                yield
+            finally:
+                CONTEXT.source_folder = previous_folder
+
+    def warm(self, progress=None):
+        """
+        Load the source folder's corpus ahead of the first generate() (see warm_up).
+        A generate() called meanwhile waits for it. Returns the seconds taken.
+        """
+        with self._bound():
+            return warm_up(progress)
+
+    def generate(self, song_list, output_path, service_date=None):
+        """
+        Generate one presentation from song dicts (see parse_service_text); returns its path.
+        As with generate_presentation(), the extracted titles are written back to song_list.
+        """
+        with self._bound():
+            output_path = generate_presentation(song_list, output_path, service_date)
+            self.generations += 1
+            return output_path
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # USER INTERFACE
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -2111,6 +3517,34 @@ def get_song_list_from_user():
 
 def main():
     """Main entry point."""
+    # --jobs N: number of worker processes used to scan PPT files
+    if "--jobs" in sys.argv:
+        i = sys.argv.index("--jobs")
+        try:
+            set_scan_workers(sys.argv[i + 1])
+        except (IndexError, ValueError):
+            print("Usage: --jobs N  (0 = one per CPU core, 1 = no parallel scanning)")
+            return
+        del sys.argv[i:i + 2]
+
+    # --no-cache: always rebuild the presentation instead of reusing an identical earlier one
+    if "--no-cache" in sys.argv:
+        set_output_cache(False)
+        sys.argv.remove("--no-cache")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--refresh-index":
+        print("Refreshing hymn index...")
+        stats = update_hymn_index()
+        print(f"✅ Hymn index up to date ({sum(stats.values()) - stats['removed']} PPT files)")
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--services":
+        if len(sys.argv) < 3:
+            print("Usage: --services services.txt [output_folder]")
+            return
+        run_services_batch(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        return
+
     if len(sys.argv) > 1 and sys.argv[1] == "--batch":
         songs = []
         language = "Malayalam"  # Default language
@@ -2,15 +2,66 @@
 """
 KK.pptx-specific hymn search logic
 Handles special format of KK hymn book with corner numbers and footer patterns
+
+Hymn number lookups are answered from an offset table (hymn number -> title slide,
+last content slide, title) built in one pass over the KK deck and saved next to
+kk_hymn_mapping.json as kk_hymn_offsets.json. The table is rebuilt automatically
+when the KK deck changes.
 """
 
+import os
 import re
-from pptx import Presentation
+import json
+import hashlib
+from slide_text_reader import read_slide_text
+
+
+KK_OFFSETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kk_hymn_offsets.json")
+# Bump when the matching rules change so saved tables are rebuilt
+KK_OFFSETS_VERSION = 1
+
+# Tables already loaded in this process: {pptx_path: (size, mtime, hymns)}
+_KK_OFFSET_TABLES = {}
 
 
 def find_hymn_in_kk_pptx(pptx_path, hymn_number):
     """
-    Search for a hymn in KK.pptx format
+    Search for a hymn in KK.pptx format using the precomputed offset table.
+    Non-numeric hymn numbers fall back to scanning the deck.
+    
+    Args:
+        pptx_path: Path to the KK.pptx file
+        hymn_number: String hymn number to search for (e.g., "8", "143")
+    
+    Returns:
+        tuple: (title_slide_index, content_slide_indices, extracted_title)
+               Returns (None, [], "") if not found
+    """
+    target_hymn_num = str(hymn_number)
+    if not target_hymn_num.isdecimal():
+        return scan_kk_pptx_for_hymn(pptx_path, hymn_number)
+
+    try:
+        hymns = load_kk_offset_table(pptx_path)
+    except Exception as e:
+        print(f"Error opening {pptx_path}: {e}")
+        return None, [], ""
+
+    return kk_offset_table_lookup(hymns, target_hymn_num)
+
+
+def kk_offset_table_lookup(hymns, hymn_number):
+    """find_hymn_in_kk_pptx()'s result for hymn_number from a deck's offset table."""
+    entry = hymns.get(str(hymn_number))
+    if not entry:
+        return None, [], ""
+    title_slide_idx, last_slide_idx, extracted_title = entry
+    return title_slide_idx, list(range(title_slide_idx, last_slide_idx + 1)), extracted_title
+
+
+def scan_kk_pptx_for_hymn(pptx_path, hymn_number):
+    """
+    Search for a hymn in KK.pptx format by walking every slide
     
     Args:
         pptx_path: Path to the KK.pptx file
@@ -21,7 +72,7 @@ def find_hymn_in_kk_pptx(pptx_path, hymn_number):
                Returns (None, [], "") if not found
     """
     try:
-        prs = Presentation(pptx_path)
+        prs = read_slide_text(pptx_path)
     except Exception as e:
         print(f"Error opening {pptx_path}: {e}")
         return None, [], ""
@@ -156,10 +207,206 @@ def find_hymn_in_kk_pptx(pptx_path, hymn_number):
     return title_slide_idx, content_indices, extracted_title
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# KK OFFSET TABLE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _slide_hymn_numbers(slide, right_corner_threshold):
+    """Every hymn number this slide matches, using the same patterns as scan_kk_pptx_for_hymn()."""
+    numbers = set()
+    for shape in slide.shapes:
+        if not shape.has_text_frame:
+            continue
+        text = shape.text_frame.text.strip()
+        is_right_corner = hasattr(shape, 'left') and shape.left > right_corner_threshold
+
+        # Pattern 1: Dash followed by optional "Hymn/KK" and number
+        if '–' in text or '-' in text or '—' in text:
+            dash_match = re.search(r'[–\-—]\s*(?:(?:Hymn|KK)\s*(?:No\.?:?\s*)?)?\s*(\d+)', text, re.IGNORECASE)
+            if dash_match:
+                numbers.add(dash_match.group(1))
+
+        # Pattern 2: "Hymn" or "Hymn No." or "Hymn No:" followed by number
+        hymn_word_match = re.search(r'Hymn\s*(?:No\.?:?\s*)?(\d+)', text, re.IGNORECASE)
+        if hymn_word_match:
+            numbers.add(hymn_word_match.group(1))
+
+        # Pattern 3: Standalone number in the first half of a left/center shape
+        if not is_right_corner:
+            words = text.split()
+            mid_point = len(words) // 2
+            first_half = words[:mid_point + 1] if mid_point > 0 else words[:1]
+            for word in first_half:
+                clean_word = word.strip('.,;:!?"\'()[]{}–-')
+                if clean_word.isdecimal():
+                    numbers.add(clean_word)
+
+        # Pattern 4: Standalone number in right corner
+        if is_right_corner:
+            clean_text = text.strip('.,;:!?"\'()[]{}–-')
+            if clean_text.isdecimal():
+                numbers.add(clean_text)
+    return numbers
+
+
+def _slide_title(slide):
+    """Largest non-footer text on a hymn's first slide."""
+    max_text = ""
+    for shape in slide.shapes:
+        if shape.has_text_frame:
+            text = shape.text_frame.text.strip()
+            if len(text) > len(max_text) and not re.match(r'^\d+\.?$', text) and 'of' not in text.lower():
+                max_text = text
+    return max_text
+
+
+def _slide_footer(slide):
+    """Return (slide_num, total, footer_hymn_num) from a slide's "X of Y" / "Hymn #N" footer."""
+    slide_num = None
+    total = None
+    footer_hymn = None
+    for shape in slide.shapes:
+        if shape.has_text_frame:
+            text = shape.text_frame.text.strip()
+            slide_counter = re.search(r'[-–:]\s*(\d+)\s+of\s+(\d+)', text, re.IGNORECASE)
+            if slide_counter:
+                slide_num = int(slide_counter.group(1))
+                total = int(slide_counter.group(2))
+            hymn_in_footer = re.search(r'Hymn\s*#?\s*(\d+)', text, re.IGNORECASE)
+            if hymn_in_footer:
+                footer_hymn = hymn_in_footer.group(1)
+    return slide_num, total, footer_hymn
+
+
+def _last_hymn_slide(start_idx, footers):
+    """Index of the last slide of the hymn starting at start_idx (same stop rules as the scan)."""
+    _, last_slide_count, footer_hymn_num_at_start = footers[start_idx]
+    count = 1
+    last_idx = start_idx
+    for i in range(start_idx + 1, len(footers)):
+        current_slide_num, _, current_footer_hymn = footers[i]
+        # STOP if: hymn number in footer changed
+        if current_footer_hymn and footer_hymn_num_at_start and current_footer_hymn != footer_hymn_num_at_start:
+            break
+        # STOP if: completed expected slides and now seeing "1 of X" again
+        if last_slide_count and current_slide_num == 1 and count >= last_slide_count:
+            break
+        count += 1
+        last_idx = i
+    return last_idx
+
+
+def build_kk_offset_table(pptx_path):
+    """
+    Build the hymn offset table for a KK deck in a single pass over its slides.
+
+    Returns:
+        dict: {hymn_number: [title_slide_index, last_content_slide_index, extracted_title]}
+    """
+    prs = read_slide_text(pptx_path)
+    slide_width = prs.slide_width if hasattr(prs, 'slide_width') else 9144000
+    right_corner_threshold = slide_width * 0.85
+
+    slides = list(prs.slides)
+    footers = [_slide_footer(slide) for slide in slides]
+
+    # A lookup starts at the first slide that matches the hymn number
+    first_slide = {}
+    for i, slide in enumerate(slides):
+        for hymn_num in _slide_hymn_numbers(slide, right_corner_threshold):
+            first_slide.setdefault(hymn_num, i)
+
+    hymns = {}
+    hymn_spans = {}
+    for hymn_num, start_idx in first_slide.items():
+        if start_idx not in hymn_spans:
+            hymn_spans[start_idx] = [start_idx, _last_hymn_slide(start_idx, footers), _slide_title(slides[start_idx])]
+        hymns[hymn_num] = hymn_spans[start_idx]
+    return hymns
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_offsets_file():
+    try:
+        with open(KK_OFFSETS_FILE, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if saved.get("version") != KK_OFFSETS_VERSION:
+        return {}
+    return saved.get("decks", {})
+
+
+def _write_offsets_file(decks):
+    # Per-process temp name: several generator processes may save the table at once
+    tmp_path = f"{KK_OFFSETS_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": KK_OFFSETS_VERSION, "decks": decks}, f, ensure_ascii=False)
+        os.replace(tmp_path, KK_OFFSETS_FILE)
+    except OSError as e:
+        print(f"Warning: could not save KK offset table: {e}")
+
+
+def saved_kk_offset_table(pptx_path):
+    """
+    Return the offset table saved for a KK deck's current size and mtime, or None if
+    load_kk_offset_table() hasn't been run since the deck changed. Never reads the deck.
+    """
+    stat = os.stat(pptx_path)
+    loaded = _KK_OFFSET_TABLES.get(pptx_path)
+    if loaded and loaded[:2] == (stat.st_size, stat.st_mtime):
+        return loaded[2]
+
+    entry = _read_offsets_file().get(os.path.basename(pptx_path))
+    if not (entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime):
+        return None
+    _KK_OFFSET_TABLES[pptx_path] = (stat.st_size, stat.st_mtime, entry["hymns"])
+    return entry["hymns"]
+
+
+def load_kk_offset_table(pptx_path):
+    """
+    Return the offset table for a KK deck, building it only when the deck changed.
+
+    Saved tables are keyed by file name and checked against the deck's size and
+    mtime; if those differ the content hash decides, so a copied or re-synced deck
+    with identical content reuses its table.
+    """
+    stat = os.stat(pptx_path)
+    loaded = _KK_OFFSET_TABLES.get(pptx_path)
+    if loaded and loaded[:2] == (stat.st_size, stat.st_mtime):
+        return loaded[2]
+
+    decks = _read_offsets_file()
+    key = os.path.basename(pptx_path)
+    entry = decks.get(key)
+
+    if not (entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime):
+        sha1 = _file_sha1(pptx_path)
+        if not (entry and entry.get("sha1") == sha1):
+            print(f"Building KK hymn offset table for {key}...")
+            entry = {"sha1": sha1, "hymns": build_kk_offset_table(pptx_path)}
+        entry["size"] = stat.st_size
+        entry["mtime"] = stat.st_mtime
+        decks[key] = entry
+        _write_offsets_file(decks)
+
+    _KK_OFFSET_TABLES[pptx_path] = (stat.st_size, stat.st_mtime, entry["hymns"])
+    return entry["hymns"]
+
+
+
 if __name__ == "__main__":
     # Scan and list all hymns in KK.pptx
     import sys
-    import os
     
     # Find KK.pptx
     kk_path = None
@@ -184,57 +431,16 @@ if __name__ == "__main__":
     print("=" * 80)
     
     try:
-        prs = Presentation(kk_path)
-        slide_width = prs.slide_width if hasattr(prs, 'slide_width') else 9144000
-        right_corner_threshold = slide_width * 0.85
-        
-        hymns_found = {}
-        
-        for i, slide in enumerate(prs.slides):
-            # Look for hymn numbers in left/center area only
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    text = shape.text_frame.text.strip()
-                    
-                    # Skip right corner shapes
-                    if hasattr(shape, 'left') and shape.left > right_corner_threshold:
-                        continue
-                    
-                    # Look for standalone numbers or "Section - Number" patterns
-                    # Check for dash patterns
-                    dash_match = re.search(r'[–\-—]\s*(\d+)', text)
-                    if dash_match:
-                        hymn_num = dash_match.group(1)
-                        if hymn_num not in hymns_found:
-                            hymns_found[hymn_num] = i
-                        continue
-                    
-                    # Check for standalone number at start
-                    words = text.split()
-                    if words:
-                        mid_point = len(words) // 2
-                        first_half = words[:mid_point + 1] if mid_point > 0 else words[:1]
-                        
-                        for word in first_half:
-                            clean_word = word.strip('.,;:!?"\'()[]{}–-')
-                            if clean_word.isdigit() and len(clean_word) <= 3:
-                                if clean_word not in hymns_found:
-                                    hymns_found[clean_word] = i
+        hymns = load_kk_offset_table(kk_path)
         
         # Sort by hymn number
-        sorted_hymns = sorted(hymns_found.items(), key=lambda x: int(x[0]))
+        sorted_hymns = sorted(hymns.items(), key=lambda x: int(x[0]))
         
         print(f"\nFound {len(sorted_hymns)} hymn numbers:\n")
         
-        for hymn_num, slide_idx in sorted_hymns:
-            # Get title using our search function
-            title_idx, content_idx, title = find_hymn_in_kk_pptx(kk_path, hymn_num)
-            
-            if content_idx:
-                title_preview = title[:60] + "..." if len(title) > 60 else title
-                print(f"Hymn {hymn_num:>3}: {len(content_idx):>2} slides at index {title_idx:>3} | {title_preview}")
-            else:
-                print(f"Hymn {hymn_num:>3}: Not found (detected at slide {slide_idx})")
+        for hymn_num, (title_idx, last_idx, title) in sorted_hymns:
+            title_preview = title[:60] + "..." if len(title) > 60 else title
+            print(f"Hymn {hymn_num:>3}: {last_idx - title_idx + 1:>2} slides at index {title_idx:>3} | {title_preview}")
         
         print("\n" + "=" * 80)
         
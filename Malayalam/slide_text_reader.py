@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Fast read-only slide text reader for hymn searches
+
+Reads ppt/slides/slideN.xml straight out of the .pptx zip with lxml iterparse instead of
+building python-pptx Presentation/Slide/Shape objects (no image parts, no layout objects).
+Slides come back in presentation.xml order and expose the same attribute names the search
+code already uses on python-pptx objects, so they can be passed wherever a read-only
+Presentation was used for searching:
+
+    deck.slides, deck.slide_width, deck.slide_height
+    slide.shapes, slide.has_picture
+    shape.has_text_frame, shape.text_frame.text, shape.text_frame.paragraphs[i].text,
+    shape.text_frame.paragraphs[i].runs[j].text, shape.left/top/width/height,
+    shape.shape_type, shape.auto_shape_type, shape.is_placeholder
+
+Placeholder shapes without their own position inherit it from the slide layout / master,
+as python-pptx does.
+"""
+
+import posixpath
+import zipfile
+from lxml import etree
+from pptx.enum.shapes import MSO_SHAPE_TYPE, MSO_AUTO_SHAPE_TYPE
+
+
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+P_SP = f"{{{NS_P}}}sp"
+P_PIC = f"{{{NS_P}}}pic"
+P_SPTREE = f"{{{NS_P}}}spTree"
+SHAPE_TAGS = {
+    P_SP: MSO_SHAPE_TYPE.AUTO_SHAPE,
+    f"{{{NS_P}}}grpSp": MSO_SHAPE_TYPE.GROUP,
+    f"{{{NS_P}}}graphicFrame": None,
+    f"{{{NS_P}}}cxnSp": MSO_SHAPE_TYPE.LINE,
+    P_PIC: MSO_SHAPE_TYPE.PICTURE,
+    f"{{{NS_P}}}contentPart": None,
+}
+TEXT_TAGS = {f"{{{NS_A}}}r", f"{{{NS_A}}}fld"}
+A_BR = f"{{{NS_A}}}br"
+A_T = f"{{{NS_A}}}t"
+
+DEFAULT_SLIDE_WIDTH = 9144000
+DEFAULT_SLIDE_HEIGHT = 6858000
+
+# Layout placeholder type -> master placeholder type it inherits from (as in python-pptx)
+MASTER_PLACEHOLDER_TYPES = {
+    "body": "body", "chart": "body", "clipArt": "body", "ctrTitle": "title", "dgm": "body",
+    "dt": "dt", "ftr": "ftr", "media": "body", "obj": "body", "pic": "body",
+    "sldNum": "sldNum", "subTitle": "body", "tbl": "body", "title": "title",
+}
+
+
+class TextRun:
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class TextParagraph:
+    __slots__ = ("text", "runs")
+
+    def __init__(self, text, runs):
+        self.text = text
+        self.runs = runs
+
+
+class TextFrame:
+    __slots__ = ("paragraphs", "text")
+
+    def __init__(self, paragraphs):
+        self.paragraphs = paragraphs
+        self.text = "\n".join(p.text for p in paragraphs)
+
+
+class SlideShape:
+    __slots__ = ("shape_type", "auto_shape_type", "is_placeholder", "text_frame",
+                 "left", "top", "width", "height")
+
+    def __init__(self, shape_type, auto_shape_type, is_placeholder, text_frame, position):
+        self.shape_type = shape_type
+        self.auto_shape_type = auto_shape_type
+        self.is_placeholder = is_placeholder
+        self.text_frame = text_frame
+        self.left, self.top, self.width, self.height = position
+
+    @property
+    def has_text_frame(self):
+        return self.text_frame is not None
+
+
+class SlideText:
+    __slots__ = ("shapes", "has_picture")
+
+    def __init__(self, shapes, has_picture):
+        self.shapes = shapes
+        self.has_picture = has_picture
+
+
+class DeckText:
+    __slots__ = ("slides", "slide_width", "slide_height")
+
+    def __init__(self, slides, slide_width, slide_height):
+        self.slides = slides
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+
+
+def _rels_path(part_name):
+    folder, name = posixpath.split(part_name)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def _read_rels(zf, part_name):
+    """{rId: (type, target part name)} for one package part."""
+    try:
+        root = etree.fromstring(zf.read(_rels_path(part_name)))
+    except KeyError:
+        return {}
+    folder = posixpath.dirname(part_name)
+    rels = {}
+    for rel in root.iter(f"{{{NS_REL}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = posixpath.normpath(posixpath.join(folder, rel.get("Target")))
+        rels[rel.get("Id")] = (rel.get("Type", "").rsplit("/", 1)[-1], target.lstrip("/"))
+    return rels
+
+
+def _related_part(zf, part_name, rel_type):
+    return next((target for kind, target in _read_rels(zf, part_name).values() if kind == rel_type), None)
+
+
+def _placeholder(shape_elm):
+    """(type, idx) of a shape's p:ph element, or None if it isn't a placeholder."""
+    nv_props = shape_elm[0] if len(shape_elm) else None
+    ph = nv_props.find(f"{{{NS_P}}}nvPr/{{{NS_P}}}ph") if nv_props is not None else None
+    if ph is None:
+        return None
+    return ph.get("type", "obj"), int(ph.get("idx", "0"))
+
+
+def _own_position(shape_elm):
+    """(left, top, width, height) set directly on the shape; missing values are None."""
+    if shape_elm.tag == f"{{{NS_P}}}graphicFrame":
+        xfrm = shape_elm.find(f"{{{NS_P}}}xfrm")
+    else:
+        xfrm = shape_elm.find(f"{{{NS_P}}}spPr/{{{NS_A}}}xfrm")
+        if xfrm is None:
+            xfrm = shape_elm.find(f"{{{NS_P}}}grpSpPr/{{{NS_A}}}xfrm")
+    off = xfrm.find(f"{{{NS_A}}}off") if xfrm is not None else None
+    ext = xfrm.find(f"{{{NS_A}}}ext") if xfrm is not None else None
+    return (
+        int(off.get("x")) if off is not None else None,
+        int(off.get("y")) if off is not None else None,
+        int(ext.get("cx")) if ext is not None else None,
+        int(ext.get("cy")) if ext is not None else None,
+    )
+
+
+def _merge_position(own, inherited):
+    if inherited is None:
+        return own
+    return tuple(value if value is not None else base for value, base in zip(own, inherited))
+
+
+class _PlaceholderPositions:
+    """Positions of layout/master placeholders, read once per layout per deck."""
+
+    def __init__(self, zf):
+        self.zf = zf
+        self.layouts = {}
+        self.masters = {}
+
+    def _placeholders(self, part_name):
+        found = []
+        root = etree.fromstring(self.zf.read(part_name))
+        tree = root.find(f"{{{NS_P}}}cSld/{{{NS_P}}}spTree")
+        for elm in tree if tree is not None else ():
+            if elm.tag in SHAPE_TAGS:
+                ph = _placeholder(elm)
+                if ph:
+                    found.append((ph, _own_position(elm)))
+        return found
+
+    def _master(self, master_part):
+        if master_part not in self.masters:
+            by_type = {}
+            for (ph_type, _), position in self._placeholders(master_part):
+                by_type.setdefault(ph_type, position)
+            self.masters[master_part] = by_type
+        return self.masters[master_part]
+
+    def _layout(self, layout_part):
+        if layout_part not in self.layouts:
+            master_part = _related_part(self.zf, layout_part, "slideMaster")
+            master = self._master(master_part) if master_part else {}
+            by_idx = {}
+            for (ph_type, idx), position in self._placeholders(layout_part):
+                base = master.get(MASTER_PLACEHOLDER_TYPES.get(ph_type))
+                by_idx.setdefault(idx, _merge_position(position, base))
+            self.layouts[layout_part] = by_idx
+        return self.layouts[layout_part]
+
+    def lookup(self, layout_part, idx):
+        if not layout_part:
+            return None
+        return self._layout(layout_part).get(idx)
+
+
+def _text_frame(shape_elm):
+    tx_body = shape_elm.find(f"{{{NS_P}}}txBody")
+    if tx_body is None:
+        return None
+    paragraphs = []
+    for p in tx_body.iterchildren(f"{{{NS_A}}}p"):
+        runs = []
+        parts = []
+        for child in p:
+            if child.tag in TEXT_TAGS:
+                t = child.find(A_T)
+                text = (t.text or "") if t is not None else ""
+                parts.append(text)
+                if child.tag == f"{{{NS_A}}}r":
+                    runs.append(TextRun(text))
+            elif child.tag == A_BR:
+                parts.append("\v")
+        paragraphs.append(TextParagraph("".join(parts), runs))
+    return TextFrame(paragraphs)
+
+
+def _shape_type(shape_elm, placeholder):
+    """MSO_SHAPE_TYPE the way python-pptx reports it (None where it has no single answer)."""
+    if shape_elm.tag != P_SP:
+        if placeholder and shape_elm.tag == P_PIC:
+            return MSO_SHAPE_TYPE.PLACEHOLDER, None
+        return SHAPE_TAGS[shape_elm.tag], None
+    if placeholder:
+        return MSO_SHAPE_TYPE.PLACEHOLDER, None
+    sp_pr = shape_elm.find(f"{{{NS_P}}}spPr")
+    if sp_pr is not None and sp_pr.find(f"{{{NS_A}}}custGeom") is not None:
+        return MSO_SHAPE_TYPE.FREEFORM, None
+    c_nv_sp_pr = shape_elm.find(f"{{{NS_P}}}nvSpPr/{{{NS_P}}}cNvSpPr")
+    is_textbox = c_nv_sp_pr is not None and c_nv_sp_pr.get("txBox") in ("1", "true")
+    prst_geom = sp_pr.find(f"{{{NS_A}}}prstGeom") if sp_pr is not None else None
+    if prst_geom is not None and not is_textbox:
+        try:
+            return MSO_SHAPE_TYPE.AUTO_SHAPE, MSO_AUTO_SHAPE_TYPE.from_xml(prst_geom.get("prst"))
+        except ValueError:
+            return MSO_SHAPE_TYPE.AUTO_SHAPE, None
+    if is_textbox:
+        return MSO_SHAPE_TYPE.TEXT_BOX, None
+    return None, None
+
+
+def _read_slide(zf, slide_part, positions):
+    """Stream one slide's XML and build its shapes, keeping at most one shape tree in memory."""
+    layout_part = None
+    shapes = []
+    has_picture = False
+    depth = 0
+    tree_depth = None
+    with zf.open(slide_part) as f:
+        for event, elm in etree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if elm.tag == P_SPTREE and tree_depth is None:
+                    tree_depth = depth
+                elif elm.tag == P_PIC:
+                    has_picture = True
+                continue
+
+            if tree_depth is not None and depth == tree_depth + 1 and elm.tag in SHAPE_TAGS:
+                placeholder = _placeholder(elm)
+                position = _own_position(elm)
+                if placeholder and None in position:
+                    if layout_part is None:
+                        layout_part = _related_part(zf, slide_part, "slideLayout") or ""
+                    position = _merge_position(position, positions.lookup(layout_part, placeholder[1]))
+                shape_type, auto_shape_type = _shape_type(elm, placeholder)
+                text_frame = _text_frame(elm) if elm.tag == P_SP else None
+                shapes.append(SlideShape(shape_type, auto_shape_type, bool(placeholder), text_frame, position))
+                elm.clear()
+            elif depth == tree_depth:
+                tree_depth = -1  # only the slide's own shape tree counts
+            depth -= 1
+    return SlideText(shapes, has_picture)
+
+
+def iter_slide_text(pptx_path):
+    """
+    Yield a SlideText for each slide of a .pptx file, in presentation order.
+
+    Raises the same kinds of errors as opening a broken file with Presentation()
+    (zipfile.BadZipFile, KeyError, lxml errors), so callers can keep their except blocks.
+    """
+    with zipfile.ZipFile(pptx_path) as zf:
+        positions = _PlaceholderPositions(zf)
+        for slide_part in _slide_parts(zf):
+            yield _read_slide(zf, slide_part, positions)
+
+
+def _presentation_part(zf):
+    root = etree.fromstring(zf.read("_rels/.rels"))
+    for rel in root.iter(f"{{{NS_REL}}}Relationship"):
+        if rel.get("Type", "").endswith("/officeDocument"):
+            return rel.get("Target").lstrip("/")
+    return "ppt/presentation.xml"
+
+
+def _slide_parts(zf):
+    pres_part = _presentation_part(zf)
+    rels = _read_rels(zf, pres_part)
+    root = etree.fromstring(zf.read(pres_part))
+    slide_ids = root.find(f"{{{NS_P}}}sldIdLst")
+    return [rels[sld_id.get(f"{{{NS_R}}}id")][1] for sld_id in (slide_ids if slide_ids is not None else ())]
+
+
+def read_slide_text(pptx_path):
+    """
+    Read every slide of a .pptx file into a DeckText (slides, slide_width, slide_height).
+
+    Use instead of Presentation(pptx_path) when the deck is only searched, never modified or cloned.
+    """
+    with zipfile.ZipFile(pptx_path) as zf:
+        pres_part = _presentation_part(zf)
+        size = etree.fromstring(zf.read(pres_part)).find(f"{{{NS_P}}}sldSz")
+        slide_width = int(size.get("cx")) if size is not None else DEFAULT_SLIDE_WIDTH
+        slide_height = int(size.get("cy")) if size is not None else DEFAULT_SLIDE_HEIGHT
+        positions = _PlaceholderPositions(zf)
+        slides = [_read_slide(zf, slide_part, positions) for slide_part in _slide_parts(zf)]
+    return DeckText(slides, slide_width, slide_height)
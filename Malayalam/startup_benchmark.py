@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for generate_malayalam_hcs_ppt
+================================================
+Measures how long `import generate_malayalam_hcs_ppt` takes in a fresh interpreter
+(using `python -X importtime`) and checks it against an import-time budget. It also
+checks that the import itself does no file I/O - config and corpus discovery belong
+in GeneratorContext, which loads them on first use.
+
+Usage:
+    python3 startup_benchmark.py                  # 5 runs against the default budget
+    python3 startup_benchmark.py --runs 10 --budget-ms 400
+    python3 startup_benchmark.py --module generate_english_hcs_ppt   (run from English/)
+
+Exits with status 1 if the budget is exceeded or the import touches the disk.
+"""
+
+import os
+import sys
+import subprocess
+import statistics
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODULE = "generate_malayalam_hcs_ppt"
+DEFAULT_RUNS = 5
+# Cumulative import time allowed for the generator module (median of the runs).
+# Measured at ~200 ms, almost all of it python-pptx/lxml/PIL; the module body itself
+# should stay at a few ms.
+IMPORT_TIME_BUDGET_MS = 350
+TOP_IMPORTS = 10
+
+# Runs in the child interpreter: records file I/O done by repo code while the module
+# is imported. I/O done by the import machinery, or by third-party packages while they
+# are being imported, is not counted.
+IO_CHECK_CODE = r'''
+import os, sys
+repo_dir = sys.argv[1]
+events = []
+
+def hook(event, args):
+    if event not in ("open", "os.mkdir", "os.listdir", "os.scandir", "sqlite3.connect"):
+        return
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith("<frozen importlib"):
+            return
+        if filename.startswith(repo_dir) and not filename.endswith("startup_benchmark.py"):
+            events.append((event, args[0] if args else None, filename, frame.f_lineno))
+            return
+        frame = frame.f_back
+
+sys.addaudithook(hook)
+__import__(sys.argv[2])
+for event, target, filename, lineno in events:
+    print(f"{event}\t{target}\t{os.path.basename(filename)}:{lineno}")
+'''
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into [(self_us, cumulative_us, module_name)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+    return rows
+
+
+def warm_bytecode(module, cwd):
+    """Import module once with bytecode writing on, so timed runs load from __pycache__ like an installed app."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=cwd, env=env, capture_output=True)
+
+
+def measure_import(module, cwd):
+    """Import module in a fresh interpreter; return its importtime rows."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def check_import_io(module, cwd):
+    """Import module in a fresh interpreter; return the file I/O done by repo code."""
+    repo_dir = os.path.dirname(BASE_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", IO_CHECK_CODE, repo_dir, module],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return [line.split("\t") for line in result.stdout.splitlines() if line.strip()]
+
+
+def run_benchmark(module=DEFAULT_MODULE, runs=DEFAULT_RUNS, budget_ms=IMPORT_TIME_BUDGET_MS, cwd=None):
+    """Print the startup report; return True if the import is within budget and does no I/O."""
+    cwd = cwd or os.getcwd()
+    warm_bytecode(module, cwd)
+    totals = []
+    best_rows = None
+    for _ in range(runs):
+        rows = measure_import(module, cwd)
+        total = next((cum for _, cum, name in rows if name.strip() == module), None)
+        if total is None:
+            raise RuntimeError(f"{module} not found in -X importtime output")
+        totals.append(total)
+        if best_rows is None or total <= min(totals):
+            best_rows = rows
+
+    own = next(self_us for self_us, _, name in best_rows if name.strip() == module)
+    median_ms = statistics.median(totals) / 1000
+
+    print("=" * 70)
+    print(f"Startup benchmark: import {module}  ({runs} runs)")
+    print("=" * 70)
+    print(f"  Median import time: {median_ms:.1f} ms "
+          f"(min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms)")
+    print(f"  Module's own code:  {own / 1000:.1f} ms")
+    print(f"  Budget:             {budget_ms} ms")
+    print("\n  Heaviest imports (self time, fastest run):")
+    for self_us, cum_us, name in sorted(best_rows, reverse=True)[:TOP_IMPORTS]:
+        print(f"    {self_us / 1000:7.1f} ms  (cumulative {cum_us / 1000:7.1f} ms)  {name.strip()}")
+
+    io_events = check_import_io(module, cwd)
+    print()
+    if io_events:
+        print(f"  ⚠ Import did file I/O ({len(io_events)} operations):")
+        for event, target, where in io_events:
+            print(f"    {event:16} {target}  ({where})")
+    else:
+        print("  ✓ Import did no file I/O")
+
+    within_budget = median_ms <= budget_ms
+    if within_budget:
+        print(f"  ✓ Within budget ({median_ms:.1f} ms <= {budget_ms} ms)")
+    else:
+        print(f"  ⚠ Over budget ({median_ms:.1f} ms > {budget_ms} ms)")
+    return within_budget and not io_events
+
+
+def main():
+    module = DEFAULT_MODULE
+    runs = DEFAULT_RUNS
+    budget_ms = IMPORT_TIME_BUDGET_MS
+    args = sys.argv[1:]
+    while args:
+        arg = args.pop(0)
+        if arg == "--module" and args:
+            module = args.pop(0)
+        elif arg == "--runs" and args:
+            runs = max(1, int(args.pop(0)))
+        elif arg == "--budget-ms" and args:
+            budget_ms = float(args.pop(0))
+        else:
+            print(__doc__)
+            sys.exit(2)
+    # Import from this folder when the module lives here, otherwise from the current one
+    cwd = BASE_DIR if os.path.exists(os.path.join(BASE_DIR, f"{module}.py")) else os.getcwd()
+    sys.exit(0 if run_benchmark(module, runs, budget_ms, cwd) else 1)
+
+
+if __name__ == "__main__":
+    main()
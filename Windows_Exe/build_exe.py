@@ -28,7 +28,9 @@ if not os.path.exists('gui_ppt_generator.py'):
 
 malayalam_script = parent_dir / "Malayalam" / "generate_malayalam_hcs_ppt.py"
 kk_hymn_search = parent_dir / "Malayalam" / "kk_hymn_search.py"
+slide_text_reader = parent_dir / "Malayalam" / "slide_text_reader.py"
 kk_hymn_mapping = parent_dir / "Malayalam" / "kk_hymn_mapping.json"
+kk_hymn_offsets = parent_dir / "Malayalam" / "kk_hymn_offsets.json"  # Optional, generated by kk_hymn_search.py
 
 if not malayalam_script.exists():
     print(f"❌ ERROR: generate_malayalam_hcs_ppt.py not found at {malayalam_script}!")
@@ -40,6 +42,11 @@ if not kk_hymn_search.exists():
     print("   This file is required for KK hymn search functionality.")
     sys.exit(1)
 
+if not slide_text_reader.exists():
+    print(f"❌ ERROR: slide_text_reader.py not found at {slide_text_reader}!")
+    print("   This file is required for hymn search.")
+    sys.exit(1)
+
 if not kk_hymn_mapping.exists():
     print(f"❌ ERROR: kk_hymn_mapping.json not found at {kk_hymn_mapping}!")
     print("   This file is required for KK hymn mapping.")
@@ -205,7 +212,9 @@ PyInstaller.__main__.run([
     '--icon=NONE',                     # No icon (can add later)
     f'--add-data={malayalam_script};.',  # Include Malayalam generator
     f'--add-data={kk_hymn_search};.',    # Include KK hymn search
+    f'--add-data={slide_text_reader};.', # Include fast slide text reader
     f'--add-data={kk_hymn_mapping};.',   # Include KK hymn mapping JSON
+    f'--add-data={kk_hymn_offsets};.' if kk_hymn_offsets.exists() else '--',  # Include prebuilt KK offset table
     f'--add-data={images_dir};images' if images_dir.exists() else '--',  # Include images folder
     f'--add-data={onedrive_git_local};onedrive_git_local' if onedrive_git_local.exists() else '--',  # Include PPT files
     '--hidden-import=pptx',            # Include python-pptx
@@ -214,6 +223,8 @@ PyInstaller.__main__.run([
     '--hidden-import=pptx.enum.text',  # Include pptx enums
     '--hidden-import=pptx.enum.shapes',# Include pptx shape enums
     '--hidden-import=kk_hymn_search',  # Include KK hymn search module
+    '--hidden-import=slide_text_reader',  # Include fast slide text reader
+    '--hidden-import=lxml.etree',      # Used directly by slide_text_reader
     # Exclude UNUSED heavy packages (saves ~100MB and improves startup)
     '--exclude-module=pandas',         # Not used - data analysis
     '--exclude-module=numpy',          # Not used - numerical computing
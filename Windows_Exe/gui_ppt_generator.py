@@ -10,12 +10,54 @@ import sys
 import os
 import json
 from pathlib import Path
-from contextlib import redirect_stdout, redirect_stderr
+from contextlib import nullcontext, redirect_stdout, redirect_stderr
 from io import StringIO
 from datetime import datetime
 import threading
+import multiprocessing
 import re
 import subprocess
+from fnmatch import fnmatch
+
+# Wait this long after the folder/language stops changing before counting PPT files
+PPT_COUNT_DELAY_MS = 400
+# Wait this long after the last edit before writing the settings file
+SETTINGS_SAVE_DELAY_MS = 1000
+# Wait this long after the source folder stops changing before pre-loading its hymns
+PREWARM_DELAY_MS = 800
+
+
+def _dir_mtime(path):
+    """mtime of a directory, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def count_ppt_files(folder, cache, lock=None):
+    """
+    Number of PowerPoint files (*.ppt*) in folder and all its subfolders.
+
+    cache maps folder -> (dir_mtimes, count). Adding, removing or renaming a file changes
+    its directory's mtime, so if no directory changed the cached count is reused without
+    listing any folder again (slow on OneDrive). lock, if given, guards cache; it is only
+    held to read and store the entry, not during the walk.
+    """
+    lock = lock or nullcontext()
+    with lock:
+        entry = cache.get(folder)
+    if entry is not None and all(_dir_mtime(d) == mtime for d, mtime in entry[0].items()):
+        return entry[1]
+    dir_mtimes = {}
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dir_mtimes[dirpath] = _dir_mtime(dirpath)
+        count += sum(1 for name in filenames if fnmatch(name, "*.ppt*"))
+    with lock:
+        cache[folder] = (dir_mtimes, count)
+    return count
+
 
 class PPTGeneratorGUI:
     def __init__(self, root):
@@ -28,8 +70,22 @@ class PPTGeneratorGUI:
         self.source_folder = tk.StringVar()
         self.language = tk.StringVar(value="Malayalam")  # Default to Malayalam
         self.ppt_count = tk.StringVar(value="No folder selected")
+        self.scan_workers = tk.IntVar(value=0)  # PPT scanning processes, 0 = one per CPU core
+        self.warm_status = tk.StringVar(value="")  # Background hymn pre-load progress
         self.settings_file = Path.home() / ".church_ppt_settings.txt"
         self._is_loading = True  # Flag to track initial load
+        # PPT counts by folder (see count_ppt_files), shared with the counting threads
+        self._ppt_counts = {}
+        self._ppt_counts_lock = threading.Lock()
+        self._ppt_count_after = None  # Pending debounced count
+        self._ppt_count_request = 0  # Only the newest count updates the display
+        self._log_loaded_folder = False
+        self._settings_after = None  # Pending delayed settings save
+        self._saved_settings = None  # Last settings written, to skip identical writes
+        self.generator_sessions = {}  # Generators kept open between generations, by folder
+        self._session_lock = threading.Lock()  # Creating sessions from two threads
+        self._prewarm_after = None  # Pending delayed pre-load
+        self._prewarm_request = 0  # Only the newest pre-load updates the status line
         self.default_service_text = (
             "# Format: hymn_num|label|title_hint\n"
             "# Example:\n"
@@ -45,7 +101,12 @@ class PPTGeneratorGUI:
         
         # Add trace to auto-update PPT count when folder path changes
         self.source_folder.trace_add('write', lambda *args: self.update_ppt_count())
+        self.source_folder.trace_add('write', lambda *args: self.schedule_prewarm())
         self.language.trace_add('write', lambda *args: self.update_ppt_count())
+        self.scan_workers.trace_add('write', lambda *args: None if self._is_loading else self.schedule_save_settings())
+        
+        # Write any pending settings before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Create UI first
         self.create_ui()
@@ -119,7 +180,22 @@ class PPTGeneratorGUI:
             font=("Arial", 8),
             fg="#7f8c8d"
         )
-        help_label.grid(row=2, column=0, columnspan=5, sticky=tk.W, pady=(0, 5))
+        help_label.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(0, 5))
+        
+        # Parallel PPT scanning workers
+        workers_frame = tk.Frame(main_frame)
+        workers_frame.grid(row=2, column=3, columnspan=2, sticky=tk.W, padx=(10, 0), pady=(0, 5))
+        workers_label = tk.Label(workers_frame, text="Scan workers (0 = auto):", font=("Arial", 8))
+        workers_label.pack(side=tk.LEFT)
+        workers_spin = tk.Spinbox(
+            workers_frame,
+            from_=0,
+            to=max(os.cpu_count() or 1, 1),
+            textvariable=self.scan_workers,
+            width=3,
+            state="readonly"
+        )
+        workers_spin.pack(side=tk.LEFT, padx=(5, 0))
         
         # Separator
         separator = ttk.Separator(main_frame, orient=tk.HORIZONTAL)
@@ -165,7 +241,17 @@ class PPTGeneratorGUI:
         
         # Output log
         log_label = tk.Label(main_frame, text="Output:", font=("Arial", 10, "bold"))
-        log_label.grid(row=8, column=0, columnspan=5, sticky=tk.W, pady=(10, 5))
+        log_label.grid(row=8, column=0, columnspan=2, sticky=tk.W, pady=(10, 5))
+        
+        # Hymn pre-load status
+        warm_status_label = tk.Label(
+            main_frame,
+            textvariable=self.warm_status,
+            font=("Arial", 8),
+            fg="#7f8c8d",
+            anchor=tk.E
+        )
+        warm_status_label.grid(row=8, column=2, columnspan=3, sticky=tk.E, pady=(10, 5))
         
         self.log_text = scrolledtext.ScrolledText(
             main_frame,
@@ -202,6 +288,7 @@ class PPTGeneratorGUI:
                     saved_folder = data.get("source_folder", "").strip()
                     saved_text = data.get("service_text", "").strip()
                     saved_language = data.get("language", "Malayalam").strip()
+                    saved_workers = data.get("scan_workers", 0)
                     if saved_folder and os.path.isdir(saved_folder):
                         normalized_folder = self._normalize_source_folder(saved_folder)
                         self.source_folder.set(normalized_folder)
@@ -212,6 +299,8 @@ class PPTGeneratorGUI:
                         self.service_text.edit_modified(False)
                     if saved_language in ("Malayalam", "English"):
                         self.language.set(saved_language)
+                    if isinstance(saved_workers, int) and saved_workers >= 0:
+                        self.scan_workers.set(saved_workers)
                 else:
                     saved_folder = raw
                     if os.path.isdir(saved_folder):
@@ -223,17 +312,38 @@ class PPTGeneratorGUI:
                 
     def save_settings(self):
         """Save source folder for next time"""
+        self._settings_after = None
         try:
             data = {
                 "source_folder": self.source_folder.get().strip(),
                 "service_text": self.get_service_text().strip(),
                 "language": self.language.get().strip(),
+                "scan_workers": self.scan_workers.get(),
             }
-            with open(self.settings_file, 'w') as f:
+            if data == self._saved_settings:
+                return
+            # Write a temp file and swap it in, so a crash never leaves a half-written file
+            temp_file = self.settings_file.with_name(self.settings_file.name + ".tmp")
+            with open(temp_file, 'w') as f:
                 f.write(json.dumps(data))
+            os.replace(temp_file, self.settings_file)
+            self._saved_settings = data
         except:
             pass
 
+    def schedule_save_settings(self):
+        """Save settings once edits pause, so a burst of keystrokes is one write"""
+        if self._settings_after is not None:
+            self.root.after_cancel(self._settings_after)
+        self._settings_after = self.root.after(SETTINGS_SAVE_DELAY_MS, self.save_settings)
+
+    def on_close(self):
+        """Write pending settings, then close the window"""
+        if self._settings_after is not None:
+            self.root.after_cancel(self._settings_after)
+            self.save_settings()
+        self.root.destroy()
+
     def _normalize_source_folder(self, folder_path):
         base_path = Path(folder_path)
         if base_path.name in ("Malayalam HCS", "English HCS"):
@@ -260,57 +370,128 @@ class PPTGeneratorGUI:
             return
         if self.service_text.edit_modified():
             self.service_text.edit_modified(False)
-            self.save_settings()
+            self.schedule_save_settings()
     
     def update_ppt_count(self):
-        """Check the current source folder path and update PPT count display"""
-        folder_path = self.source_folder.get().strip()
-        
+        """Update the PPT count display once the folder path and language stop changing"""
+        if self._is_loading:
+            self._log_loaded_folder = True
+        if self._ppt_count_after is not None:
+            self.root.after_cancel(self._ppt_count_after)
+        self._ppt_count_after = self.root.after(PPT_COUNT_DELAY_MS, self._start_ppt_count)
+
+    def _start_ppt_count(self):
+        """Count PPT files on a background thread so OneDrive folders don't freeze the window"""
+        self._ppt_count_after = None
+        self._ppt_count_request += 1
+        log_loaded, self._log_loaded_folder = self._log_loaded_folder, False
+        self.ppt_count.set("⏳ Counting PPT files...")
+        threading.Thread(
+            target=self._count_ppt_thread,
+            args=(self._ppt_count_request, self.source_folder.get().strip(), self.language.get(), log_loaded),
+            daemon=True
+        ).start()
+
+    def _count_ppt_thread(self, request, folder_path, language, log_loaded):
+        """Background thread: work out the PPT count message (no Tk calls here)"""
+        notes = []
         if not folder_path:
             # Check if bundled files exist for the selected language
             try:
                 bundled_path = self.get_bundled_folder_path()
-                if bundled_path and os.path.isdir(bundled_path):
-                    # Get language-specific folder
-                    language = self.language.get()
-                    lang_folder = Path(bundled_path) / (f"{language} HCS")
-                    
-                    if lang_folder.exists():
-                        ppt_files = list(lang_folder.glob("**/*.ppt*"))
-                        if len(ppt_files) > 0:
-                            self.ppt_count.set(f"✓ Using bundled {language} files ({len(ppt_files)} PPT)")
-                        else:
-                            self.ppt_count.set(f"No bundled {language} files found")
+                lang_folder = Path(bundled_path) / (f"{language} HCS") if bundled_path else None
+                if lang_folder and lang_folder.exists():
+                    count = self._count_ppt_files(str(lang_folder))
+                    if count > 0:
+                        message = f"✓ Using bundled {language} files ({count} PPT)"
                     else:
-                        self.ppt_count.set("No folder selected")
+                        message = f"No bundled {language} files found"
                 else:
-                    self.ppt_count.set("No folder selected")
-            except Exception as e:
-                self.ppt_count.set("No folder selected")
+                    message = "No folder selected"
+            except Exception:
+                message = "No folder selected"
+        elif not os.path.isdir(folder_path):
+            message = "✗ Invalid folder path"
+        else:
+            # Count PPT files recursively in the detected language folder
+            try:
+                detected_folder, notes = self._detect_language_folder(folder_path, language)
+                count = self._count_ppt_files(detected_folder)
+                if count > 0:
+                    message = f"✓ Found {count} PPT files (all subfolders)"
+                    # Log only on initial load
+                    if log_loaded:
+                        notes.append(f"✅ Loaded saved source folder: {detected_folder}")
+                        if folder_path != detected_folder:
+                            notes.append(f"   (Auto-detected from: {folder_path})")
+                else:
+                    message = "⚠ No PPT files found"
+            except Exception:
+                message = "✗ Error scanning folder"
+        try:
+            self.root.after(0, self._show_ppt_count, request, message, notes)
+        except RuntimeError:
+            pass  # Window already closed
+
+    def _show_ppt_count(self, request, message, notes):
+        # Ignore counts overtaken by a newer folder/language change
+        if request != self._ppt_count_request:
             return
-        
-        if not os.path.isdir(folder_path):
-            self.ppt_count.set("✗ Invalid folder path")
+        self.ppt_count.set(message)
+        for note in notes:
+            self.log(note)
+
+    def schedule_prewarm(self):
+        """Pre-load the source folder's hymns once the folder path stops changing"""
+        if self._prewarm_after is not None:
+            self.root.after_cancel(self._prewarm_after)
+        self._prewarm_after = self.root.after(PREWARM_DELAY_MS, self._start_prewarm)
+
+    def _start_prewarm(self):
+        """Load the hymn folders, hymn index and template on a background thread while the
+        service list is being typed, so the first Generate doesn't wait for them"""
+        self._prewarm_after = None
+        self._prewarm_request += 1
+        work_dir = self._session_folder()
+        if not os.path.isdir(work_dir):
+            self.warm_status.set("")
             return
-        
-        # Try to intelligently find the language-specific folder
-        detected_folder = self.find_language_folder(folder_path)
-        
-        # Count PPT files recursively
+        self.warm_status.set("⏳ Preparing hymns...")
+        threading.Thread(
+            target=self._prewarm_thread,
+            args=(self._prewarm_request, work_dir, self.scan_workers.get()),
+            daemon=True
+        ).start()
+
+    def _prewarm_thread(self, request, work_dir, scan_workers):
+        """Background thread: warm the generator session (no Tk calls here)"""
+        def progress(step):
+            self._post_warm_status(request, f"⏳ {step}...")
+
         try:
-            ppt_files = list(Path(detected_folder).glob("**/*.ppt*"))
-            
-            if len(ppt_files) > 0:
-                self.ppt_count.set(f"✓ Found {len(ppt_files)} PPT files (all subfolders)")
-                # Log only on initial load
-                if self._is_loading and hasattr(self, 'log_text'):
-                    self.log(f"✅ Loaded saved source folder: {detected_folder}")
-                    if folder_path != detected_folder:
-                        self.log(f"   (Auto-detected from: {folder_path})")
-            else:
-                self.ppt_count.set("⚠ No PPT files found")
+            # Resolves the language folder (and caches its PPT count) like the count thread
+            self._detect_language_folder(work_dir, "Malayalam")
+            _, session = self._get_generator_session(work_dir, scan_workers)
+            seconds = session.warm(progress)
+            message = f"✓ Hymns ready ({seconds:.1f}s)"
         except Exception as e:
-            self.ppt_count.set("✗ Error scanning folder")
+            message = f"⚠ Hymns not pre-loaded: {e}"
+        self._post_warm_status(request, message)
+
+    def _post_warm_status(self, request, message):
+        try:
+            self.root.after(0, self._show_warm_status, request, message)
+        except RuntimeError:
+            pass  # Window already closed
+
+    def _show_warm_status(self, request, message):
+        # Ignore pre-loads overtaken by a newer folder change
+        if request == self._prewarm_request:
+            self.warm_status.set(message)
+
+    def _count_ppt_files(self, folder):
+        """count_ppt_files() with this window's per-folder cache"""
+        return count_ppt_files(folder, self._ppt_counts, self._ppt_counts_lock)
             
     def find_language_folder(self, base_folder):
         """Intelligently find the correct language-specific PPT folder.
@@ -321,7 +502,14 @@ class PPTGeneratorGUI:
         
         Returns the language root folder to search ALL year subfolders recursively.
         """
-        language = self.language.get()
+        folder, notes = self._detect_language_folder(base_folder, self.language.get())
+        for note in notes:
+            self.log(note)
+        return folder
+
+    def _detect_language_folder(self, base_folder, language):
+        """find_language_folder() without touching the window, for background threads.
+        Returns (folder, messages to log)."""
         base_path = Path(base_folder)
         
         # Check if this is the parent folder with standard structure
@@ -334,11 +522,11 @@ class PPTGeneratorGUI:
             
             if lang_folder.exists():
                 # Return the language folder root to search ALL year folders
-                ppt_files = list(lang_folder.glob("**/*.ppt*"))  # Recursive search
-                if ppt_files:
-                    self.log(f"📁 Auto-detected: {lang_folder.relative_to(base_path)}")
-                    self.log(f"   Will search all year folders (2024, 2025, 2026, etc.)")
-                    return str(lang_folder)
+                if self._count_ppt_files(str(lang_folder)):  # Recursive search
+                    return str(lang_folder), [
+                        f"📁 Auto-detected: {lang_folder.relative_to(base_path)}",
+                        f"   Will search all year folders (2024, 2025, 2026, etc.)",
+                    ]
         
         # Check if user selected the HCS folder directly
         if base_path.name == "Holy Communion Services - Slides":
@@ -348,18 +536,16 @@ class PPTGeneratorGUI:
                 lang_folder = base_path / "English HCS"
             
             if lang_folder.exists():
-                ppt_files = list(lang_folder.glob("**/*.ppt*"))
-                if ppt_files:
-                    self.log(f"📁 Will search all subfolders in: {lang_folder.name}")
-                    return str(lang_folder)
+                if self._count_ppt_files(str(lang_folder)):
+                    return str(lang_folder), [f"📁 Will search all subfolders in: {lang_folder.name}"]
         
         # Check if user selected the language folder directly (Malayalam HCS or English HCS)
         if "Malayalam HCS" in str(base_path) or "English HCS" in str(base_path):
             # Return this folder - will search all year subfolders
-            return str(base_path)
+            return str(base_path), []
         
         # User selected a specific folder - use as-is
-        return base_folder
+        return base_folder, []
 
     def get_bundled_folder_path(self):
         """Get path to bundled onedrive_git_local folder"""
@@ -533,22 +719,6 @@ class PPTGeneratorGUI:
             )
             return
         
-        # Validate source folder has PPT files (only if folder provided)
-        if self.source_folder.get():
-            ppt_files = list(Path(self.source_folder.get()).glob("**/*.ppt*"))  # Recursive search
-            if len(ppt_files) == 0:
-                messagebox.showerror(
-                    "No PowerPoint Files Found",
-                    f"No PowerPoint files found in:\n\n{self.source_folder.get()}\n\n"
-                    "Please make sure:\n"
-                    "• You selected the correct folder with hymn PPT files\n"
-                    "• Files have .pptx or .ppt extension\n"
-                    "• OneDrive files are downloaded (not cloud-only)\n\n"
-                    "If using OneDrive:\n"
-                    "→ Right-click folder → 'Always keep on this device'"
-                )
-                return
-            
         service_text = self.get_service_text()
         if not service_text:
             messagebox.showerror(
@@ -572,6 +742,26 @@ class PPTGeneratorGUI:
             self.log("🎵 Starting PowerPoint generation...")
             self.log("="*70 + "\n")
             
+            # Validate source folder has PPT files (only if folder provided). Counted here, off
+            # the Tk thread, in the detected language folder whose count the PPT count label
+            # has already cached
+            folder_path = self.source_folder.get().strip()
+            if folder_path:
+                detected_folder, _ = self._detect_language_folder(folder_path, self.language.get())
+                if self._count_ppt_files(detected_folder) == 0:
+                    self.log(f"❌ No PowerPoint files found in: {detected_folder}")
+                    messagebox.showerror(
+                        "No PowerPoint Files Found",
+                        f"No PowerPoint files found in:\n\n{folder_path}\n\n"
+                        "Please make sure:\n"
+                        "• You selected the correct folder with hymn PPT files\n"
+                        "• Files have .pptx or .ppt extension\n"
+                        "• OneDrive files are downloaded (not cloud-only)\n\n"
+                        "If using OneDrive:\n"
+                        "→ Right-click folder → 'Always keep on this device'"
+                    )
+                    return
+            
             # Prepare output filename
             service_text_raw = self.get_service_text()
             service_date_text = self._extract_service_date(service_text_raw)
@@ -592,12 +782,6 @@ class PPTGeneratorGUI:
                         "Please close the PPT if it is open and try again."
                     )
             
-            # Find generate_malayalam_hcs_ppt.py
-            script_path = self._find_generator_script()
-            if not script_path:
-                raise Exception("Malayalam Generator script not found. Please ensure generate_malayalam_hcs_ppt.py is in the same folder as this program.")
-            
-            # Get full paths
             service_text_raw = self.get_service_text()
             service_text, total_songs, communion_songs = self._normalize_service_text(service_text_raw)
             
@@ -609,10 +793,8 @@ class PPTGeneratorGUI:
             self.log(f"🌐 Language: {self.language.get()}")
             self.log(f"💾 Output: {output_file}\n")
             
-            # Create a temporary batch file that includes language directive
-            desktop_path = Path.home() / "Desktop"
-            
             # Ensure Desktop folder exists
+            desktop_path = Path(output_file).parent
             if not desktop_path.exists():
                 try:
                     desktop_path.mkdir(parents=True, exist_ok=True)
@@ -624,71 +806,27 @@ class PPTGeneratorGUI:
                         f"Please ensure you have write permissions to your home directory."
                     )
             
-            temp_batch_file = desktop_path / ".temp_service.txt"
-            self.log(f"📝 Creating temp file: {temp_batch_file}")
-            
-            try:
-                # Write to temp file
-                self.log(f"💾 Writing temp file...")
-                with open(temp_batch_file, 'w', encoding='utf-8') as temp_f:
-                    # Add language directive
-                    temp_f.write(f"# Language: {self.language.get()}\n")
-                    temp_f.write(service_text)
-                    
-                self.log(f"✅ Temp file created successfully\n")
-                    
-            except Exception as e:
-                # Clean up temp file if it was created
-                try:
-                    if temp_batch_file.exists():
-                        temp_batch_file.unlink()
-                        self.log(f"🗑️ Cleaned up temp file")
-                except:
-                    pass
-                raise e
-            
-            # Run the generator in-process to avoid relaunching the GUI exe
+            # Run the generator in-process, in the session kept open between generations
             generator_stdout = ""
             generator_stderr = ""
             generator_error = None
 
             try:
-                try:
-                    import generate_malayalam_hcs_ppt
-                except Exception as e:
-                    raise Exception(
-                        "Cannot load generate_malayalam_hcs_ppt.py. Please ensure it is packaged with the app.\n\n"
-                        f"Error: {str(e)}"
-                    )
+                generator, session = self._get_generator_session(self._session_folder(), self.scan_workers.get())
+                songs, service_date = generator.parse_service_text(service_text)
+                if not songs:
+                    raise Exception("No songs found in the service list.")
 
-                original_argv = sys.argv[:]
-                original_cwd = os.getcwd()
                 stdout_buf = StringIO()
                 stderr_buf = StringIO()
-
                 try:
-                    sys.argv = [script_path, "--batch", str(temp_batch_file), output_file]
-                    # Change to source folder if provided, otherwise use bundled folder
-                    work_dir = self.source_folder.get() if self.source_folder.get() else (self.get_bundled_folder_path() or original_cwd)
-                    os.chdir(work_dir)
-
                     with redirect_stdout(stdout_buf), redirect_stderr(stderr_buf):
-                        generate_malayalam_hcs_ppt.main()
+                        session.generate(songs, output_file, service_date)
                 finally:
-                    sys.argv = original_argv
-                    os.chdir(original_cwd)
-
-                generator_stdout = stdout_buf.getvalue().strip()
-                generator_stderr = stderr_buf.getvalue().strip()
+                    generator_stdout = stdout_buf.getvalue().strip()
+                    generator_stderr = stderr_buf.getvalue().strip()
             except Exception as e:
                 generator_error = str(e)
-            finally:
-                # Clean up temporary file
-                try:
-                    if temp_batch_file.exists():
-                        temp_batch_file.unlink()
-                except:
-                    pass
 
             # Show output
             if generator_stdout:
@@ -823,27 +961,32 @@ class PPTGeneratorGUI:
             # Silently ignore if PowerPoint isn't running
             pass
     
-    def _find_generator_script(self):
-        """Find generate_malayalam_hcs_ppt.py in various locations"""
-        # Check current directory
-        script_name = "generate_malayalam_hcs_ppt.py"
-        
-        # Same directory as this script
-        current_dir = Path(__file__).parent if hasattr(sys, '_MEIPASS') else Path.cwd()
-        if (current_dir / script_name).exists():
-            return str(current_dir / script_name)
-        
-        # PyInstaller temp folder
-        if hasattr(sys, '_MEIPASS'):
-            temp_path = Path(sys._MEIPASS) / script_name
-            if temp_path.exists():
-                return str(temp_path)
-        
-        # Working directory
-        if (Path.cwd() / script_name).exists():
-            return str(Path.cwd() / script_name)
-        
-        return None
+    def _session_folder(self):
+        """Folder the generator searches: source folder if provided, otherwise bundled folder"""
+        return self.source_folder.get().strip() or self.get_bundled_folder_path() or os.getcwd()
+
+    def _get_generator_session(self, work_dir, scan_workers):
+        """
+        The generator and its session for work_dir.
+
+        Sessions are created on first use and kept for the life of the window, so the
+        folders, hymn index and template they have loaded stay cached between generations.
+        """
+        try:
+            import generate_malayalam_hcs_ppt
+        except Exception as e:
+            raise Exception(
+                "Cannot load generate_malayalam_hcs_ppt.py. Please ensure it is packaged with the app.\n\n"
+                f"Error: {str(e)}"
+            )
+
+        with self._session_lock:
+            session = self.generator_sessions.get(work_dir)
+            if session is None:
+                session = generate_malayalam_hcs_ppt.GeneratorSession(work_dir)
+                self.generator_sessions[work_dir] = session
+            session.scan_workers = scan_workers
+            return generate_malayalam_hcs_ppt, session
 
 def main():
     root = tk.Tk()
@@ -851,4 +994,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Needed for PPT scanning worker processes in the frozen .exe
+    multiprocessing.freeze_support()
     main()
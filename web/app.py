@@ -4,27 +4,87 @@ Malayalam Church Songs PPT Generator - Web Application
 Allows users to generate PowerPoint presentations via web browser
 """
 
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify, session
+from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify, session, Response, stream_with_context
+import io
 import os
 import sys
+import json
+import time
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import tempfile
 import shutil
-from io import StringIO
+import zipfile
 
 # Add modules directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
 # Import the PPT generation module
-from ppt_generator import generate_presentation_from_song_list, parse_batch_file
+from ppt_generator import parse_batch_file, parse_services_file, lookup_hymn, search_hymns, HymnIndexNotReady
+from generation_jobs import GenerationJobQueue, QueueFullError
+from file_janitor import GeneratedFileJanitor
+from hymn_catalog import HymnCatalog
+from hymn_index_refresher import HymnIndexRefresher
+from zip_stream import ZipChunkSink
 
 app = Flask(__name__)
 app.secret_key = 'malayalam-church-songs-secret-key-2026'
 app.config['GENERATED_FOLDER'] = os.path.join(os.path.dirname(__file__), 'generated')
+# Worker processes used to scan PPT files (0 = one per CPU core, 1 = no parallel scanning)
+app.config['SCAN_WORKERS'] = int(os.environ.get('PPT_SCAN_WORKERS', '0'))
+# Generations run at once (one worker process each) and extra requests allowed to wait
+app.config['MAX_CONCURRENT_JOBS'] = int(os.environ.get('PPT_MAX_CONCURRENT_JOBS', '2'))
+app.config['MAX_QUEUED_JOBS'] = int(os.environ.get('PPT_MAX_QUEUED_JOBS', '50'))
+# Languages whose corpus each worker loads at startup (empty = load on first request)
+app.config['WARM_LANGUAGES'] = [lang.strip() for lang in os.environ.get('PPT_WARM_LANGUAGES', 'Malayalam,English').split(',') if lang.strip()]
 
-# Store progress logs temporarily
-progress_logs = {}
+# Finished jobs and their progress logs are kept this many seconds, and at most this many of them
+app.config['JOB_LOG_TTL'] = int(os.environ.get('PPT_JOB_LOG_TTL', '3600'))
+app.config['MAX_JOB_LOGS'] = int(os.environ.get('PPT_MAX_JOB_LOGS', '200'))
+# Generated files are deleted after this many hours, oldest first when over the size quota
+app.config['GENERATED_MAX_AGE_HOURS'] = float(os.environ.get('PPT_GENERATED_MAX_AGE_HOURS', '24'))
+app.config['GENERATED_MAX_MB'] = float(os.environ.get('PPT_GENERATED_MAX_MB', '500'))
+app.config['JANITOR_INTERVAL'] = int(os.environ.get('PPT_JANITOR_INTERVAL', '300'))
+# Seconds between background refreshes of the hymn index the song lookups read
+app.config['INDEX_REFRESH_INTERVAL'] = int(os.environ.get('PPT_INDEX_REFRESH_INTERVAL', '300'))
+# Hymn Excel reports and their per-deck analysis results (kept outside GENERATED_FOLDER)
+app.config['CATALOG_FOLDER'] = os.environ.get(
+    'PPT_CATALOG_FOLDER', os.path.join(os.path.expanduser('~'), '.church_ppt_cache', 'web_catalog')
+)
+
+# Owns hymn index writes; the generation workers wait for its first pass and only read
+hymn_index = HymnIndexRefresher(
+    ('Malayalam', 'English'),
+    interval=app.config['INDEX_REFRESH_INTERVAL'],
+    scan_workers=app.config['SCAN_WORKERS']
+)
+job_queue = GenerationJobQueue(
+    app.config['MAX_CONCURRENT_JOBS'],
+    app.config['MAX_QUEUED_JOBS'],
+    warm_languages=app.config['WARM_LANGUAGES'],
+    scan_workers=app.config['SCAN_WORKERS'],
+    job_ttl=app.config['JOB_LOG_TTL'],
+    max_finished_jobs=app.config['MAX_JOB_LOGS'],
+    index_ready=hymn_index.ready
+)
+hymn_catalogs = {
+    language: HymnCatalog(language, app.config['CATALOG_FOLDER'], jobs=app.config['SCAN_WORKERS'])
+    for language in ('Malayalam', 'English')
+}
+janitor = GeneratedFileJanitor(
+    app.config['GENERATED_FOLDER'],
+    max_bytes=int(app.config['GENERATED_MAX_MB'] * 1024 * 1024),
+    max_age=app.config['GENERATED_MAX_AGE_HOURS'] * 3600,
+    interval=app.config['JANITOR_INTERVAL'],
+    protected_paths=job_queue.active_paths
+)
+
+@app.before_request
+def start_background_tasks():
+    """Start the background threads with the first request, so they also run when the app
+    is served by `flask run` or a WSGI server instead of `python app.py`"""
+    janitor.start()
+    hymn_index.start()
 
 @app.route('/')
 def index():
@@ -33,7 +93,7 @@ def index():
 
 @app.route('/generate', methods=['POST'])
 def generate():
-    """Generate PPT from form data"""
+    """Queue a PPT generation from form data and return its job ID"""
     try:
         # Get language selection
         language = request.form.get('language', 'Malayalam').strip()
@@ -41,8 +101,7 @@ def generate():
         # Parse manual input from form
         songs_text = request.form.get('songs_text', '').strip()
         if not songs_text:
-            flash('Please enter songs.', 'error')
-            return redirect(url_for('index'))
+            return jsonify({'status': 'error', 'message': 'Please enter songs.'}), 400
         
         # Create temp file from text input
         temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
@@ -53,8 +112,7 @@ def generate():
         os.remove(temp_file.name)
         
         if not song_list:
-            flash('No valid songs found in input.', 'error')
-            return redirect(url_for('index'))
+            return jsonify({'status': 'error', 'message': 'No valid songs found in input.'}), 400
         
         # Get service date if provided
         service_date = request.form.get('service_date', '').strip()
@@ -62,82 +120,243 @@ def generate():
         # Generate output filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_filename = f'{language}_HCS_{timestamp}.pptx'
-        output_path = os.path.join(app.config['GENERATED_FOLDER'], output_filename)
-        
-        # Capture stdout to return progress messages
-        from io import StringIO
-        import sys
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
-        
-        # Generate a unique ID for this generation
-        gen_id = timestamp
-        progress_logs[gen_id] = []
-        
-        try:
-            # Generate the presentation
-            success, message = generate_presentation_from_song_list(
-                song_list, 
-                output_path, 
-                service_date if service_date else None,
-                language=language
-            )
-        finally:
-            # Restore stdout and capture the log
-            sys.stdout = old_stdout
-            progress_log = captured_output.getvalue()
-            progress_logs[gen_id] = progress_log.split('\n')
-        
-        if success:
-            # Store the log for retrieval
-            response = send_file(
-                output_path,
-                as_attachment=True,
-                download_name=output_filename,
-                mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
-            )
-            # Explicitly set Content-Disposition header to force correct filename
-            response.headers['Content-Disposition'] = f'attachment; filename="{output_filename}"'
-            # Add generation ID for log retrieval
-            response.headers['X-Generation-ID'] = gen_id
-            response.headers['X-Has-Log'] = 'true'
-            return response
-        else:
-            flash(f'Error generating presentation: {message}', 'error')
-            return redirect(url_for('index'))
-            
+        
+        os.makedirs(app.config['GENERATED_FOLDER'], exist_ok=True)
+        job_id = job_queue.submit(
+            song_list,
+            app.config['GENERATED_FOLDER'],
+            output_filename,
+            service_date if service_date else None,
+            language=language,
+            scan_workers=app.config['SCAN_WORKERS']
+        )
+        return jsonify(job_status(job_queue.get(job_id))), 202
+    
+    except QueueFullError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
-        flash(f'Error: {str(e)}', 'error')
-        return redirect(url_for('index'))
+        return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
+
+@app.route('/generate_batch', methods=['POST'])
+def generate_batch():
+    """Queue several services (each starting with its own Date: line) to be downloaded as one ZIP"""
+    try:
+        language = request.form.get('language', 'Malayalam').strip()
+        
+        songs_text = request.form.get('songs_text', '').strip()
+        if not songs_text:
+            return jsonify({'status': 'error', 'message': 'Please enter songs.'}), 400
+        
+        # Create temp file from text input
+        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        temp_file.write(songs_text)
+        temp_file.close()
+        
+        services = parse_services_file(temp_file.name)
+        os.remove(temp_file.name)
+        
+        if not services:
+            return jsonify({'status': 'error', 'message': 'No valid songs found in input.'}), 400
+        
+        # One file name per service, from its date
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        named_services = []
+        used_names = set()
+        for number, (service_date, song_list) in enumerate(services, 1):
+            name = secure_filename(service_date or '') or f'service_{number}'
+            if name in used_names:
+                name = f'{name}_{number}'
+            used_names.add(name)
+            named_services.append((service_date, song_list, f'{language}_HCS_{name}.pptx'))
+        
+        os.makedirs(app.config['GENERATED_FOLDER'], exist_ok=True)
+        batch_id = job_queue.submit_batch(
+            named_services,
+            app.config['GENERATED_FOLDER'],
+            f'{language}_HCS_batch_{timestamp}.zip',
+            language=language,
+            scan_workers=app.config['SCAN_WORKERS']
+        )
+        return jsonify(batch_status(job_queue.get_batch(batch_id))), 202
+    
+    except QueueFullError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
+
+def batch_status(batch):
+    """JSON-ready status of a batch and each of its services"""
+    return {
+        'batch_id': batch.batch_id,
+        'status': 'done' if batch.finished else 'running',
+        'language': batch.language,
+        'filename': batch.download_name,
+        'status_url': url_for('get_batch', batch_id=batch.batch_id),
+        'download_url': url_for('download_batch', batch_id=batch.batch_id),
+        'jobs': [job_status(job) for job in batch.jobs],
+    }
+
+def job_status(job):
+    """JSON-ready status of a generation job"""
+    status = {
+        'job_id': job.job_id,
+        'status': job.status,
+        'language': job.language,
+        'filename': job.download_name,
+        'status_url': url_for('get_job', job_id=job.job_id),
+    }
+    if job.status == 'queued':
+        status['position'] = job_queue.position(job.job_id)
+    elif job.status == 'done':
+        status['download_url'] = url_for('download_job', job_id=job.job_id)
+    elif job.status == 'failed':
+        status['message'] = job.message
+    return status
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Status of a queued generation"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job'}), 404
+    return jsonify(job_status(job))
+
+# Seconds between keep-alive comments on an idle progress stream
+EVENT_STREAM_KEEPALIVE = 15
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a generation's status changes and progress lines as Server-Sent Events"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job'}), 404
+    
+    # Resume after the last line the browser saw if it reconnects
+    try:
+        sent_lines = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        sent_lines = 0
+    
+    def stream():
+        nonlocal sent_lines
+        last_status = None
+        version = job_queue.version
+        while True:
+            finished = job.finished
+            status = job_status(job)
+            if status != last_status and not finished:
+                last_status = status
+                yield sse_event('status', status)
+            lines = job.log[sent_lines:]
+            for line in lines:
+                sent_lines += 1
+                yield f'id: {sent_lines}\n' + sse_event('log', {'line': line})
+            if finished:
+                yield sse_event('done', status)
+                return
+            new_version = job_queue.wait_for_change(version, EVENT_STREAM_KEEPALIVE)
+            if new_version == version:
+                yield ': keep-alive\n\n'
+            version = new_version
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs/<job_id>/download')
+def download_job(job_id):
+    """Download the presentation of a finished generation"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job'}), 404
+    if job.status != 'done':
+        return jsonify(job_status(job)), 409
+    if not os.path.exists(job.output_path):
+        return jsonify({'status': 'error', 'message': 'The generated file is no longer available'}), 410
+    
+    response = send_file(
+        job.output_path,
+        as_attachment=True,
+        download_name=job.download_name,
+        mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
+    )
+    # Explicitly set Content-Disposition header to force correct filename
+    response.headers['Content-Disposition'] = f'attachment; filename="{job.download_name}"'
+    return response
+
+@app.route('/batches/<batch_id>')
+def get_batch(batch_id):
+    """Status of a batch of services"""
+    batch = job_queue.get_batch(batch_id)
+    if batch is None:
+        return jsonify({'status': 'error', 'message': 'Unknown batch'}), 404
+    return jsonify(batch_status(batch))
+
+def stream_batch_zip(batch):
+    """Yield a ZIP of the batch's presentations, adding each one as soon as it is generated"""
+    sink = ZipChunkSink()
+    errors = []
+    # Presentations are already compressed, so they are stored as they are
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        pending = list(batch.jobs)
+        while pending:
+            version = job_queue.version
+            for job in [job for job in pending if job.success is not None]:
+                pending.remove(job)
+                if job.success and os.path.exists(job.output_path):
+                    archive.write(job.output_path, job.download_name)
+                elif job.success:
+                    errors.append(f'{job.download_name}: the generated file is no longer available')
+                else:
+                    errors.append(f'{job.download_name}: {job.message}')
+                yield sink.take()
+            if pending:
+                job_queue.wait_for_change(version, EVENT_STREAM_KEEPALIVE)
+        if errors:
+            archive.writestr('errors.txt', '\n\n'.join(errors))
+    yield sink.take()
+
+@app.route('/batches/<batch_id>/download')
+def download_batch(batch_id):
+    """Download a batch as a ZIP, streamed while its services are still being generated"""
+    batch = job_queue.get_batch(batch_id)
+    if batch is None:
+        return jsonify({'status': 'error', 'message': 'Unknown batch'}), 404
+    return Response(stream_with_context(stream_batch_zip(batch)), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{batch.download_name}"',
+                             'X-Accel-Buffering': 'no'})
 
 @app.route('/get_log/<gen_id>')
 def get_log(gen_id):
     """Retrieve generation log"""
-    if gen_id in progress_logs:
-        return jsonify({'log': progress_logs[gen_id]})
+    job = job_queue.get(gen_id)
+    if job is not None:
+        return jsonify({'log': job.log})
     return jsonify({'log': []})
 
 @app.route('/cleanup')
 def cleanup():
-    """Clean up old generated files (keep last 10)"""
+    """Run a generated file cleanup pass now (the janitor also runs in the background)"""
     try:
-        files = []
-        for filename in os.listdir(app.config['GENERATED_FOLDER']):
-            filepath = os.path.join(app.config['GENERATED_FOLDER'], filename)
-            if os.path.isfile(filepath):
-                files.append((filepath, os.path.getmtime(filepath)))
-        
-        # Sort by modification time
-        files.sort(key=lambda x: x[1], reverse=True)
-        
-        # Delete all but the 10 most recent
-        for filepath, _ in files[10:]:
-            os.remove(filepath)
-        
-        return jsonify({'status': 'success', 'message': f'Cleaned up {max(0, len(files) - 10)} old files'})
+        deleted = janitor.run_once()
+        return jsonify({'status': 'success', 'message': f'Cleaned up {deleted} old files'})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)})
 
+@app.route('/stats')
+def stats():
+    """Job queue and cleanup counters for operators"""
+    job_queue.prune_finished()
+    return jsonify({
+        'jobs': job_queue.get_stats(),
+        'generated_files': janitor.stats,
+        'hymn_catalogs': {language: catalog.status() for language, catalog in hymn_catalogs.items()},
+        'hymn_index': hymn_index.stats,
+    })
+
 @app.route('/about')
 def about():
     """About page"""
@@ -145,46 +364,107 @@ def about():
 
 @app.route('/extract_hymns/<language>')
 def extract_hymns(language):
-    """Extract all hymns from PPT files based on language and generate Excel report"""
-    try:
-        if language == 'Malayalam':
-            import extract_malayalam_hymns as extract_module
-            lang_name = 'malayalam'
-        elif language == 'English':
-            # Add English directory to path
-            sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'English'))
-            import extract_english_hymns as extract_module
-            lang_name = 'english'
+    """Download the last hymn Excel report for a language (POST .../refresh rebuilds it)"""
+    catalog = hymn_catalogs.get(language)
+    if catalog is None:
+        flash(f'Unsupported language: {language}', 'error')
+        return redirect(url_for('index'))
+    
+    report = catalog.read_report()
+    if report is None:
+        if catalog.building:
+            flash(f'The {language} hymn report is being prepared. Please try again in a minute.', 'success')
         else:
-            flash(f'Unsupported language: {language}', 'error')
-            return redirect(url_for('index'))
-        
-        # Find all PPT files
-        pptx_files = extract_module.find_all_pptx_files()
-        
-        # Extract hymn information
-        all_hymns = []
-        for pptx_file in pptx_files:
-            hymns = extract_module.analyze_pptx_file(pptx_file)
-            all_hymns.extend(hymns)
-        
-        # Create Excel report in generated folder
-        output_filename = f'{lang_name}_hymns_report.xlsx'
-        output_path = os.path.join(app.config['GENERATED_FOLDER'], output_filename)
-        
-        extract_module.create_excel_report(all_hymns, output_path)
-        
-        # Send the file for download
-        return send_file(
-            output_path,
-            as_attachment=True,
-            download_name=output_filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-    except Exception as e:
-        import traceback
-        flash(f'Error extracting {language} hymns: {str(e)}\n{traceback.format_exc()}', 'error')
+            flash(f'No {language} hymn report has been built yet. Use "Extract {language} Hymns to Excel" to build one.', 'error')
         return redirect(url_for('index'))
+    
+    # Send the last report from memory, so a rebuild can replace the file meanwhile
+    data, built_at = report
+    response = send_file(
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name=catalog.download_name(built_at),
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response.headers['X-Report-Built-At'] = built_at.isoformat(timespec='seconds')
+    return response
+
+@app.route('/extract_hymns/<language>/status')
+def extract_hymns_status(language):
+    """State of a language's hymn report: ready, when it was built, whether a rebuild is running"""
+    catalog = hymn_catalogs.get(language)
+    if catalog is None:
+        return jsonify({'status': 'error', 'message': f'Unsupported language: {language}'}), 404
+    return jsonify(catalog.status())
+
+@app.route('/extract_hymns/<language>/refresh', methods=['POST'])
+def extract_hymns_refresh(language):
+    """Start rebuilding a language's hymn report in the background"""
+    catalog = hymn_catalogs.get(language)
+    if catalog is None:
+        return jsonify({'status': 'error', 'message': f'Unsupported language: {language}'}), 404
+    catalog.refresh()
+    return jsonify(catalog.status())
+
+def hymn_index_not_ready(language):
+    """503 answer for a lookup made before the hymn index is built; the build is started"""
+    hymn_index.refresh(language)
+    response = jsonify({
+        'status': 'not_ready',
+        'ready': False,
+        'language': language,
+        'message': 'The hymn index is being prepared - please try again in a moment.',
+    })
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+@app.route('/api/hymns/<hymn_num>')
+def api_hymn(hymn_num):
+    """Decks and slides a hymn can be taken from, and the one a generation would use"""
+    language = request.args.get('language', 'Malayalam')
+    if language not in ('Malayalam', 'English'):
+        return jsonify({'status': 'error', 'message': f'Unsupported language: {language}'}), 400
+    
+    hymn_num = hymn_num.strip()
+    title_hint = request.args.get('title', '').strip()
+    started = time.perf_counter()
+    try:
+        result = lookup_hymn(hymn_num, title_hint, language)
+    except HymnIndexNotReady:
+        return hymn_index_not_ready(language)
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
+    if result['pending']:
+        # Index the title hint in the background; the next lookup answers it fully
+        hymn_index.refresh(language, [(result['hymn_num'], result['title_hint'])])
+    result['language'] = language
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return jsonify(result)
+
+@app.route('/api/hymns')
+def api_hymn_search():
+    """Hymns whose title contains every word of the title parameter"""
+    language = request.args.get('language', 'Malayalam')
+    if language not in ('Malayalam', 'English'):
+        return jsonify({'status': 'error', 'message': f'Unsupported language: {language}'}), 400
+    title = request.args.get('title', '').strip()
+    if not title:
+        return jsonify({'status': 'error', 'message': 'Please give a title to search for.'}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    started = time.perf_counter()
+    try:
+        hymns = search_hymns(title, language, limit)
+    except HymnIndexNotReady:
+        return hymn_index_not_ready(language)
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
+    return jsonify({
+        'language': language,
+        'title': title,
+        'hymns': hymns,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    })
 
 @app.route('/ppt_count/<language>')
 def ppt_count(language):
@@ -214,6 +494,13 @@ if __name__ == '__main__':
     # Create directories if they don't exist
     os.makedirs(app.config['GENERATED_FOLDER'], exist_ok=True)
     
+    # Build or update the hymn index the song lookups read, then keep it current
+    hymn_index.start()
+    # Start the generation workers; they load the hymn corpus once the index is up to date
+    job_queue.start()
+    # Start deleting old generated files in the background
+    janitor.start()
+    
     # Run the Flask app
     # For local network access, use host='0.0.0.0'
     # For localhost only, use host='127.0.0.1'
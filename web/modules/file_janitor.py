@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Background janitor for the web application's generated files
+Keeps the generated folder under a maximum age and a byte quota
+"""
+
+import os
+import threading
+import time
+
+
+class GeneratedFileJanitor:
+    """
+    Deletes generated files that are older than max_age seconds, then the oldest files
+    until the folder fits in max_bytes. Runs every interval seconds on a daemon thread
+    once start() is called (later calls do nothing, so it can be called on every
+    request); run_once() does a single pass.
+
+    protected_paths() (optional) returns paths that must not be deleted yet, e.g. the
+    outputs of jobs that are still running.
+    """
+
+    def __init__(self, folder, max_bytes, max_age, interval=300, protected_paths=None):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.interval = interval
+        self.protected_paths = protected_paths or (lambda: ())
+        self.stats = {
+            'runs': 0,
+            'deleted_expired': 0,
+            'deleted_over_quota': 0,
+            'bytes_freed': 0,
+            'errors': 0,
+            'last_run': None,
+            'folder_bytes': 0,
+            'folder_files': 0,
+        }
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _delete(self, path, size, reason):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            self.stats['errors'] += 1
+            return False
+        self.stats[reason] += 1
+        self.stats['bytes_freed'] += size
+        return True
+
+    def run_once(self):
+        """One cleanup pass; returns the number of files deleted."""
+        with self._lock:
+            now = time.time()
+            protected = set(self.protected_paths())
+            files = []
+            try:
+                names = os.listdir(self.folder)
+            except FileNotFoundError:
+                names = []
+            for name in names:
+                path = os.path.join(self.folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path) and not name.startswith('.'):
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            # Oldest first, so the quota pass removes the files least likely to still be wanted
+            files.sort()
+            deleted = 0
+            kept = []
+            for mtime, size, path in files:
+                if path not in protected and now - mtime > self.max_age:
+                    if self._delete(path, size, 'deleted_expired'):
+                        deleted += 1
+                        continue
+                kept.append((mtime, size, path))
+
+            total = sum(size for _, size, _ in kept)
+            remaining = []
+            for mtime, size, path in kept:
+                if total > self.max_bytes and path not in protected:
+                    if self._delete(path, size, 'deleted_over_quota'):
+                        deleted += 1
+                        total -= size
+                        continue
+                remaining.append(path)
+
+            self.stats['runs'] += 1
+            self.stats['last_run'] = now
+            self.stats['folder_bytes'] = total
+            self.stats['folder_files'] = len(remaining)
+            return deleted
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠ Generated file cleanup failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Run a pass now, then every interval seconds, on a daemon thread."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='generated-file-janitor', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
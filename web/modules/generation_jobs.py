@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Background job queue for the web application
+Runs PPT generations in a pool of worker processes so requests return immediately,
+and collects each job's progress output as it is printed
+"""
+
+import os
+import threading
+import uuid
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from ppt_generator import run_generation_job, init_job_worker, ping_worker
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is already at its maximum depth."""
+
+
+class GenerationJob:
+    """One requested presentation, its progress log and, once finished, its result."""
+
+    def __init__(self, job_id, language, output_path, download_name):
+        self.job_id = job_id
+        self.language = language
+        self.output_path = output_path
+        self.download_name = download_name
+        self.submitted_at = datetime.now()
+        self.finished_at = None
+        self.args = None
+        self.future = None
+        self.success = None
+        self.message = ''
+        # Progress lines in the order the generator printed them
+        self.log = []
+        # Set once the worker's last progress line has arrived
+        self.log_complete = False
+
+    @property
+    def status(self):
+        """'queued', 'running', 'done' or 'failed'."""
+        if self.success is not None:
+            return 'done' if self.success else 'failed'
+        if self.future is not None:
+            return 'running'
+        return 'queued'
+
+    @property
+    def finished(self):
+        """True once the result and every progress line are in."""
+        return self.success is not None and self.log_complete
+
+
+class GenerationBatch:
+    """Several services submitted together, downloaded as one ZIP as they finish."""
+
+    def __init__(self, batch_id, language, jobs, download_name):
+        self.batch_id = batch_id
+        self.language = language
+        # GenerationJob for each service, in the order they were given
+        self.jobs = jobs
+        self.download_name = download_name
+        self.submitted_at = datetime.now()
+
+    @property
+    def finished(self):
+        """True once every service's generation has ended."""
+        return all(job.success is not None for job in self.jobs)
+
+
+class GenerationJobQueue:
+    """
+    Queue of generation jobs served by a pool of worker processes.
+
+    max_workers generations run at once (each in its own process, so the generators'
+    module-level state is never shared); up to max_queued more wait their turn.
+    Further submissions raise QueueFullError.
+
+    Workers send progress lines back over a multiprocessing queue; a listener thread
+    appends them to the job's log and wakes anyone in wait_for_change().
+
+    Worker processes live as long as the queue. Each one preloads the corpus state for
+    warm_languages when it starts (see init_job_worker()), and start() launches them all
+    ahead of the first request. With index_ready (the hymn index refresher's event) they
+    wait for its first pass and only load what it saved instead of each updating the
+    hymn index.
+
+    Finished jobs (with their logs) are kept for job_ttl seconds, and at most
+    max_finished_jobs of them; older ones are evicted as new jobs arrive. Each job keeps
+    at most max_log_lines progress lines.
+
+    submit_batch() queues several services at once; they share the same workers (and
+    their preloaded corpus) and are kept as a GenerationBatch until all of its jobs
+    have been evicted.
+    """
+
+    def __init__(self, max_workers=2, max_queued=50, warm_languages=(), scan_workers=None,
+                 job_ttl=3600, max_finished_jobs=200, max_log_lines=2000, index_ready=None):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queued = max(0, int(max_queued))
+        self.warm_languages = tuple(warm_languages)
+        self.scan_workers = scan_workers
+        self.index_ready = index_ready
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max(0, int(max_finished_jobs))
+        self.max_log_lines = max(0, int(max_log_lines))
+        self.jobs = {}
+        self.batches = {}
+        self.stats = {
+            'submitted': 0,
+            'rejected': 0,
+            'done': 0,
+            'failed': 0,
+            'evicted_expired': 0,
+            'evicted_overflow': 0,
+            'log_lines_dropped': 0,
+        }
+        # Jobs not yet handed to a worker, oldest first
+        self._waiting = deque()
+        self._running = 0
+        # Re-entrant: a future that is already done runs its callback inside _dispatch()
+        self._lock = threading.RLock()
+        # Notified whenever any job gets a log line or changes status; version counts the changes
+        self._changed = threading.Condition(self._lock)
+        self.version = 0
+        self._executor = None
+        self._events = None
+        self._listener = None
+
+    def _get_executor(self):
+        # Created on first use so importing the web app doesn't start processes
+        if self._executor is None:
+            self._events = multiprocessing.Queue()
+            self._listener = threading.Thread(target=self._collect_events, args=(self._events,), daemon=True)
+            self._listener.start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=init_job_worker,
+                initargs=(self._events, self.warm_languages, self.scan_workers, self.index_ready)
+            )
+        return self._executor
+
+    def start(self):
+        """Launch every worker process now so they warm up before the first request."""
+        with self._lock:
+            executor = self._get_executor()
+            for _ in range(self.max_workers):
+                executor.submit(ping_worker)
+
+    def _collect_events(self, events):
+        # Listener thread: (job_id, line) from the workers; line None ends that job's log
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            job_id, line = event
+            with self._changed:
+                job = self.jobs.get(job_id)
+                if job is not None:
+                    if line is None:
+                        job.log_complete = True
+                    elif len(job.log) < self.max_log_lines:
+                        job.log.append(line)
+                    else:
+                        self.stats['log_lines_dropped'] += 1
+                self._notify()
+
+    def pending_count(self):
+        """Number of jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job.success is None)
+
+    def _new_job(self, song_list, output_folder, download_name, service_date, language, scan_workers):
+        job_id = uuid.uuid4().hex
+        # Job ID in the stored name keeps same-second submissions from overwriting each other
+        output_path = os.path.join(output_folder, f'{job_id[:8]}_{download_name}')
+        job = GenerationJob(job_id, language, output_path, download_name)
+        job.args = (job_id, song_list, output_path, service_date, language, scan_workers)
+        return job
+
+    def _check_capacity(self, count):
+        # Caller holds the lock
+        self.prune_finished()
+        pending = self.pending_count()
+        if pending + count > self.max_workers + self.max_queued:
+            self.stats['rejected'] += 1
+            raise QueueFullError(
+                f'The generator is busy ({pending} presentations in progress). Please try again in a minute.'
+            )
+
+    def _enqueue(self, jobs):
+        # Caller holds the lock
+        for job in jobs:
+            self.jobs[job.job_id] = job
+            self.stats['submitted'] += 1
+            self._waiting.append(job)
+        self._dispatch()
+
+    def submit(self, song_list, output_folder, download_name, service_date=None,
+               language='Malayalam', scan_workers=None):
+        """Queue a generation and return its job ID; raises QueueFullError when full."""
+        job = self._new_job(song_list, output_folder, download_name, service_date, language, scan_workers)
+        with self._lock:
+            self._check_capacity(1)
+            self._enqueue([job])
+        return job.job_id
+
+    def submit_batch(self, services, output_folder, download_name, language='Malayalam', scan_workers=None):
+        """
+        Queue one generation per service and return the batch ID.
+
+        services is a list of (service_date, song_list, download_name). Either every
+        service is queued or, if they don't all fit, none is (QueueFullError).
+        """
+        jobs = [
+            self._new_job(song_list, output_folder, job_name, service_date, language, scan_workers)
+            for service_date, song_list, job_name in services
+        ]
+        batch = GenerationBatch(uuid.uuid4().hex, language, jobs, download_name)
+        with self._lock:
+            self._check_capacity(len(jobs))
+            self.batches[batch.batch_id] = batch
+            self._enqueue(jobs)
+        return batch.batch_id
+
+    def _dispatch(self):
+        # Hand waiting jobs to the pool only while a worker is free, so a job
+        # counts as running exactly when a worker process has it
+        with self._changed:
+            while self._waiting and self._running < self.max_workers:
+                job = self._waiting.popleft()
+                self._running += 1
+                job.future = self._get_executor().submit(run_generation_job, *job.args)
+                job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+            self._notify()
+
+    def _finish(self, job, future):
+        try:
+            success, message = future.result()
+        except Exception as e:
+            # The worker process died or the job could not be sent to it - no more lines will come
+            success, message = False, f'Generation worker failed: {e}'
+            job.log_complete = True
+        with self._changed:
+            job.message = message
+            job.finished_at = datetime.now()
+            job.success = success
+            job.args = None
+            self._running -= 1
+            self.stats['done' if success else 'failed'] += 1
+            self._notify()
+        self._dispatch()
+
+    def prune_finished(self):
+        """Evict finished jobs past job_ttl, then the oldest beyond max_finished_jobs."""
+        with self._lock:
+            now = datetime.now()
+            finished = sorted(
+                (job for job in self.jobs.values() if job.success is not None),
+                key=lambda job: job.finished_at,
+            )
+            keep = []
+            for job in finished:
+                if (now - job.finished_at).total_seconds() > self.job_ttl:
+                    del self.jobs[job.job_id]
+                    self.stats['evicted_expired'] += 1
+                else:
+                    keep.append(job)
+            for job in keep[:max(0, len(keep) - self.max_finished_jobs)]:
+                del self.jobs[job.job_id]
+                self.stats['evicted_overflow'] += 1
+            # Batches go once none of their jobs is left
+            for batch_id, batch in list(self.batches.items()):
+                if not any(job.job_id in self.jobs for job in batch.jobs):
+                    del self.batches[batch_id]
+
+    def active_paths(self):
+        """Output paths of jobs that are queued or running."""
+        with self._lock:
+            return [job.output_path for job in self.jobs.values() if job.success is None]
+
+    def get_stats(self):
+        """Counters plus the current number of jobs in each state."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['queued'] = len(self._waiting)
+            stats['running'] = self._running
+            stats['stored_jobs'] = len(self.jobs)
+            stats['stored_batches'] = len(self.batches)
+            stats['stored_log_lines'] = sum(len(job.log) for job in self.jobs.values())
+            return stats
+
+    def get(self, job_id):
+        """Return the GenerationJob for job_id, or None."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def get_batch(self, batch_id):
+        """Return the GenerationBatch for batch_id, or None."""
+        with self._lock:
+            return self.batches.get(batch_id)
+
+    def position(self, job_id):
+        """1-based place of a queued job among the jobs still waiting (0 if not waiting)."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job not in self._waiting:
+                return 0
+            return self._waiting.index(job) + 1
+
+    def _notify(self):
+        # Caller holds the lock
+        self.version += 1
+        self._changed.notify_all()
+
+    def wait_for_change(self, version, timeout):
+        """
+        Block until something changed after version was read, or timeout seconds pass.
+        Returns the current version; read it before looking at a job so no change is missed.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def shutdown(self):
+        """Stop the worker processes once the running jobs finish."""
+        with self._lock:
+            self._waiting.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._events.put(None)
+            self._listener.join()
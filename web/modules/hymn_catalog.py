@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Background-built hymn catalog (Excel report) for the web application
+Keeps the last report ready to download and rebuilds it off the request thread,
+re-analysing only new or changed decks
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+
+def load_extract_module(language):
+    """Import and return the hymn extractor module for language ('Malayalam' or 'English')"""
+    if language == 'English':
+        # Add English directory to path
+        english_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'English')
+        if english_dir not in sys.path:
+            sys.path.insert(0, english_dir)
+        import extract_english_hymns as extract_module
+    else:
+        import extract_malayalam_hymns as extract_module
+    return extract_module
+
+
+class HymnCatalog:
+    """
+    The hymn report for one language, rebuilt in a background thread.
+
+    A rebuild goes through the extractor's analyze_pptx_files_cached(), so it shares the
+    per-deck results the command-line extractor saves: only new or changed decks are
+    analysed (in `jobs` worker processes), or every deck if the extractor changed. The
+    report is written to <cache_dir>/<language>_hymns_report.xlsx; the previous report
+    keeps being served until the new one is in place.
+    """
+
+    def __init__(self, language, cache_dir, jobs=None):
+        self.language = language
+        self.jobs = jobs
+        self.lang_name = language.lower()
+        self.cache_dir = cache_dir
+        self.report_path = os.path.join(cache_dir, f'{self.lang_name}_hymns_report.xlsx')
+        self.built_at = None
+        self.building = False
+        self.last_error = None
+        self.stats = {'builds': 0, 'decks': 0, 'analyzed': 0, 'reused': 0, 'hymns': 0,
+                      'analysis_seconds': 0.0, 'analysis_workers': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        if os.path.exists(self.report_path):
+            self.built_at = datetime.fromtimestamp(os.path.getmtime(self.report_path))
+
+    @property
+    def ready(self):
+        """True if a report can be downloaded now."""
+        return self.built_at is not None and os.path.exists(self.report_path)
+
+    def download_name(self, built_at=None):
+        """Report file name including when it was built (built_at, default the last report),
+        e.g. malayalam_hymns_report_20260216_0930.xlsx"""
+        return f'{self.lang_name}_hymns_report_{built_at or self.built_at:%Y%m%d_%H%M}.xlsx'
+
+    def read_report(self):
+        """
+        (report bytes, built_at) of the last report, or None if there is none yet.
+
+        Read into memory under the same lock build() holds while replacing the file, so a
+        download never keeps the report open while it is swapped (which fails on Windows).
+        """
+        with self._lock:
+            if not self.ready:
+                return None
+            with open(self.report_path, 'rb') as f:
+                return f.read(), self.built_at
+
+    def status(self):
+        """JSON-ready state of the catalog"""
+        with self._lock:
+            return {
+                'language': self.language,
+                'ready': self.ready,
+                'built_at': self.built_at.isoformat(timespec='seconds') if self.built_at else None,
+                'building': self.building,
+                'error': self.last_error,
+                'stats': dict(self.stats),
+            }
+
+    def refresh(self):
+        """Start a background rebuild unless one is already running"""
+        with self._lock:
+            if self.building:
+                return False
+            self.building = True
+            self._thread = threading.Thread(target=self._run, name=f'{self.lang_name}-hymn-catalog', daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        """Block until the running rebuild (if any) finishes"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.build()
+            error = None
+        except Exception as e:
+            error = str(e)
+            print(f"⚠ {self.language} hymn catalog rebuild failed: {e}")
+        with self._lock:
+            self.last_error = error
+            self.building = False
+
+    def build(self):
+        """Rebuild the report now (in the calling thread)"""
+        extract_module = load_extract_module(self.language)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        pptx_files = extract_module.find_all_pptx_files()
+        results, analysis = extract_module.analyze_pptx_files_cached(pptx_files, self.jobs)
+        all_hymns = [hymn for _, hymns in results for hymn in hymns]
+        analyzed, reused = analysis['analyzed'], analysis['reused']
+
+        # Per-process temp name: several server processes may share the catalog folder
+        tmp_report = f'{self.report_path}.{os.getpid()}.tmp.xlsx'
+        extract_module.create_excel_report(all_hymns, tmp_report)
+
+        with self._lock:
+            os.replace(tmp_report, self.report_path)
+            self.built_at = datetime.now()
+            self.stats['builds'] += 1
+            self.stats.update(decks=len(results), analyzed=analyzed, reused=reused, hymns=len(all_hymns),
+                              analysis_seconds=round(analysis['seconds'], 2),
+                              analysis_workers=analysis['workers'])
+        print(f"✓ {self.language} hymn catalog rebuilt: {analyzed} deck(s) analysed, {reused} unchanged")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Background refresher for the hymn index behind the web application's song lookups
+Keeps each language's index current in a worker process, so lookups only read it
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ppt_generator import hymn_index_refreshed, refresh_hymn_index_job
+
+
+class HymnIndexRefresher:
+    """
+    Refreshes the hymn index of each language on one worker process: once start() is
+    called, then every interval seconds, and whenever refresh() asks for it - e.g. a
+    lookup found the index not built yet, or title hints it hasn't indexed.
+
+    Lookups (ppt_generator.lookup_hymn()/search_hymns()) only read the index, so building
+    it never holds up a request. A refresh asked for while one is running is folded into
+    the next run.
+
+    ready is a multiprocessing Event set once the first refresh of every language has
+    finished (successfully or not); generation workers wait for it before warming up.
+    """
+
+    def __init__(self, languages, interval=300, scan_workers=None):
+        self.languages = tuple(languages)
+        self.interval = interval
+        self.scan_workers = scan_workers
+        self.stats = {
+            language: {
+                'refreshes': 0,
+                'errors': 0,
+                'refreshing': False,
+                'last_refresh': None,
+                'last_seconds': None,
+                'last_error': None,
+                'queued_titles': 0,
+            }
+            for language in self.languages
+        }
+        self._lock = threading.Lock()
+        self._executor = None
+        # (hymn_num, title_hint) lookups to index on each language's next run
+        self._queued = {language: set() for language in self.languages}
+        self._first_pass = set(self.languages)
+        self.ready = multiprocessing.Event()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _get_executor(self):
+        # Created on first use so importing the web app doesn't start processes
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        return self._executor
+
+    def refresh(self, language, title_queries=()):
+        """Refresh language's index now, or after the run in progress; title_queries
+        ((hymn_num, title_hint) pairs) are indexed by that run."""
+        with self._lock:
+            stats = self.stats[language]
+            self._queued[language].update(title_queries)
+            stats['queued_titles'] = len(self._queued[language])
+            if stats['refreshing']:
+                return
+            queries = sorted(self._queued[language])
+            self._queued[language].clear()
+            stats['queued_titles'] = 0
+            stats['refreshing'] = True
+            try:
+                future = self._get_executor().submit(
+                    refresh_hymn_index_job, language, queries, self.scan_workers
+                )
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._executor = None
+                stats['refreshing'] = False
+                stats['errors'] += 1
+                stats['last_error'] = str(e)
+                self._first_pass_done(language)
+                return
+        future.add_done_callback(lambda future: self._finished(language, future))
+
+    def _finished(self, language, future):
+        stats = self.stats[language]
+        try:
+            seconds = future.result()
+        except Exception as e:
+            stats['errors'] += 1
+            stats['last_error'] = str(e)
+            print(f"⚠ {language} hymn index refresh failed: {e}")
+            if isinstance(e, BrokenProcessPool):
+                # The worker process died; the next refresh starts a new one
+                with self._lock:
+                    self._executor = None
+        else:
+            stats['refreshes'] += 1
+            stats['last_seconds'] = round(seconds, 2)
+            stats['last_error'] = None
+            hymn_index_refreshed(language)
+        with self._lock:
+            stats['last_refresh'] = time.time()
+            stats['refreshing'] = False
+            queued = bool(self._queued[language])
+            self._first_pass_done(language)
+        if queued and not self._stop.is_set():
+            self.refresh(language)
+
+    def _first_pass_done(self, language):
+        # Called with self._lock held
+        self._first_pass.discard(language)
+        if not self._first_pass:
+            self.ready.set()
+
+    def _loop(self):
+        while True:
+            for language in self.languages:
+                self.refresh(language)
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Refresh every language now, then every interval seconds on a daemon thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name='hymn-index-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and the worker process."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -7,6 +7,43 @@ Provides simplified interface for PPT generation
 import os
 import sys
 import re
+import io
+import threading
+import time
+from contextlib import redirect_stdout
+
+def parse_song_line(line):
+    """
+    Parse one song line: "HymnNum|Label|Title" or "Message"
+    
+    Returns the song dictionary, or None if the line isn't a song
+    """
+    # Check if it's just "Message"
+    if line.lower() == 'message':
+        return {
+            'label': 'Message',
+            'hymn_num': '',
+            'title_hint': ''
+        }
+    
+    # Parse line with format: HymnNum|Label|Title
+    parts = line.split('|')
+    if len(parts) < 2:
+        return None
+    
+    hymn_num = parts[0].strip()
+    label = parts[1].strip()
+    title_hint = parts[2].strip() if len(parts) > 2 else ''
+    
+    return {
+        'label': label,
+        'hymn_num': hymn_num,
+        'title_hint': title_hint
+    }
+
+def is_date_directive(line):
+    """True for a "Date: ..." (or "# Date: ...") line"""
+    return line.lower().startswith("# date:") or line.lower().startswith("date:")
 
 def parse_batch_file(batch_file_path):
     """
@@ -27,7 +64,7 @@ def parse_batch_file(batch_file_path):
             continue
         
         # Parse date directive
-        if line.lower().startswith("# date:") or line.lower().startswith("date:"):
+        if is_date_directive(line):
             service_date = line.split(":", 1)[1].strip()
             continue
         
@@ -35,33 +72,66 @@ def parse_batch_file(batch_file_path):
         if line.startswith("#"):
             continue
         
-        # Check if it's just "Message"
-        if line.lower() == 'message':
-            song_list.append({
-                'label': 'Message',
-                'hymn_num': '',
-                'title_hint': ''
-            })
-            continue
+        song = parse_song_line(line)
+        if song:
+            song_list.append(song)
+    
+    return song_list
+
+def parse_services_file(batch_file_path):
+    """
+    Parse a batch file holding several services
+    
+    Each "Date: ..." line starts a new service, as does a line of "---";
+    songs before the first date form a service without a date.
+    
+    Returns:
+        list: (service_date or None, song_list) for each service, in file order
+    """
+    services = []
+    service_date = None
+    song_list = []
+    
+    with open(batch_file_path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    
+    for line in lines:
+        is_date = is_date_directive(line)
+        if (is_date or line == '---') and song_list:
+            services.append((service_date, song_list))
+            service_date = None
+            song_list = []
         
-        # Parse line with format: HymnNum|Label|Title
-        parts = line.split('|')
-        if len(parts) < 2:
+        if is_date:
+            service_date = line.split(":", 1)[1].strip() or None
             continue
         
-        hymn_num = parts[0].strip()
-        label = parts[1].strip()
-        title_hint = parts[2].strip() if len(parts) > 2 else ''
+        # Skip other comments and separators
+        if line.startswith("#") or line == '---':
+            continue
         
-        song_list.append({
-            'label': label,
-            'hymn_num': hymn_num,
-            'title_hint': title_hint
-        })
+        song = parse_song_line(line)
+        if song:
+            song_list.append(song)
     
-    return song_list
+    if song_list:
+        services.append((service_date, song_list))
+    return services
+
+def load_generator(language='Malayalam'):
+    """Import and return the generator module for language ('Malayalam' or 'English')"""
+    if language == 'English':
+        # Add English directory to path
+        english_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'English')
+        if english_dir not in sys.path:
+            sys.path.insert(0, english_dir)
+        import generate_english_hcs_ppt as generator
+    else:
+        # Default to Malayalam
+        import generate_malayalam_hcs_ppt as generator
+    return generator
 
-def generate_presentation_from_song_list(song_list, output_path, service_date=None, language='Malayalam'):
+def generate_presentation_from_song_list(song_list, output_path, service_date=None, language='Malayalam', scan_workers=None):
     """
     Generate PowerPoint presentation from song list
     
@@ -70,27 +140,196 @@ def generate_presentation_from_song_list(song_list, output_path, service_date=No
         output_path: Path where the generated PPTX should be saved
         service_date: Optional service date string (e.g., "16 February 2026")
         language: 'Malayalam' or 'English' (default: 'Malayalam')
+        scan_workers: Worker processes for PPT scanning (0 = one per CPU core, None = module default)
     
     Returns:
         tuple: (success: bool, message: str)
     """
     try:
         # Import the appropriate generation module based on language
-        if language == 'English':
-            # Add English directory to path
-            english_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'English')
-            if english_dir not in sys.path:
-                sys.path.insert(0, english_dir)
-            from generate_english_hcs_ppt import generate_presentation
-        else:
-            # Default to Malayalam
-            from generate_malayalam_hcs_ppt import generate_presentation
+        generator = load_generator(language)
+        
+        if scan_workers is not None:
+            generator.set_scan_workers(scan_workers)
         
         # Call the main PPT creation function
-        generate_presentation(song_list, output_path, service_date)
+        generator.generate_presentation(song_list, output_path, service_date)
         return (True, f"Presentation created successfully: {output_path}")
     except Exception as e:
         import traceback
         error_msg = f"{str(e)}\n\nTraceback:\n{traceback.format_exc()}"
         return (False, error_msg)
 
+
+# The generator modules' folder and index caches are not thread-safe, so lookups from
+# the web server's request threads take turns
+_LOOKUP_LOCK = threading.Lock()
+
+# Languages whose cached folder walks the next lookup revalidates (hymn_index_refreshed())
+_LOOKUP_RECHECK = set()
+
+
+class HymnIndexNotReady(Exception):
+    """The language's hymn index hasn't been built yet; refresh_hymn_index_job() builds it"""
+
+
+def hymn_index_refreshed(language):
+    """Note that language's hymn index was refreshed, so lookups see new and removed decks"""
+    with _LOOKUP_LOCK:
+        _LOOKUP_RECHECK.add(language)
+
+
+def _run_lookup(language, lookup, *args):
+    generator = load_generator(language)
+    with _LOOKUP_LOCK:
+        if language in _LOOKUP_RECHECK:
+            _LOOKUP_RECHECK.discard(language)
+            generator.begin_discovery_pass()
+        try:
+            return getattr(generator, lookup)(*args)
+        except generator.HymnIndexNotReady as e:
+            raise HymnIndexNotReady(str(e)) from e
+
+
+def lookup_hymn(hymn_num, title_hint='', language='Malayalam'):
+    """
+    Where a hymn would be taken from, answered read-only from the hymn index (nothing is
+    generated or indexed)
+    
+    Returns:
+        dict: the generator's describe_song_sources() result; "pending" is set when decks
+        that may hold title_hint haven't been checked for it yet (see refresh_hymn_index_job())
+    
+    Raises:
+        HymnIndexNotReady: the hymn index hasn't been built yet
+    """
+    return _run_lookup(language, 'describe_song_sources', hymn_num, title_hint)
+
+
+def search_hymns(title, language='Malayalam', limit=20):
+    """
+    Hymns whose title contains every word of title, answered read-only from the hymn index
+    
+    Returns:
+        list: the generator's search_hymn_titles() result
+    
+    Raises:
+        HymnIndexNotReady: the hymn index hasn't been built yet
+    """
+    return _run_lookup(language, 'search_hymn_titles', title, limit)
+
+
+def refresh_hymn_index_job(language, title_queries=(), scan_workers=None):
+    """
+    Bring language's hymn index up to date, in the hymn index refresher's worker process
+    
+    Re-reads new and changed decks (and the KK offset tables) and prepares the template
+    snapshot for the generation workers, then parses the decks that may hold the
+    (hymn_num, title_hint) title_queries lookups reported as pending, so they are
+    answered from the index next time.
+    
+    Returns:
+        float: the seconds taken
+    """
+    started = time.perf_counter()
+    generator = load_generator(language)
+    if scan_workers is not None:
+        generator.set_scan_workers(scan_workers)
+    generator.begin_discovery_pass()
+    generator.update_hymn_index()
+    template_path = generator.find_template_ppt()
+    if template_path:
+        generator.load_template_snapshot(template_path)
+    if title_queries:
+        generator.index_song_queries(list(title_queries))
+    return time.perf_counter() - started
+
+
+# Queue for progress events, set in job queue worker processes by init_job_worker()
+JOB_EVENTS = None
+
+# Longest a worker waits for the hymn index refresher's first pass before warming up anyway
+INDEX_READY_TIMEOUT = 600
+
+
+def init_job_worker(event_queue, warm_languages=(), scan_workers=None, index_ready=None):
+    """
+    Initializer for job queue worker processes
+
+    Remembers where progress events go, then loads the corpus state for each language in
+    warm_languages (template snapshot, KK offset table, hymn index, parsed KK hymnbook) so
+    this long-lived worker's generations only assemble and save.
+
+    index_ready (a multiprocessing Event), if given, is set once the hymn index refresher
+    has updated the index, KK offset tables and template snapshots. The worker waits for
+    it and then only loads what the refresher saved, so N workers don't index the same
+    decks at once.
+    """
+    global JOB_EVENTS
+    JOB_EVENTS = event_queue
+    if warm_languages and index_ready is not None:
+        if not index_ready.wait(INDEX_READY_TIMEOUT):
+            print(f"⚠ Worker {os.getpid()}: hymn index not refreshed after {INDEX_READY_TIMEOUT}s, loading what is saved")
+    for language in warm_languages:
+        try:
+            generator = load_generator(language)
+            if scan_workers is not None:
+                generator.set_scan_workers(scan_workers)
+            seconds = generator.warm_up(update_index=index_ready is None)
+            print(f"✓ Worker {os.getpid()}: {language} corpus loaded in {seconds:.1f}s")
+        except Exception as e:
+            print(f"⚠ Worker {os.getpid()}: could not preload {language} corpus ({e})")
+
+
+def ping_worker():
+    """No-op job used to start (and warm) every worker process up front"""
+    return os.getpid()
+
+
+class JobProgressStream(io.TextIOBase):
+    """
+    Text stream that sends every complete line written to it as a (job_id, line) event
+    """
+
+    def __init__(self, job_id, event_queue):
+        self.job_id = job_id
+        self.event_queue = event_queue
+        self._partial = ''
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self.event_queue.put((self.job_id, line))
+        return len(text)
+
+    def close_job(self):
+        """Send any unfinished line, then the end-of-log marker (line None)"""
+        if self._partial:
+            self.event_queue.put((self.job_id, self._partial))
+            self._partial = ''
+        self.event_queue.put((self.job_id, None))
+
+
+def run_generation_job(job_id, song_list, output_path, service_date=None, language='Malayalam', scan_workers=None):
+    """
+    Run one generation in a job queue worker process, streaming its progress output
+
+    Each printed line is sent to the web server as a progress event for job_id while the
+    generation runs. Each worker process runs one job at a time, so redirecting stdout
+    here only captures this job's output.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    stream = JobProgressStream(job_id, JOB_EVENTS)
+    try:
+        with redirect_stdout(stream):
+            return generate_presentation_from_song_list(
+                song_list, output_path, service_date, language=language, scan_workers=scan_workers
+            )
+    finally:
+        stream.close_job()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Streaming ZIP output for the web application
+Lets a response send a ZIP archive piece by piece while files are still being added
+"""
+
+
+class ZipChunkSink:
+    """
+    Write-only file object for zipfile.ZipFile that hands back what has been written.
+
+    It has no tell() or seek(), so ZipFile writes each member with a trailing data
+    descriptor and never goes back; take() after each member returns bytes that are
+    final and can be sent to the client straight away.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        """Bytes written since the last take()."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
@@ -59,7 +59,7 @@ mkdir -p modules
 cd modules
 
 # Link core Python files from Malayalam directory
-for file in generate_malayalam_hcs_ppt.py kk_hymn_search.py kk_hymn_mapping.json extract_malayalam_hymns.py; do
+for file in generate_malayalam_hcs_ppt.py kk_hymn_search.py kk_hymn_mapping.json extract_malayalam_hymns.py slide_text_reader.py; do
     if [ ! -L "$file" ] && [ ! -f "$file" ]; then
         ln -s ../../Malayalam/"$file" "$file"
         echo "✅ Linked modules/$file → Malayalam/$file"
@@ -22,9 +22,49 @@ function showMessage(message, type) {
 }
 
 // Extract hymns based on selected language
+// The server keeps the last report ready and refreshes it in the background
+const REPORT_POLL_INTERVAL_MS = 2000;
+
 function extractHymns() {
     const language = document.getElementById('language').value;
-    window.location.href = `/extract_hymns/${language}`;
+    
+    fetch(`/extract_hymns/${language}/refresh`, { method: 'POST' })
+        .then(response => response.json())
+        .then(status => {
+            if (status.ready) {
+                downloadHymnReport(status);
+            } else {
+                appendOutput(`⏳ Preparing the ${language} hymn report (first time may take a few minutes)...`);
+                waitForHymnReport(language);
+            }
+        })
+        .catch(err => showMessage('Could not get the hymn report: ' + err.message, 'error'));
+}
+
+function waitForHymnReport(language) {
+    setTimeout(() => {
+        fetch(`/extract_hymns/${language}/status`)
+            .then(response => response.json())
+            .then(status => {
+                if (status.ready) {
+                    downloadHymnReport(status);
+                } else if (!status.building && status.error) {
+                    appendOutput(`❌ Could not build the ${language} hymn report: ${status.error}`);
+                } else {
+                    waitForHymnReport(language);
+                }
+            })
+            .catch(err => showMessage('Could not get the hymn report: ' + err.message, 'error'));
+    }, REPORT_POLL_INTERVAL_MS);
+}
+
+function downloadHymnReport(status) {
+    const builtAt = new Date(status.built_at).toLocaleString();
+    appendOutput(`📊 Downloading ${status.language} hymn report (built ${builtAt})`);
+    if (status.building) {
+        appendOutput('🔄 A refreshed report is being built in the background - download again later for the latest');
+    }
+    window.location.href = `/extract_hymns/${status.language}`;
 }
 
 // Update button text based on language
@@ -85,6 +125,9 @@ function updatePPTCount() {
     // Update default songs
     updateDefaultSongs();
     
+    // Check the songs against the new language's presentations
+    checkSongList();
+    
     if (countElement) {
         countElement.textContent = 'Loading...';
         
@@ -109,6 +152,124 @@ function updatePPTCount() {
 // Update count on language change
 document.getElementById('language')?.addEventListener('change', updatePPTCount);
 
+// Check each song against the hymn index while the list is being typed
+const SONG_CHECK_DELAY_MS = 600;
+// Lines the server couldn't fully answer yet (index still being prepared) are asked again
+const SONG_RECHECK_DELAY_MS = 5000;
+let songCheckTimer = null;
+let songCheckRun = 0;
+// Lookup promises by language|hymn|title, so unchanged lines aren't asked again
+const songLookups = {};
+
+function scheduleSongCheck() {
+    clearTimeout(songCheckTimer);
+    songCheckTimer = setTimeout(checkSongList, SONG_CHECK_DELAY_MS);
+}
+
+function lookupSong(language, hymnNum, title) {
+    const key = `${language}|${hymnNum}|${title}`;
+    if (!songLookups[key]) {
+        const url = hymnNum
+            ? `/api/hymns/${encodeURIComponent(hymnNum)}?language=${language}&title=${encodeURIComponent(title)}`
+            : `/api/hymns?language=${language}&limit=3&title=${encodeURIComponent(title)}`;
+        songLookups[key] = fetch(url).then(response => {
+            if (response.status === 503) {
+                return { notReady: true };
+            }
+            if (!response.ok) {
+                throw new Error(`Lookup failed (status: ${response.status})`);
+            }
+            return response.json();
+        }).then(result => {
+            // Not final yet - ask again on the next check
+            if (result.notReady || result.pending) {
+                delete songLookups[key];
+            }
+            return result;
+        });
+        // Forget failed lookups so the next check asks again
+        songLookups[key].catch(() => delete songLookups[key]);
+    }
+    return songLookups[key];
+}
+
+function describeSongCheck(song, result) {
+    const name = [song.hymnNum, song.label, song.title].filter(part => part).join(' ');
+    if (result.notReady) {
+        return ['song-pending', `? ${name} - the hymn index is being prepared; checking again shortly`];
+    }
+    if (song.hymnNum) {
+        if (!result.found && result.pending) {
+            return ['song-pending', `? ${name} - still searching the presentations for this title; checking again shortly`];
+        }
+        if (!result.found) {
+            return ['song-missing', `⚠ ${name} - not found in any presentation`];
+        }
+        const source = result.source;
+        const deck = source.hymnbook ? `hymnbook ${source.deck}` : source.deck;
+        return ['song-found', `✓ ${name} - ${source.extracted_title} (${deck}, slides ${source.first_slide}-${source.last_slide})`];
+    }
+    if (result.hymns.length > 0) {
+        const hymn = result.hymns[0];
+        return ['song-found', `≈ ${name} - matches hymn ${hymn.hymn_num} "${hymn.title}"`];
+    }
+    return ['song-pending', `? ${name} - no indexed hymn has this title; it will be searched for when generating`];
+}
+
+function checkSongList() {
+    const checkList = document.getElementById('song-check');
+    const songsTextarea = document.getElementById('songs_text');
+    if (!checkList || !songsTextarea) {
+        return;
+    }
+    
+    const language = document.getElementById('language').value;
+    const run = ++songCheckRun;
+    let recheck = false;
+    const songs = [];
+    for (const rawLine of songsTextarea.value.split('\n')) {
+        const line = rawLine.trim();
+        const lower = line.toLowerCase();
+        if (!line || line.startsWith('#') || line === '---' || lower.startsWith('date:') || lower === 'message') {
+            continue;
+        }
+        const parts = line.split('|').map(part => part.trim());
+        songs.push({ line, hymnNum: parts[0], label: parts[1] || '', title: parts[2] || '', valid: parts.length >= 2 });
+    }
+    
+    Promise.all(songs.map(song => {
+        if (!song.valid) {
+            return ['song-missing', `⚠ "${song.line}" - use the format HymnNum|Label|Title`];
+        }
+        if (!song.hymnNum && !song.title) {
+            return ['song-missing', `⚠ ${song.label} - needs a hymn number or a title`];
+        }
+        return lookupSong(language, song.hymnNum, song.title)
+            .then(result => {
+                recheck = recheck || result.notReady || result.pending;
+                return describeSongCheck(song, result);
+            })
+            .catch(err => ['song-pending', `? ${song.line} - could not check (${err.message})`]);
+    })).then(checks => {
+        // A newer check has started since this one
+        if (run !== songCheckRun) {
+            return;
+        }
+        checkList.replaceChildren(...checks.map(([className, text]) => {
+            const item = document.createElement('li');
+            item.className = className;
+            item.textContent = text;
+            return item;
+        }));
+        if (recheck) {
+            clearTimeout(songCheckTimer);
+            songCheckTimer = setTimeout(checkSongList, SONG_RECHECK_DELAY_MS);
+        }
+    });
+}
+
+document.getElementById('songs_text')?.addEventListener('input', scheduleSongCheck);
+
 // Output console functions
 function appendOutput(text) {
     const outputText = document.getElementById('outputText');
@@ -189,82 +350,24 @@ function handleFormSubmit(e) {
     appendOutput(`📋 Language: ${language}`);
     appendOutput(`📝 Processing songs...`);
     
-    fetch('/generate', {
+    // Several Date: lines mean several services, generated together and downloaded as a ZIP
+    const isBatch = countServices(songsText) > 1;
+    
+    fetch(isBatch ? '/generate_batch' : '/generate', {
         method: 'POST',
         body: formData
     })
     .then(response => {
-        appendOutput(`📡 Response received (status: ${response.status})`);
-        
-        if (!response.ok) {
-            return response.text().then(text => {
-                throw new Error(text || 'Generation failed');
-            });
-        }
-        
-        const contentType = response.headers.get('content-type');
-        if (contentType && contentType.includes('application/json')) {
-            return response.json();
-        } else {
-            appendOutput('💾 Downloading presentation...');
-            return response.blob().then(blob => {
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.style.display = 'none';
-                a.href = url;
-                
-                // Extract filename from Content-Disposition header
-                const contentDisposition = response.headers.get('Content-Disposition');
-                let filename = 'Holy_Communion_Service.pptx'; // fallback
-                
-                if (contentDisposition) {
-                    const filenameMatch = contentDisposition.match(/filename="?(.+)"?/i);
-                    if (filenameMatch && filenameMatch[1]) {
-                        filename = filenameMatch[1].replace(/"/g, '');
-                    }
-                }
-                
-                a.download = filename;
-                document.body.appendChild(a);
-                a.click();
-                window.URL.revokeObjectURL(url);
-                appendOutput('✅ Presentation generated successfully!');
-                appendOutput(`📥 Download started: ${filename}`);
-                
-                // Check if there's a detailed log to fetch
-                const genId = response.headers.get('X-Generation-ID');
-                if (genId) {
-                    appendOutput('\n📋 Detailed Generation Log:');
-                    fetch(`/get_log/${genId}`)
-                        .then(r => r.json())
-                        .then(data => {
-                            if (data.log && data.log.length > 0) {
-                                data.log.forEach(line => {
-                                    if (line.trim()) {
-                                        // Replace server path with user-friendly message
-                                        let outputLine = line.replace(/Presentation saved:.*\.pptx/, 'Presentation downloaded to your Downloads folder');
-                                        outputLine = outputLine.replace(/^.*\/generated\/.*\.pptx$/, '');
-                                        if (outputLine.trim()) {
-                                            appendOutput(outputLine);
-                                        }
-                                    }
-                                });
-                                appendOutput('\n✅ File saved to your Downloads folder');
-                                appendOutput('📁 Check your browser\'s download location');
-                            }
-                        })
-                        .catch(err => console.error('Failed to fetch log:', err));
-                }
-                
-                showMessage('Presentation generated successfully!', 'success');
-            });
-        }
-    })
-    .then(data => {
-        if (data && data.message) {
-            appendOutput('✅ ' + data.message);
-            showMessage(data.message, 'success');
-        }
+        return response.json().catch(() => ({})).then(data => {
+            if (!response.ok) {
+                throw new Error(data.message || `Generation failed (status: ${response.status})`);
+            }
+            if (isBatch) {
+                return watchBatch(data);
+            }
+            appendOutput(`📨 Request queued (job ${data.job_id.slice(0, 8)})`);
+            return watchJob(data).then(job => downloadJob(job));
+        });
     })
     .catch(error => {
         appendOutput('❌ Error: ' + error.message);
@@ -279,3 +382,121 @@ function handleFormSubmit(e) {
     
     return false;
 }
+
+// Show a generation's progress live (Server-Sent Events) until it finishes
+function watchJob(job) {
+    let lastState = '';
+    
+    function showStatus(status) {
+        const state = status.status === 'queued' ? `queued:${status.position}` : status.status;
+        if (state === lastState) {
+            return;
+        }
+        lastState = state;
+        if (status.status === 'queued') {
+            appendOutput(`⏳ Waiting in queue (position ${status.position})...`);
+        } else if (status.status === 'running') {
+            appendOutput('⚙️ Generating presentation...');
+        }
+    }
+    
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(`/jobs/${job.job_id}/events`);
+        
+        events.addEventListener('status', e => showStatus(JSON.parse(e.data)));
+        
+        events.addEventListener('log', e => {
+            const line = JSON.parse(e.data).line;
+            // Replace server path with user-friendly message
+            let outputLine = line.replace(/Presentation saved:.*\.pptx/, 'Presentation ready for download');
+            outputLine = outputLine.replace(/^.*\/generated\/.*\.pptx$/, '');
+            if (outputLine.trim()) {
+                appendOutput(outputLine);
+            }
+        });
+        
+        events.addEventListener('done', e => {
+            events.close();
+            const status = JSON.parse(e.data);
+            if (status.status === 'done') {
+                resolve(status);
+            } else {
+                reject(new Error(status.message || 'Generation failed'));
+            }
+        });
+        
+        events.onerror = () => {
+            // The browser reconnects by itself; give up only if the stream was closed for good
+            if (events.readyState === EventSource.CLOSED) {
+                reject(new Error('Lost connection to the server'));
+            }
+        };
+    });
+}
+
+// Start a browser download without leaving the page
+function startDownload(url, filename) {
+    const a = document.createElement('a');
+    a.style.display = 'none';
+    a.href = url;
+    a.download = filename;
+    document.body.appendChild(a);
+    a.click();
+    a.remove();
+}
+
+// Start the browser download of a finished generation
+function downloadJob(job) {
+    appendOutput('💾 Downloading presentation...');
+    startDownload(job.download_url, job.filename);
+    appendOutput('✅ Presentation generated successfully!');
+    appendOutput(`📥 Download started: ${job.filename}`);
+    appendOutput('📁 Check your browser\'s download location');
+    showMessage('Presentation generated successfully!', 'success');
+}
+
+// Number of services in the song list (one per Date: line)
+function countServices(songsText) {
+    return songsText.split('\n').filter(line => /^(# )?date:/i.test(line.trim())).length;
+}
+
+// Download a batch's ZIP straight away (the server adds each presentation as soon as it
+// is generated) and report each service as it finishes
+const BATCH_POLL_INTERVAL_MS = 2000;
+
+function watchBatch(batch) {
+    appendOutput(`📨 ${batch.jobs.length} services queued (batch ${batch.batch_id.slice(0, 8)})`);
+    appendOutput('💾 Downloading ZIP - each presentation is added as soon as it is ready...');
+    startDownload(batch.download_url, batch.filename);
+    
+    const reported = new Set();
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch(batch.status_url)
+                .then(response => response.json())
+                .then(status => {
+                    status.jobs.forEach(job => {
+                        if ((job.status === 'done' || job.status === 'failed') && !reported.has(job.job_id)) {
+                            reported.add(job.job_id);
+                            appendOutput(job.status === 'done' ? `✓ ${job.filename}` : `❌ ${job.filename}: ${job.message}`);
+                        }
+                    });
+                    if (status.status !== 'done') {
+                        setTimeout(poll, BATCH_POLL_INTERVAL_MS);
+                        return;
+                    }
+                    const failed = status.jobs.filter(job => job.status === 'failed').length;
+                    appendOutput(`✅ ${status.jobs.length - failed} of ${status.jobs.length} presentations generated`);
+                    appendOutput(`📥 Download: ${status.filename}`);
+                    if (failed) {
+                        showMessage(`${failed} presentation(s) failed - see errors.txt in the ZIP`, 'error');
+                    } else {
+                        showMessage('Presentations generated successfully!', 'success');
+                    }
+                    resolve(status);
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}